@@ -0,0 +1,125 @@
+"""
+Benchmark: conexões abertas por 1.000 requisições.
+
+Compara o comportamento antigo (um ``httpx.AsyncClient`` novo por fase de cada
+lote) com a sessão compartilhada do ``ConcurrentHttpClient``. Um servidor
+HTTP/1.1 local com keep-alive faz o papel do portal e conta quantas conexões
+TCP foram abertas.
+
+Uso:
+    python benchmarks/bench_connection_pool.py [--requests 1000] [--batch-size 30]
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from diario_crawler.core.clients import ConcurrentHttpClient, HttpClient
+
+BODY = b'{"ok": true}'
+
+
+class StandInServer:
+    """Servidor HTTP/1.1 mínimo com keep-alive que conta conexões."""
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.requests = 0
+        self._server: asyncio.Server | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                if not head:
+                    break
+                self.requests += 1
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(BODY)).encode() + b"\r\n"
+                    b"Connection: keep-alive\r\n\r\n" + BODY
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+async def run_per_batch_clients(urls, batch_size, max_concurrent):
+    """Modelo antigo: novo AsyncClient para cada fase de cada lote."""
+    concurrent = ConcurrentHttpClient(HttpClient(), max_concurrent=max_concurrent)
+    for i in range(0, len(urls), batch_size):
+        async with httpx.AsyncClient() as client:
+            await concurrent.fetch_all(urls[i : i + batch_size], client)
+
+
+async def run_shared_session(urls, batch_size, max_concurrent):
+    """Modelo novo: uma sessão compartilhada durante todo o crawling."""
+    async with ConcurrentHttpClient(
+        HttpClient(), max_concurrent=max_concurrent
+    ) as concurrent:
+        for i in range(0, len(urls), batch_size):
+            await concurrent.fetch_all(urls[i : i + batch_size])
+
+
+async def measure(name, runner, n_requests, batch_size, max_concurrent) -> None:
+    server = StandInServer()
+    await server.start()
+    urls = [f"{server.base_url}/edicoes/{i}.json" for i in range(n_requests)]
+
+    start = time.perf_counter()
+    await runner(urls, batch_size, max_concurrent)
+    elapsed = time.perf_counter() - start
+    await server.stop()
+
+    per_1000 = server.connections * 1000 / max(server.requests, 1)
+    print(
+        f"{name:<22} requisições={server.requests:>5} "
+        f"conexões={server.connections:>4} "
+        f"conexões/1000 req={per_1000:>7.1f} "
+        f"tempo={elapsed:.2f}s"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=30)
+    parser.add_argument("--max-concurrent", type=int, default=10)
+    args = parser.parse_args()
+
+    await measure(
+        "cliente por lote",
+        run_per_batch_clients,
+        args.requests,
+        args.batch_size,
+        args.max_concurrent,
+    )
+    await measure(
+        "sessão compartilhada",
+        run_shared_session,
+        args.requests,
+        args.batch_size,
+        args.max_concurrent,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
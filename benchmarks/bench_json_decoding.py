@@ -0,0 +1,126 @@
+"""
+Benchmark: decodificação JSON de metadados e conteúdos.
+
+Mede ``MetadataParser.parse`` e ``ContentParser.parse`` com cada
+decodificador instalado (stdlib, orjson e msgspec). O stdlib é a referência:
+equivale ao caminho antigo, pois ``response.json()`` do httpx 0.28 também
+chama ``json.loads`` sobre ``response.content``.
+
+Os metadados são as respostas ``edicoes_from_data`` gravadas nos cassetes VCR
+dos testes. Os cassetes não têm respostas de ``publicacoes_ver_conteudo``;
+os conteúdos são montados no formato da API (``{"id", "conteudo", ...}``)
+com o HTML real das estruturas ``view_html_diario`` gravadas.
+
+Uso:
+    python benchmarks/bench_json_decoding.py [--repeat 20]
+"""
+
+import argparse
+import json
+import logging
+import time
+from pathlib import Path
+
+import httpx
+import yaml
+
+from diario_crawler.parsers import ContentParser, MetadataParser
+from diario_crawler.parsers.json_decoder import DECODERS, get_decoder
+
+CASSETTES_DIR = Path(__file__).parent.parent / "tests" / "fixtures" / "vcr_cassettes"
+CASSETTES = [
+    "test_fetch_metadata_batch.yaml",
+    "test_fetch_structure_batch.yaml",
+]
+HEADERS = {"content-type": "application/json"}
+
+
+def load_bodies() -> tuple[list[httpx.Response], list[httpx.Response]]:
+    """Monta respostas de metadados e de conteúdo a partir dos cassetes."""
+    metadata, content = {}, {}
+    for name in CASSETTES:
+        path = CASSETTES_DIR / name
+        if not path.exists():
+            continue
+        cassette = yaml.load(path.read_text(), Loader=yaml.CSafeLoader)
+        for interaction in cassette["interactions"]:
+            uri = interaction["request"]["uri"]
+            body = interaction["response"]["body"].get("string") or ""
+            if "edicoes_from_data" in uri:
+                metadata[uri] = body.encode()
+            elif "view_html_diario" in uri and body:
+                edition_id = uri.rsplit("/", 1)[-1]
+                content[uri] = json.dumps(
+                    {
+                        "id": edition_id,
+                        "titulo": f"Matéria {edition_id}",
+                        "conteudo": body,
+                    }
+                ).encode()
+
+    def responses(bodies: dict[str, bytes]) -> list[httpx.Response]:
+        return [
+            httpx.Response(
+                200, content=b, headers=HEADERS, request=httpx.Request("GET", u)
+            )
+            for u, b in bodies.items()
+        ]
+
+    return responses(metadata), responses(content)
+
+
+def timed(fn, responses, repeat: int) -> tuple[float, list]:
+    best = float("inf")
+    for _ in range(repeat):
+        # Respostas novas a cada rodada, como no crawler
+        fresh = [
+            httpx.Response(200, content=r.content, headers=HEADERS, request=r.request)
+            for r in responses
+        ]
+        start = time.perf_counter()
+        outputs = [fn(r) for r in fresh]
+        best = min(best, time.perf_counter() - start)
+    return best, outputs
+
+
+def report(label: str, n: int, baseline: float, elapsed: float, same: bool) -> None:
+    print(
+        f"  {label:<16} {elapsed * 1000:>8.2f}ms "
+        f"({baseline / elapsed:>4.1f}x, {elapsed / n * 1e6:>7.1f}µs/resposta) "
+        f"resultado idêntico={'sim' if same else 'NÃO'}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.getLogger("diario_crawler").setLevel(logging.ERROR)
+    metadata, content = load_bodies()
+    if not metadata:
+        print(f"Nenhum cassete encontrado em {CASSETTES_DIR}")
+        return
+
+    def run(label: str, parse, responses: list[httpx.Response]) -> None:
+        print(f"{label}: {len(responses)} respostas")
+        base_time, base = timed(
+            lambda r: parse(r, get_decoder("json")), responses, args.repeat
+        )
+        for name in DECODERS:
+            decoder = get_decoder(name)
+            elapsed, out = timed(lambda r: parse(r, decoder), responses, args.repeat)
+            report(name, len(responses), base_time, elapsed, out == base)
+
+    run("Metadados", lambda r, d: MetadataParser.parse(r, decoder=d), metadata)
+
+    size = sum(len(r.content) for r in content) / 1024**2
+    run(
+        f"Conteúdos ({size:.1f} MiB)",
+        lambda r, d: ContentParser.parse(r, decoder=d).raw_content,
+        content,
+    )
+
+
+if __name__ == "__main__":
+    main()
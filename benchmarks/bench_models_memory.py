@@ -0,0 +1,114 @@
+"""
+Benchmark: memória por artigo dos modelos (dataclass antigo vs. slots).
+
+Os modelos antigos eram ``@dataclass`` comuns, com ``__dict__`` por
+instância e uma cópia da lista ``hierarchy_path`` em cada artigo. Os novos
+usam ``slots=True, frozen=True``, caminhos internados como tupla e
+``edition_id`` internado.
+
+O lote sintético imita o caminho do crawler com workers de parsing: os
+artigos chegam como RecordBatch Arrow (``STRUCTURE_SCHEMA``) e são
+reconstruídos com ``to_pylist()``, que cria strings e listas novas por
+linha. Cada artigo é montado como ``Article`` (metadados + conteúdo). A
+memória é medida com ``tracemalloc`` depois de descartar as linhas
+intermediárias, ou seja, conta só o que os modelos mantêm vivo.
+
+Uso:
+    python benchmarks/bench_models_memory.py [--articles 100000]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass
+
+import pyarrow as pa
+
+from diario_crawler.models import (
+    Article,
+    ArticleContent,
+    ArticleMetadata,
+    ContentType,
+)
+from diario_crawler.parsers.structure import STRUCTURE_SCHEMA
+
+
+@dataclass
+class LegacyArticleMetadata:
+    """ArticleMetadata anterior, para referência."""
+
+    article_id: str
+    edition_id: str
+    hierarchy_path: list[str]
+    title: str
+    identifier: str
+    protocol: str | None = None
+
+
+@dataclass
+class LegacyArticleContent:
+    raw_content: str | bytes
+    content_type: ContentType
+
+
+@dataclass
+class LegacyArticle:
+    metadata: LegacyArticleMetadata
+    content: LegacyArticleContent
+
+
+def synthetic_batch(n: int, editions: int, paths: int) -> pa.RecordBatch:
+    """Lote com ``n`` artigos distribuídos em poucas edições e categorias."""
+    categories = [
+        ["Atos do Executivo", f"Secretaria {i // 8}", f"Categoria {i}"]
+        for i in range(paths)
+    ]
+    return pa.RecordBatch.from_pydict(
+        {
+            "article_id": [str(i) for i in range(n)],
+            "edition_id": [f"E{i % editions:05d}" for i in range(n)],
+            "hierarchy_path": [categories[i % paths] for i in range(n)],
+            "title": [f"Portaria nº {i}/2025" for i in range(n)],
+            "identifier": [f"ID-{i}" for i in range(n)],
+            "protocol": [f"P-{i}" for i in range(n)],
+        },
+        schema=STRUCTURE_SCHEMA,
+    )
+
+
+def measure(batch: pa.RecordBatch, meta_cls, content_cls, article_cls) -> int:
+    """Bytes mantidos vivos pelos artigos montados a partir do lote."""
+    gc.collect()
+    tracemalloc.start()
+    rows = batch.to_pylist()
+    articles = [
+        article_cls(meta_cls(**row), content_cls("", ContentType.HTML)) for row in rows
+    ]
+    del rows
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(articles) == batch.num_rows
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=100_000)
+    parser.add_argument("--editions", type=int, default=200)
+    parser.add_argument("--paths", type=int, default=60)
+    args = parser.parse_args()
+
+    batch = synthetic_batch(args.articles, args.editions, args.paths)
+    legacy = measure(batch, LegacyArticleMetadata, LegacyArticleContent, LegacyArticle)
+    current = measure(batch, ArticleMetadata, ArticleContent, Article)
+
+    n = args.articles
+    print(f"{n} artigos, {args.editions} edições, {args.paths} caminhos distintos")
+    print(f"  antigo: {legacy / 1024**2:>7.1f} MiB ({legacy / n:>6.0f} B/artigo)")
+    print(f"  novo:   {current / 1024**2:>7.1f} MiB ({current / n:>6.0f} B/artigo)")
+    print(f"  redução: {1 - current / legacy:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+Benchmark: montagem das tabelas do save_editions (linhas vs. colunas).
+
+O caminho antigo criava um dicionário por linha (edição, artigo e relação),
+chamava ``datetime.now()`` em cada um deles e convertia as listas de
+dicionários com ``pa.Table.from_pylist``; as relações não tinham schema e
+gravavam data e horário como string. O novo acumula os valores direto nas
+colunas de um ``ColumnarBuilder``: dados da edição uma vez por edição
+(expandidos em C), um horário por lote e o JSON de cada caminho gerado uma
+vez.
+
+O lote sintético tem conteúdos curtos (gravados inline, sem blobs), de modo
+que só a montagem das tabelas é medida, sem escrita em disco. A saída é
+comparada coluna a coluna, exceto ``processed_at`` e, nas relações, as
+colunas cujo tipo mudou.
+
+Uso:
+    python benchmarks/bench_save_editions.py [--editions 200] [--articles 500]
+"""
+
+import argparse
+import hashlib
+import json
+import tempfile
+import time
+from datetime import datetime
+from typing import Any
+
+import pyarrow as pa
+
+from diario_crawler.models import (
+    Article,
+    ArticleContent,
+    ArticleMetadata,
+    ContentType,
+    GazetteEdition,
+    GazetteMetadata,
+)
+from diario_crawler.storage import LocalBackend, ParquetStorage
+from diario_crawler.storage.base import ARTICLES_SCHEMA, EDITIONS_SCHEMA
+from diario_crawler.storage.parquet import CONTENT_INLINE_THRESHOLD
+
+
+def legacy_build(
+    storage: ParquetStorage, editions: list[GazetteEdition], batch_id: str, **kwargs
+) -> tuple[dict[str, pa.Table], dict[str, str]]:
+    """Montagem anterior, linha a linha, para referência."""
+    editions_rows: list[dict[str, Any]] = []
+    articles_rows: list[dict[str, Any]] = []
+    relationships_rows: list[dict[str, Any]] = []
+    index_entries: dict[str, str] = {}
+
+    for edition in editions:
+        meta = edition.metadata
+        edition_hash = storage._generate_edition_hash(edition)
+        pub_parts = storage._publication_date_parts(meta.publication_date)
+        pub_date_obj = datetime.strptime(meta.publication_date, "%Y-%m-%d").date()
+
+        editions_rows.append(
+            {
+                "municipality": kwargs.get("municipality", ""),
+                "edition_id": str(meta.edition_id),
+                "publication_date": pub_date_obj,
+                "edition_number": int(meta.edition_number),
+                "supplement": bool(meta.supplement),
+                "edition_type_id": int(meta.edition_type_id),
+                "edition_type_name": str(meta.edition_type_name),
+                "pdf_url": str(meta.pdf_url),
+                "total_articles": len(edition.articles),
+                "processed_at": datetime.now(),
+                "edition_hash": edition_hash,
+                "batch_id": batch_id,
+                "year": pub_parts["year"],
+                "month": pub_parts["month"],
+                "day": pub_parts["day"],
+            }
+        )
+
+        for article in edition.articles:
+            raw_content = article.content.raw_content
+            if isinstance(raw_content, bytes):
+                try:
+                    raw_text = raw_content.decode("utf-8")
+                    raw_bytes = raw_content
+                except Exception:
+                    raw_text = None
+                    raw_bytes = raw_content
+            else:
+                raw_text = str(raw_content) if raw_content is not None else ""
+                raw_bytes = raw_text.encode("utf-8")
+
+            if raw_text is None or len(raw_text) > CONTENT_INLINE_THRESHOLD:
+                content_meta = storage._write_content_blob(raw_bytes)
+                inline_text = None
+            else:
+                content_meta = {
+                    "content_hash": None,
+                    "content_path": None,
+                    "content_size": len(raw_bytes),
+                }
+                inline_text = raw_text
+
+            identifier = getattr(article.metadata, "identifier", None)
+            if identifier:
+                index_entries[str(identifier)] = (
+                    content_meta["content_hash"]
+                    or hashlib.sha256(raw_bytes).hexdigest()
+                )
+
+            hierarchy = getattr(article.metadata, "hierarchy_path", []) or []
+            text = getattr(article.content, "text", None)
+
+            articles_rows.append(
+                {
+                    "municipality": kwargs.get("municipality", ""),
+                    "article_id": str(article.metadata.article_id),
+                    "edition_id": str(article.metadata.edition_id),
+                    "edition_hash": edition_hash,
+                    "publication_date": pub_date_obj,
+                    "title": getattr(article.metadata, "title", "") or "",
+                    "hierarchy_path": json.dumps(hierarchy),
+                    "identifier": str(
+                        getattr(article.metadata, "identifier", None) or ""
+                    ),
+                    "protocol": str(getattr(article.metadata, "protocol", None) or ""),
+                    "depth": len(hierarchy),
+                    "content_type": (
+                        article.content.content_type.value
+                        if isinstance(article.content.content_type, ContentType)
+                        else str(article.content.content_type)
+                    ),
+                    "content_size": content_meta.get("content_size", 0),
+                    "content_hash": content_meta.get("content_hash"),
+                    "content_path": content_meta.get("content_path"),
+                    "inline_text": inline_text,
+                    "text": text,
+                    "text_length": None if text is None else len(text),
+                    "processed_at": datetime.now(),
+                    "batch_id": batch_id,
+                    "year": pub_parts["year"],
+                    "month": pub_parts["month"],
+                    "day": pub_parts["day"],
+                }
+            )
+
+            relationships_rows.append(
+                {
+                    "municipality": kwargs.get("municipality", ""),
+                    "edition_id": str(meta.edition_id),
+                    "article_id": str(article.metadata.article_id),
+                    "edition_hash": edition_hash,
+                    "publication_date": meta.publication_date,
+                    "batch_id": batch_id,
+                    "processed_at": datetime.now().isoformat(),
+                }
+            )
+
+    tables = {
+        "gazettes": pa.Table.from_pylist(editions_rows, schema=EDITIONS_SCHEMA),
+        "articles": pa.Table.from_pylist(articles_rows, schema=ARTICLES_SCHEMA),
+        "relationships": pa.Table.from_pylist(relationships_rows),
+    }
+    return tables, index_entries
+
+
+def synthetic_editions(n_editions: int, n_articles: int) -> list[GazetteEdition]:
+    """Edições com artigos curtos em poucas categorias, como no diário real."""
+    categories = [("Atos do Executivo", f"Secretaria {i}") for i in range(12)]
+    editions = []
+    for e in range(n_editions):
+        edition_id = f"{10000 + e}"
+        articles = [
+            Article(
+                metadata=ArticleMetadata(
+                    article_id=f"{edition_id}-{a}",
+                    edition_id=edition_id,
+                    hierarchy_path=categories[a % len(categories)],
+                    title=f"Portaria nº {a}/2024",
+                    identifier=f"ID-{edition_id}-{a}",
+                    protocol=str(a),
+                ),
+                content=ArticleContent(
+                    raw_content=f"<p>Portaria {a} da edição {edition_id}</p>",
+                    content_type=ContentType.HTML,
+                ),
+            )
+            for a in range(n_articles)
+        ]
+        metadata = GazetteMetadata(
+            edition_id=edition_id,
+            publication_date=f"2024-{e % 12 + 1:02d}-{e % 28 + 1:02d}",
+            edition_number=e,
+            supplement=False,
+            edition_type_id=1,
+            edition_type_name="Normal",
+            pdf_url=f"https://example.org/{edition_id}.pdf",
+        )
+        editions.append(GazetteEdition(metadata=metadata, articles=articles))
+    return editions
+
+
+def same_columns(old: pa.Table, new: pa.Table, skip: set[str]) -> bool:
+    return all(
+        old.column(name).to_pylist() == new.column(name).to_pylist()
+        for name in new.schema.names
+        if name not in skip
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--editions", type=int, default=200)
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    editions = synthetic_editions(args.editions, args.articles)
+    n_articles = args.editions * args.articles
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = ParquetStorage(LocalBackend(tmp), enable_duckdb=False)
+
+        def timed(fn) -> tuple[float, Any]:
+            best, result = float("inf"), None
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                result = fn()
+                best = min(best, time.perf_counter() - start)
+            return best, result
+
+        old_time, (old, old_index) = timed(
+            lambda: legacy_build(storage, editions, "b", municipality="sjc")
+        )
+        new_time, (new, new_index) = timed(
+            lambda: storage._build_batches(editions, "b", "sjc")
+        )
+
+    identical = old_index == new_index and all(
+        same_columns(old[name], new[name], {"processed_at"})
+        for name in ("gazettes", "articles")
+    )
+    identical = identical and same_columns(
+        old["relationships"],
+        new["relationships"],
+        {"processed_at", "publication_date"},
+    )
+
+    print(f"{args.editions} edições, {n_articles} artigos")
+    for label, elapsed in (("linhas (antigo)", old_time), ("colunas", new_time)):
+        print(
+            f"  {label:<16} {elapsed * 1000:>8.1f}ms "
+            f"({old_time / elapsed:>4.1f}x, {elapsed / n_articles * 1e6:>5.2f}µs/artigo)"
+        )
+    print(f"  saída idêntica={'sim' if identical else 'NÃO'}")
+    print(
+        f"  horários distintos em articles: antigo="
+        f"{len(old['articles'].column('processed_at').unique())} "
+        f"novo={len(new['articles'].column('processed_at').unique())}"
+    )
+
+
+if __name__ == "__main__":
+    main()
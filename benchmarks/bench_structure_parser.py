@@ -0,0 +1,168 @@
+"""
+Benchmark: parser de estrutura (view_html_diario) antigo vs. passagem única.
+
+O parser antigo percorria ``root_ul.css("li")`` (todos os ``li``
+descendentes) e repetia a busca em cada sub-lista, visitando cada artigo uma
+vez por nível de ancestral e dependendo de ``deduplicate_keep_deepest``. O
+novo desce só pelos filhos diretos.
+
+O benchmark roda os dois sobre as estruturas reais gravadas nos cassetes VCR
+dos testes e sobre uma árvore sintética profunda, confere que a saída é
+idêntica e compara os tempos. Os dois passam pela deduplicação, como no
+crawler, pois uma matéria publicada em mais de uma categoria continua
+aparecendo repetida. O parser novo também é medido recebendo ``bytes``, como
+no crawler.
+
+Uso:
+    python benchmarks/bench_structure_parser.py [--repeat 5] [--depth 8]
+"""
+
+import argparse
+import logging
+import time
+from pathlib import Path
+
+import yaml
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+
+from diario_crawler.models import ArticleMetadata
+from diario_crawler.parsers.structure import HtmlStructureParser
+
+CASSETTES_DIR = Path(__file__).parent.parent / "tests" / "fixtures" / "vcr_cassettes"
+CASSETTES = [
+    "test_fetch_structure_batch.yaml",
+    "test_structure_parser_nested.yaml",
+]
+
+
+def legacy_parse(html: str, edition_id: str) -> list[ArticleMetadata]:
+    """Parser anterior (quadrático em árvores profundas), para referência."""
+    root_ul = LexborHTMLParser(html).css_first("ul#tree")
+    if not root_ul:
+        return []
+
+    articles = []
+
+    def parse_node(li: LexborNode, path: list[str]) -> None:
+        folder_span = li.css_first("span.folder")
+        if folder_span:
+            sub_ul = li.css_first("ul")
+            new_path = path + [folder_span.text(strip=True)]
+            if sub_ul:
+                for sub_li in sub_ul.css("li"):
+                    parse_node(sub_li, new_path)
+        else:
+            for link in li.css("a.linkMateria"):
+                articles.append(
+                    ArticleMetadata(
+                        article_id=str(link.attributes.get("data-materia-id", "")),
+                        edition_id=edition_id,
+                        hierarchy_path=path.copy(),
+                        title=link.text(strip=True),
+                        identifier=str(link.attributes.get("identificador")),
+                        protocol=link.attributes.get("data-protocolo"),
+                    )
+                )
+
+    for li in root_ul.css("li"):
+        parse_node(li, path=[])
+    return articles
+
+
+def load_structures() -> list[tuple[str, str]]:
+    """Carrega (edition_id, html) das respostas view_html_diario gravadas."""
+    structures = {}
+    for name in CASSETTES:
+        path = CASSETTES_DIR / name
+        if not path.exists():
+            continue
+        cassette = yaml.load(path.read_text(), Loader=yaml.CSafeLoader)
+        for interaction in cassette["interactions"]:
+            uri = interaction["request"]["uri"]
+            body = interaction["response"]["body"].get("string") or ""
+            if "view_html_diario" in uri and "ul" in body:
+                structures[uri] = (uri.rsplit("/", 1)[-1], body)
+    return list(structures.values())
+
+
+def synthetic_tree(depth: int, fanout: int = 3, leaves: int = 4) -> str:
+    """Árvore com ``depth`` níveis de pastas e ``leaves`` artigos por pasta."""
+    counter = 0
+
+    def level(d: int) -> str:
+        nonlocal counter
+        items = []
+        for _ in range(leaves):
+            counter += 1
+            items.append(
+                f'<li><span class="file"><a class="linkMateria" '
+                f'identificador="{counter}">Matéria {counter}</a></span></li>'
+            )
+        if d < depth:
+            for f in range(fanout):
+                items.append(
+                    f'<li><span class="folder">Pasta {d}.{f}</span>'
+                    f"<ul>{level(d + 1)}</ul></li>"
+                )
+        return "".join(items)
+
+    return f'<ul id="tree" class="filetree">{level(1)}</ul>'
+
+
+def timed(fn, structures, repeat: int) -> tuple[float, list]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outputs = [fn(html, edition_id) for edition_id, html in structures]
+        best = min(best, time.perf_counter() - start)
+    return best, outputs
+
+
+def compare(name: str, structures: list[tuple[str, str]], repeat: int) -> None:
+    dedup = HtmlStructureParser.deduplicate_keep_deepest
+    encoded = [(edition_id, html.encode()) for edition_id, html in structures]
+
+    old_time, old = timed(lambda h, e: dedup(legacy_parse(h, e)), structures, repeat)
+    new_time, new = timed(
+        lambda h, e: dedup(HtmlStructureParser.parse(h, e)), structures, repeat
+    )
+    bytes_time, from_bytes = timed(
+        lambda h, e: dedup(HtmlStructureParser.parse(h, e)), encoded, repeat
+    )
+
+    identical = old == new == from_bytes
+    n_articles = sum(len(articles) for articles in new)
+    visited = sum(len(legacy_parse(h, e)) for e, h in structures)
+    print(
+        f"{name:<14} estruturas={len(structures):>4} artigos={n_articles:>6} "
+        f"visitas antigas={visited:>7} | antigo={old_time * 1000:>8.1f}ms "
+        f"novo={new_time * 1000:>8.1f}ms ({old_time / new_time:>5.1f}x) "
+        f"novo/bytes={bytes_time * 1000:>8.1f}ms | "
+        f"saída idêntica={'sim' if identical else 'NÃO'}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--depth", type=int, default=8)
+    args = parser.parse_args()
+
+    # Estruturas sem árvore (edições vazias) geram avisos a cada repetição
+    logging.getLogger("diario_crawler").setLevel(logging.ERROR)
+
+    structures = load_structures()
+    if structures:
+        compare("cassetes VCR", structures, args.repeat)
+    else:
+        print(f"Nenhum cassete encontrado em {CASSETTES_DIR}")
+
+    compare(
+        f"sintética d={args.depth}",
+        [("SINT", synthetic_tree(args.depth))],
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 """Script CLI principal para execução do crawler do Diário Oficial."""
 
+import argparse
 import asyncio
+import multiprocessing
 import os
 import sys
 from datetime import date, datetime, timedelta
@@ -11,7 +13,10 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
-from diario_crawler.core import GazetteCrawler
+from diario_crawler.core import CrawlResult, GazetteCrawler, MultiCrawlerRunner
+from diario_crawler.core.backfill import BackfillWorker
+from diario_crawler.core.jobs import DEFAULT_LEASE_SECONDS, JobQueue
+from diario_crawler.core.runner import MAX_IN_FLIGHT
 from diario_crawler.crawler_configs.base import BaseCrawlerConfig
 from diario_crawler.storage import (
     LocalBackend,
@@ -57,6 +62,46 @@ def load_crawler_config(municipality: str) -> Type[BaseCrawlerConfig]:
         raise ImportError(f"Erro ao carregar configuração para '{municipality}': {e}")
 
 
+def resolve_municipalities(value: str) -> list[str]:
+    """
+    Interpreta --municipality: um id, lista separada por vírgula ou "all".
+
+    Returns:
+        Lista de ids sem repetição, na ordem informada
+    """
+    if value.strip().lower() == "all":
+        return list(AVAILABLE_CRAWLERS)
+
+    names = list(dict.fromkeys(n.strip() for n in value.split(",") if n.strip()))
+    unknown = [n for n in names if n not in AVAILABLE_CRAWLERS]
+    if unknown or not names:
+        available = ", ".join(AVAILABLE_CRAWLERS.keys())
+        raise ValueError(
+            f"Município(s) não encontrado(s): {', '.join(unknown) or value!r}. "
+            f"Disponíveis: {available}, all"
+        )
+    return names
+
+
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+def parse_size(value: str) -> int:
+    """
+    Interpreta tamanhos como "512M", "2G" ou "1048576" (bytes).
+
+    Returns:
+        Tamanho em bytes
+    """
+    text = value.strip().upper().removesuffix("B")
+    unit = text[-1:] if text[-1:] in SIZE_UNITS else ""
+    number = text[: len(text) - len(unit)]
+    try:
+        return int(float(number) * SIZE_UNITS[unit])
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Tamanho inválido: {value!r}")
+
+
 def list_available_crawlers():
     """Lista crawlers disponíveis."""
     table = Table(title="🏛️  Crawlers Disponíveis", show_header=True)
@@ -73,8 +118,6 @@ def list_available_crawlers():
 
 def parse_arguments():
     """Parse argumentos de linha de comando."""
-    import argparse
-
     parser = argparse.ArgumentParser(
         description="Crawler de Diários Oficiais Multi-Município",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -93,6 +136,17 @@ Exemplos de uso:
     --end-date 2025-01-31 \
     --storage minio
   
+  # Todos os municípios no mesmo processo (orçamento global de requisições)
+  python run_crawler.py --municipality all --days 1 --max-in-flight 64
+
+  # Backfill distribuído: 4 processos neste host (repita em outros hosts
+  # apontando para o mesmo arquivo de fila em disco compartilhado)
+  python run_crawler.py \
+    --municipality rj_rio_de_janeiro,ms_corumba \
+    --start-date 2012-06-26 \
+    --job-queue /mnt/shared/backfill.sqlite \
+    --workers 4
+
   # Crawler ES (com output customizado)
   python run_crawler.py \
     --municipality es_associacao_municipios \
@@ -102,6 +156,15 @@ Exemplos de uso:
   
   # Migrar dados para MinIO
   python run_crawler.py --municipality sp_sao_jose_dos_campos --migrate-to-minio
+
+  # Reconstruir o índice de conteúdo (deduplicação de blobs)
+  python run_crawler.py --storage minio --rebuild-index
+
+  # Compactar os lotes pequenos de cada partição
+  python run_crawler.py --storage minio --compact
+
+  # Mover blobs soltos para packfiles
+  python run_crawler.py --storage minio --migrate-to-packs --delete-loose
         """,
     )
 
@@ -110,8 +173,10 @@ Exemplos de uso:
         "--municipality",
         "--m",
         type=str,
-        choices=list(AVAILABLE_CRAWLERS.keys()),
-        help="Município/região para crawler (obrigatório)",
+        help=(
+            "Município/região para crawler (obrigatório): um id, lista "
+            "separada por vírgula ou 'all'"
+        ),
     )
 
     # Utilitários
@@ -152,7 +217,173 @@ Exemplos de uso:
         "--max-concurrent",
         type=int,
         default=10,
-        help="Número máximo de requisições concorrentes (padrão: 10)",
+        help=(
+            "Concorrência inicial; ajustada automaticamente (AIMD) e "
+            "lembrada por domínio entre execuções (padrão: 10)"
+        ),
+    )
+    config_group.add_argument(
+        "--max-adaptive-concurrency",
+        type=int,
+        default=BaseCrawlerConfig.MAX_ADAPTIVE_CONCURRENCY,
+        help=(
+            "Teto do limite adaptativo de concorrência "
+            f"(padrão: {BaseCrawlerConfig.MAX_ADAPTIVE_CONCURRENCY})"
+        ),
+    )
+    config_group.add_argument(
+        "--rate-limit",
+        type=float,
+        default=BaseCrawlerConfig.REQUESTS_PER_SECOND,
+        help=(
+            "Teto de requisições por segundo por domínio, 0 desabilita "
+            f"(padrão: {BaseCrawlerConfig.REQUESTS_PER_SECOND})"
+        ),
+    )
+
+    config_group.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=MAX_IN_FLIGHT,
+        help=(
+            "Teto global de requisições simultâneas ao rodar vários "
+            f"municípios (padrão: {MAX_IN_FLIGHT})"
+        ),
+    )
+    config_group.add_argument(
+        "--max-inflight-bytes",
+        type=parse_size,
+        default=BaseCrawlerConfig.MAX_INFLIGHT_BYTES,
+        help=(
+            "Teto de corpos de resposta em memória (ex.: 512M, 2G; 0 "
+            "desabilita); excedido, novas requisições aguardam e as edições "
+            "prontas são gravadas antes do fim do lote (padrão: 512M)"
+        ),
+    )
+    config_group.add_argument(
+        "--target-batch-articles",
+        type=int,
+        help=(
+            "Meta de artigos por lote; o número de datas por lote passa a se "
+            "ajustar a ela, começando por --batch-size"
+        ),
+    )
+    config_group.add_argument(
+        "--parse-workers",
+        type=int,
+        default=BaseCrawlerConfig.PARSE_WORKERS,
+        help=(
+            "Processos para parsing do HTML das estruturas, 0 parseia no "
+            f"event loop (padrão: {BaseCrawlerConfig.PARSE_WORKERS})"
+        ),
+    )
+    config_group.add_argument(
+        "--write-workers",
+        type=int,
+        default=BaseCrawlerConfig.WRITE_WORKERS,
+        help=(
+            "Threads de escrita do Parquet (compressão e codificação); "
+            "até esse número de lotes é gravado ao mesmo tempo "
+            f"(padrão: {BaseCrawlerConfig.WRITE_WORKERS})"
+        ),
+    )
+    config_group.add_argument(
+        "--extract-text",
+        action="store_true",
+        help=(
+            "Extrai o texto limpo do HTML das matérias (colunas text e "
+            "text_length), no pool de parsing"
+        ),
+    )
+    config_group.add_argument(
+        "--extract-pdf",
+        action="store_true",
+        help=(
+            "Baixa os PDFs das edições e extrai o texto das páginas dos PDFs "
+            "de edições e matérias em processos (tabela pdf_pages; requer "
+            "pypdf)"
+        ),
+    )
+    config_group.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Retoma a partir do checkpoint, pulando datas e edições já "
+            "concluídas e salvas"
+        ),
+    )
+
+    config_group.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Baixa novamente o conteúdo de artigos já armazenados",
+    )
+
+    # Grupo de backfill distribuído
+    backfill_group = parser.add_argument_group("Backfill Distribuído")
+    backfill_group.add_argument(
+        "--job-queue",
+        type=Path,
+        help=(
+            "Arquivo SQLite da fila de shards; habilita o modo backfill "
+            "(pode ficar em disco compartilhado entre hosts)"
+        ),
+    )
+    backfill_group.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processos worker neste host no modo backfill (padrão: 1)",
+    )
+    backfill_group.add_argument(
+        "--shard-days",
+        type=int,
+        default=30,
+        help="Dias por shard no modo backfill (padrão: 30)",
+    )
+    backfill_group.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=DEFAULT_LEASE_SECONDS,
+        help=(
+            "Duração do lease de um shard; shards de workers mortos voltam à "
+            f"fila após esse tempo (padrão: {DEFAULT_LEASE_SECONDS:g})"
+        ),
+    )
+
+    # Grupo de cache HTTP
+    cache_group = parser.add_argument_group("Configurações de Cache HTTP")
+    cache_group.add_argument(
+        "--http-cache-dir",
+        type=Path,
+        default=os.getenv("HTTP_CACHE_DIR", str(BaseCrawlerConfig.HTTP_CACHE_DIR)),
+        help=(
+            "Diretório do cache HTTP de metadados e estruturas "
+            f"(padrão: {BaseCrawlerConfig.HTTP_CACHE_DIR} ou $HTTP_CACHE_DIR)"
+        ),
+    )
+    cache_group.add_argument(
+        "--no-http-cache",
+        action="store_true",
+        help="Desabilita o cache HTTP",
+    )
+    cache_group.add_argument(
+        "--cache-ttl-days",
+        type=int,
+        default=BaseCrawlerConfig.CACHE_TTL_DAYS,
+        help=(
+            "Dias em que páginas de datas antigas não são rebaixadas "
+            f"(padrão: {BaseCrawlerConfig.CACHE_TTL_DAYS})"
+        ),
+    )
+    cache_group.add_argument(
+        "--cache-old-after-days",
+        type=int,
+        default=BaseCrawlerConfig.CACHE_OLD_AFTER_DAYS,
+        help=(
+            "Idade em dias a partir da qual uma data é considerada antiga "
+            f"(padrão: {BaseCrawlerConfig.CACHE_OLD_AFTER_DAYS})"
+        ),
     )
 
     # Grupo de storage
@@ -172,8 +403,13 @@ Exemplos de uso:
     storage_group.add_argument(
         "--partition-by",
         choices=["day", "month", "year"],
-        default="day",
-        help="Nível de partição dos dados (padrão: day)",
+        default="month",
+        help="Nível de partição dos dados (padrão: month)",
+    )
+    storage_group.add_argument(
+        "--pack-blobs",
+        action="store_true",
+        help="Gravar blobs de conteúdo em packfiles (packs/) em vez de um objeto por blob",
     )
 
     # Grupo MinIO/S3
@@ -250,6 +486,26 @@ Exemplos de uso:
     util_group.add_argument(
         "--show-stats", action="store_true", help="Mostrar estatísticas do storage"
     )
+    util_group.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="Reconstruir o índice de conteúdo a partir da listagem de content/",
+    )
+    util_group.add_argument(
+        "--migrate-to-packs",
+        action="store_true",
+        help="Mover blobs soltos de content/ para packfiles",
+    )
+    util_group.add_argument(
+        "--delete-loose",
+        action="store_true",
+        help="Com --migrate-to-packs, remove os blobs soltos já empacotados",
+    )
+    util_group.add_argument(
+        "--compact",
+        action="store_true",
+        help="Compactar os lotes de cada partição em poucos arquivos grandes",
+    )
     util_group.add_argument(
         "--dry-run", action="store_true", help="Simular execução sem salvar dados"
     )
@@ -257,6 +513,13 @@ Exemplos de uso:
     return parser.parse_args()
 
 
+def is_storage_utility(args) -> bool:
+    """Indica se a execução é só um utilitário de storage (sem município)."""
+    return bool(
+        args.show_stats or args.rebuild_index or args.migrate_to_packs or args.compact
+    )
+
+
 def validate_arguments(args) -> bool:
     """Valida os argumentos fornecidos."""
     errors = []
@@ -266,7 +529,7 @@ def validate_arguments(args) -> bool:
         return True
 
     # Município é obrigatório para operações principais
-    if not args.municipality and not (args.show_stats and args.storage):
+    if not args.municipality and not (is_storage_utility(args) and args.storage):
         errors.append(
             "Argumento --municipality é obrigatório. "
             "Use --list-crawlers para ver opções disponíveis."
@@ -276,13 +539,17 @@ def validate_arguments(args) -> bool:
     # Carrega configuração do município para validar datas
     if args.municipality:
         try:
-            ConfigClass = load_crawler_config(args.municipality)
-            min_date = ConfigClass.DEFAULT_START_DATE
+            municipalities = resolve_municipalities(args.municipality)
+            # Vários municípios: a data inicial é ajustada para cada um
+            ConfigClass = load_crawler_config(municipalities[0])
+            min_date = (
+                ConfigClass.DEFAULT_START_DATE if len(municipalities) == 1 else date.min
+            )
         except Exception as e:
-            errors.append(f"Erro ao carregar configuração: {e}")
+            logger.error(f"❌ Erro ao carregar configuração: {e}")
             return False
     else:
-        # Para show-stats sem município, usa data padrão
+        # Para utilitários sem município, usa data padrão
         min_date = date(2020, 1, 1)
 
     # Valida datas
@@ -304,6 +571,33 @@ def validate_arguments(args) -> bool:
     if args.max_concurrent <= 0:
         errors.append("Número de requisições concorrentes deve ser positivo")
 
+    if args.rate_limit < 0:
+        errors.append("Rate limit não pode ser negativo")
+
+    if args.cache_ttl_days < 0 or args.cache_old_after_days < 0:
+        errors.append("Parâmetros de cache devem ser não-negativos")
+
+    if args.workers <= 0 or args.shard_days <= 0 or args.lease_seconds <= 0:
+        errors.append("Parâmetros de backfill devem ser positivos")
+
+    if args.max_in_flight <= 0:
+        errors.append("Teto global de requisições deve ser positivo")
+
+    if args.max_inflight_bytes < 0:
+        errors.append("Teto de memória não pode ser negativo")
+
+    if args.target_batch_articles is not None and args.target_batch_articles <= 0:
+        errors.append("Meta de artigos por lote deve ser positiva")
+
+    if args.parse_workers < 0:
+        errors.append("Workers de parsing não podem ser negativos")
+
+    if args.write_workers <= 0:
+        errors.append("Workers de escrita devem ser positivos")
+
+    if args.max_adaptive_concurrency < args.max_concurrent:
+        errors.append("Teto de concorrência adaptativa deve ser >= --max-concurrent")
+
     if args.days < 0:
         errors.append("Número de dias deve ser não-negativo")
 
@@ -382,23 +676,55 @@ def create_storage(args) -> ParquetStorage:
         partition_by=args.partition_by,
         enable_duckdb=args.enable_duckdb,
         duckdb_path=duckdb_path,
+        pack_blobs=args.pack_blobs,
     )
 
     return storage
 
 
+def build_config(
+    config_class: Type[BaseCrawlerConfig], args, start_date: date, end_date: date
+) -> BaseCrawlerConfig:
+    """Cria a configuração do município a partir dos argumentos."""
+    return config_class(
+        start_date=start_date,
+        end_date=end_date,
+        batch_size=args.batch_size,
+        max_concurrent=args.max_concurrent,
+        max_adaptive_concurrency=args.max_adaptive_concurrency,
+        requests_per_second=args.rate_limit,
+        http_cache_dir=None if args.no_http_cache else args.http_cache_dir,
+        cache_ttl_days=args.cache_ttl_days,
+        cache_old_after_days=args.cache_old_after_days,
+        resume=args.resume,
+        refresh=args.refresh,
+        parse_workers=args.parse_workers,
+        write_workers=args.write_workers,
+        max_inflight_bytes=args.max_inflight_bytes,
+        target_batch_articles=args.target_batch_articles,
+        extract_text=args.extract_text,
+        extract_pdf=args.extract_pdf,
+    )
+
+
 def display_config_summary(
-    args, config_class: Type[BaseCrawlerConfig], start_date: date, end_date: date
+    args,
+    config_classes: list[Type[BaseCrawlerConfig]],
+    start_date: date,
+    end_date: date,
 ):
     """Exibe resumo da configuração usando Rich."""
     table = Table(title="⚙️  Configuração do Crawler", show_header=False)
     table.add_column("Parâmetro", style="cyan", width=25)
     table.add_column("Valor", style="green")
 
-    # Município
-    table.add_row("🏛️  Município", args.municipality)
-    table.add_row("🌐 Domínio", config_class.DOMAIN_URL)
-    table.add_row("📅 Data mínima", str(config_class.DEFAULT_START_DATE))
+    # Município(s)
+    for config_class in config_classes:
+        table.add_row("🏛️  Município", config_class.NAME)
+        table.add_row("🌐 Domínio", config_class.DOMAIN_URL)
+        table.add_row("📅 Data mínima", str(config_class.DEFAULT_START_DATE))
+    if len(config_classes) > 1:
+        table.add_row("🌍 Teto global", f"{args.max_in_flight} requisições")
 
     # Período
     table.add_row("", "")  # Separador
@@ -408,8 +734,41 @@ def display_config_summary(
 
     # Crawler
     table.add_row("", "")
-    table.add_row("📦 Batch size", str(args.batch_size))
-    table.add_row("⚡ Concorrência", str(args.max_concurrent))
+    batch_info = str(args.batch_size)
+    if args.target_batch_articles:
+        batch_info += f" datas (adaptativo, ~{args.target_batch_articles} artigos)"
+    table.add_row("📦 Batch size", batch_info)
+    table.add_row(
+        "🧠 Teto de memória",
+        (
+            f"{args.max_inflight_bytes / 1024**2:.0f} MiB"
+            if args.max_inflight_bytes
+            else "sem limite"
+        ),
+    )
+    table.add_row(
+        "⚡ Concorrência",
+        f"{args.max_concurrent} (adaptativa até {args.max_adaptive_concurrency})",
+    )
+    table.add_row(
+        "🚦 Rate limit",
+        f"{args.rate_limit:g} req/s" if args.rate_limit else "sem limite",
+    )
+
+    table.add_row(
+        "🧵 Workers",
+        f"{args.parse_workers or 'sem'} de parsing, {args.write_workers} de escrita",
+    )
+
+    table.add_row("📝 Texto limpo", "✅ Sim" if args.extract_text else "❌ Não")
+
+    table.add_row("📄 Texto de PDFs", "✅ Sim" if args.extract_pdf else "❌ Não")
+
+    table.add_row("⏯️  Retomar", "✅ Sim" if args.resume else "❌ Não")
+
+    table.add_row(
+        "🔁 Artigos já salvos", "rebaixar" if args.refresh else "pular (índice)"
+    )
 
     # Storage
     table.add_row("", "")
@@ -423,6 +782,14 @@ def display_config_summary(
     table.add_row("💾 Storage", storage_info)
     table.add_row("🗂️  Partição", args.partition_by)
 
+    # Cache HTTP
+    cache_info = (
+        "❌ Desabilitado"
+        if args.no_http_cache
+        else f"✅ {args.http_cache_dir} (TTL {args.cache_ttl_days}d)"
+    )
+    table.add_row("🗄️  Cache HTTP", cache_info)
+
     # DuckDB
     table.add_row("", "")
     duckdb_status = "✅ Habilitado" if args.enable_duckdb else "❌ Desabilitado"
@@ -443,6 +810,7 @@ def display_results(stats: dict, execution_time: float):
   • Artigos processados: [bold]{stats.get('articles', 0)}[/bold]
   • Relacionamentos: [bold]{stats.get('relationships', 0)}[/bold]
   • Batch ID: [dim]{stats.get('batch_id', 'N/A')}[/dim]
+  • Concorrência aprendida: [bold]{stats.get('concurrency_limit', 'N/A')}[/bold]
 
 [cyan]Performance:[/cyan]
   • Tempo total: [bold]{execution_time:.2f}s[/bold]
@@ -459,6 +827,137 @@ def display_results(stats: dict, execution_time: float):
     console.print(panel)
 
 
+def display_multi_results(results: list[CrawlResult], execution_time: float):
+    """Exibe o resultado de cada município ao rodar vários juntos."""
+    table = Table(title="📊 Resultados por Município", show_header=True)
+    table.add_column("Município", style="cyan")
+    table.add_column("Edições", justify="right")
+    table.add_column("Artigos", justify="right")
+    table.add_column("Concorrência", justify="right")
+    table.add_column("Status")
+
+    for result in results:
+        table.add_row(
+            result.municipality,
+            str(result.editions),
+            str(result.articles),
+            str(result.concurrency_limit or "N/A"),
+            "✅" if result.ok else f"[red]❌ {result.error}[/red]",
+        )
+
+    console.print(table)
+    console.print(f"  • Tempo total: [bold]{execution_time:.2f}s[/bold]")
+
+
+async def run_many(
+    args,
+    config_classes: list[Type[BaseCrawlerConfig]],
+    storage: ParquetStorage,
+    start_date: date,
+    end_date: date,
+):
+    """Roda vários municípios no mesmo processo com orçamento global."""
+    configs = []
+    for config_class in config_classes:
+        # Cada município começa no máximo em sua data mínima
+        municipality_start = max(start_date, config_class.DEFAULT_START_DATE)
+        if municipality_start > end_date:
+            logger.warning(
+                f"⚠️  {config_class.NAME}: período anterior a "
+                f"{config_class.DEFAULT_START_DATE}, ignorado"
+            )
+            continue
+        configs.append(build_config(config_class, args, municipality_start, end_date))
+
+    runner = MultiCrawlerRunner(
+        configs,
+        storage,
+        max_in_flight=args.max_in_flight,
+        parse_workers=args.parse_workers,
+        write_workers=args.write_workers,
+        max_inflight_bytes=args.max_inflight_bytes,
+    )
+    console.print(
+        f"[bold green]🚀 Iniciando crawler para {len(configs)} municípios...[/bold green]\n"
+    )
+
+    start_time = datetime.now()
+    try:
+        results = await runner.run()
+    except KeyboardInterrupt:
+        console.print("\n[yellow]⚠️  Execução interrompida pelo usuário[/yellow]")
+        sys.exit(1)
+    execution_time = (datetime.now() - start_time).total_seconds()
+
+    display_multi_results(results, execution_time)
+    if not all(result.ok for result in results):
+        sys.exit(1)
+
+
+def backfill_worker_main(args) -> None:
+    """Processo worker do backfill: consome shards até a fila esvaziar."""
+    setup_logging(level=args.log_level, log_file=args.log_file)
+    storage = create_storage(args) if not args.dry_run else MockStorage()
+
+    def config_factory(name: str, start: date, end: date) -> BaseCrawlerConfig:
+        return build_config(load_crawler_config(name), args, start, end)
+
+    worker = BackfillWorker(
+        JobQueue(args.job_queue),
+        storage,
+        config_factory,
+        lease_seconds=args.lease_seconds,
+        parse_workers=args.parse_workers,
+        write_workers=args.write_workers,
+        max_inflight_bytes=args.max_inflight_bytes,
+    )
+    asyncio.run(worker.run())
+
+
+async def run_backfill(
+    args,
+    config_classes: list[Type[BaseCrawlerConfig]],
+    start_date: date,
+    end_date: date,
+):
+    """Enfileira os shards (idempotente) e roda os workers deste host."""
+    queue = JobQueue(args.job_queue)
+    for config_class in config_classes:
+        municipality_start = max(start_date, config_class.DEFAULT_START_DATE)
+        if municipality_start <= end_date:
+            queue.enqueue_range(
+                config_class.NAME, municipality_start, end_date, args.shard_days
+            )
+
+    console.print(
+        f"[bold green]🚀 Backfill com {args.workers} worker(s) "
+        f"em {args.job_queue}[/bold green]\n"
+    )
+
+    start_time = datetime.now()
+    if args.workers == 1:
+        await asyncio.to_thread(backfill_worker_main, args)
+    else:
+        # spawn: cada worker tem seu próprio interpretador e event loop
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(target=backfill_worker_main, args=(args,))
+            for _ in range(args.workers)
+        ]
+        for process in processes:
+            process.start()
+        await asyncio.to_thread(lambda: [process.join() for process in processes])
+    execution_time = (datetime.now() - start_time).total_seconds()
+
+    table = Table(title="📊 Fila de Shards", show_header=False)
+    table.add_column("Status", style="cyan")
+    table.add_column("Shards", style="green", justify="right")
+    for status, count in queue.stats().items():
+        table.add_row(status, str(count))
+    console.print(table)
+    console.print(f"  • Tempo total: [bold]{execution_time:.2f}s[/bold]")
+
+
 async def migrate_to_minio(args):
     """Migra dados locais para MinIO."""
     console.print("\n[bold cyan]🔄 Iniciando migração Local → MinIO[/bold cyan]\n")
@@ -477,13 +976,21 @@ async def migrate_to_minio(args):
         prefix=args.minio_prefix,
     )
 
-    datasets = ["gazettes", "articles", "relationships", "content"]
+    datasets = [
+        "gazettes",
+        "articles",
+        "relationships",
+        "content",
+        "packs",
+        "_pack_index",
+    ]
     total_files = 0
     total_bytes = 0
 
     for dataset in datasets:
         files = local_backend.list_files(
-            dataset, suffix=".parquet" if dataset != "content" else None
+            dataset,
+            suffix=".parquet" if dataset not in ("content", "packs") else None,
         )
 
         if not files:
@@ -522,11 +1029,58 @@ def show_storage_stats(storage: ParquetStorage):
     table.add_row("Arquivos de gazettes", str(stats.get("editions_files", 0)))
     table.add_row("Arquivos de articles", str(stats.get("articles_files", 0)))
     table.add_row("Arquivos de content", str(stats.get("content_files", 0)))
+    table.add_row("Arquivos de packs", str(stats.get("pack_files", 0)))
 
     console.print(table)
     console.print()
 
 
+def rebuild_content_index(storage: ParquetStorage):
+    """Reconstrói o índice de hashes dos blobs de conteúdo."""
+    console.print("\n[bold cyan]🔁 Reconstruindo índice de conteúdo[/bold cyan]\n")
+    total = storage.rebuild_content_index()
+    console.print(f"[bold green]✅ {total} blobs indexados[/bold green]\n")
+
+
+def migrate_to_packs(storage: ParquetStorage, delete_loose: bool = False):
+    """Move os blobs soltos de content/ para packfiles."""
+    console.print("\n[bold cyan]📦 Empacotando blobs de conteúdo[/bold cyan]\n")
+    total = storage.migrate_blobs_to_packs(delete_loose=delete_loose)
+    console.print(f"[bold green]✅ {total} blobs empacotados[/bold green]\n")
+
+
+def compact_storage(storage: ParquetStorage):
+    """Compacta os lotes pequenos de cada partição."""
+    console.print("\n[bold cyan]🗜️  Compactando partições[/bold cyan]\n")
+    stats = storage.compact()
+
+    table = Table(show_header=False)
+    table.add_column("Métrica", style="cyan")
+    table.add_column("Valor", style="green")
+    table.add_row("Partições compactadas", str(stats["partitions"]))
+    table.add_row("Arquivos", f"{stats['files_in']} → {stats['files_out']}")
+    table.add_row("Linhas", f"{stats['rows_in']} → {stats['rows_out']}")
+    table.add_row("Packs pequenos", f"{stats['packs_in']} → {stats['packs_out']}")
+    table.add_row(
+        "Segmentos de índice", f"{stats['segments_in']} → {stats['segments_out']}"
+    )
+
+    console.print(table)
+    console.print()
+
+
+def run_storage_utility(args, storage: ParquetStorage) -> None:
+    """Executa o utilitário de storage pedido na linha de comando."""
+    if args.show_stats:
+        show_storage_stats(storage)
+    elif args.rebuild_index:
+        rebuild_content_index(storage)
+    elif args.migrate_to_packs:
+        migrate_to_packs(storage, delete_loose=args.delete_loose)
+    elif args.compact:
+        compact_storage(storage)
+
+
 async def cli():
     """Função principal."""
     args = parse_arguments()
@@ -553,10 +1107,25 @@ async def cli():
     if not validate_arguments(args):
         sys.exit(1)
 
-    # Carrega configuração do município
+    # Utilitários de storage: não dependem da configuração de município
+    if is_storage_utility(args):
+        try:
+            storage = create_storage(args)
+        except Exception as e:
+            logger.error(f"❌ Erro ao criar storage: {e}")
+            sys.exit(1)
+        run_storage_utility(args, storage)
+        return
+
+    # Carrega configuração do(s) município(s)
     try:
-        ConfigClass = load_crawler_config(args.municipality)
-        logger.info(f"✅ Configuração carregada: {ConfigClass.NAME}")
+        config_classes = [
+            load_crawler_config(name)
+            for name in resolve_municipalities(args.municipality)
+        ]
+        ConfigClass = config_classes[0]
+        for config_class in config_classes:
+            logger.info(f"✅ Configuração carregada: {config_class.NAME}")
     except Exception as e:
         logger.error(f"❌ Erro ao carregar configuração: {e}")
         sys.exit(1)
@@ -569,10 +1138,6 @@ async def cli():
         sys.exit(1)
 
     # Utilitários
-    if args.show_stats:
-        show_storage_stats(storage)
-        return
-
     if args.migrate_to_minio:
         await migrate_to_minio(args)
         return
@@ -581,20 +1146,29 @@ async def cli():
     start_date, end_date = calculate_dates(args)
 
     # Exibe configuração
-    display_config_summary(args, ConfigClass, start_date, end_date)
+    display_config_summary(args, config_classes, start_date, end_date)
 
     # Confirmação para dry-run
     if args.dry_run:
         console.print("[yellow]⚠️  Modo DRY-RUN: dados não serão salvos[/yellow]\n")
 
+    if args.job_queue:
+        await run_backfill(args, config_classes, start_date, end_date)
+        return
+
+    if len(config_classes) > 1:
+        await run_many(
+            args,
+            config_classes,
+            storage if not args.dry_run else MockStorage(),
+            start_date,
+            end_date,
+        )
+        return
+
     try:
         # Cria configuração do crawler com a classe específica do município
-        config = ConfigClass(
-            start_date=start_date,
-            end_date=end_date,
-            batch_size=args.batch_size,
-            max_concurrent=args.max_concurrent,
-        )
+        config = build_config(ConfigClass, args, start_date, end_date)
 
         # Cria crawler
         crawler = GazetteCrawler(
@@ -622,6 +1196,7 @@ async def cli():
                 "start_time": start_time.isoformat(),
                 "end_time": end_time.isoformat(),
                 "municipality": args.municipality,
+                "concurrency_limit": crawler.concurrency_limit,
             }
         else:
             # Pega estatísticas do último batch salvo
@@ -633,6 +1208,7 @@ async def cli():
                 "start_time": start_time.isoformat(),
                 "end_time": end_time.isoformat(),
                 "municipality": args.municipality,
+                "concurrency_limit": crawler.concurrency_limit,
             }
 
         # Exibe resultados
@@ -1,5 +1,6 @@
 """Módulo core do crawler."""
 
 from .crawler import GazetteCrawler
+from .runner import CrawlResult, MultiCrawlerRunner
 
-__all__ = ["GazetteCrawler"]
+__all__ = ["GazetteCrawler", "MultiCrawlerRunner", "CrawlResult"]
@@ -0,0 +1,182 @@
+"""Worker de backfill que consome shards de uma JobQueue."""
+
+import asyncio
+import os
+import socket
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable
+
+from diario_crawler.core.crawler import GazetteCrawler
+from diario_crawler.core.executors import ExecutorPool
+from diario_crawler.core.jobs import DEFAULT_LEASE_SECONDS, JobQueue, Shard
+from diario_crawler.core.limiter import ByteBudget
+from diario_crawler.crawler_configs.base import BaseCrawlerConfig
+from diario_crawler.storage import ParquetStorage, StorageWriter
+from diario_crawler.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Recebe (município, início, fim) e devolve a configuração do crawler
+ConfigFactory = Callable[[str, date, date], BaseCrawlerConfig]
+
+
+def default_worker_id() -> str:
+    """Identificador único do worker: ``host:pid``."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+@dataclass
+class BackfillStats:
+    """Totais processados por um worker."""
+
+    shards: int = 0
+    failed: int = 0
+    editions: int = 0
+    articles: int = 0
+
+
+class BackfillWorker:
+    """
+    Reserva shards da fila, executa o crawler de cada um e faz o commit.
+
+    Enquanto o shard roda, o lease é renovado a cada terço da sua duração.
+    Se o lease for perdido (worker travado por mais que o lease), o crawling
+    do shard é cancelado, pois outro worker já o reservou. O worker termina
+    quando não há shards pendentes nem leases de outros workers que possam
+    expirar.
+
+    Os pools de parsing e de escrita, o escritor do storage e o teto de
+    memória são criados uma vez por worker e compartilhados pelos crawlers
+    de todos os shards, em vez de recriados (com seus processos) a cada um.
+
+    Uso:
+        worker = BackfillWorker(queue, storage, config_factory)
+        stats = await worker.run()
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        storage: ParquetStorage,
+        config_factory: ConfigFactory,
+        worker_id: str | None = None,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        poll_interval: float = 30.0,
+        parse_workers: int = BaseCrawlerConfig.PARSE_WORKERS,
+        write_workers: int = BaseCrawlerConfig.WRITE_WORKERS,
+        max_pending_writes: int = BaseCrawlerConfig.PIPELINE_DEPTH,
+        max_inflight_bytes: int = BaseCrawlerConfig.MAX_INFLIGHT_BYTES,
+    ):
+        """
+        Args:
+            queue: Fila de shards
+            storage: Storage onde as edições são persistidas
+            config_factory: Cria a configuração do crawler para um shard
+            worker_id: Identificador do worker (padrão: host:pid)
+            lease_seconds: Duração do lease de cada shard
+            poll_interval: Espera (s) quando só restam shards reservados por
+                outros workers
+            parse_workers: Processos de parsing de HTML (0 = no event loop)
+            write_workers: Threads de escrita do storage
+            max_pending_writes: Lotes aguardando escrita antes de segurar o
+                crawler
+            max_inflight_bytes: Teto de bytes de respostas em memória
+                (0 desabilita)
+        """
+        self.queue = queue
+        self.storage = storage
+        self.config_factory = config_factory
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.stats = BackfillStats()
+
+        self.executors = ExecutorPool(parse_workers, write_workers)
+        self.writer = StorageWriter(
+            max_pending=max_pending_writes,
+            executor=self.executors.write_executor(),
+            name=self.worker_id,
+            max_concurrent=write_workers,
+        )
+        self.byte_budget = (
+            ByteBudget(max_inflight_bytes) if max_inflight_bytes else None
+        )
+
+    def __repr__(self) -> str:
+        return f"<BackfillWorker id={self.worker_id}>"
+
+    async def _crawl(self, shard: Shard) -> tuple[int, int]:
+        config = self.config_factory(
+            shard.municipality, shard.start_date, shard.end_date
+        )
+        crawler = GazetteCrawler(
+            config,
+            self.storage,
+            writer=self.writer,
+            executors=self.executors,
+            byte_budget=self.byte_budget,
+        )
+        crawl = asyncio.create_task(crawler.run())
+
+        interval = self.lease_seconds / 3
+        while True:
+            done, _ = await asyncio.wait({crawl}, timeout=interval)
+            if done:
+                return crawl.result()
+
+            renewed = await asyncio.to_thread(
+                self.queue.heartbeat, shard.id, self.worker_id, self.lease_seconds
+            )
+            if not renewed:
+                crawl.cancel()
+                await asyncio.gather(crawl, return_exceptions=True)
+                raise RuntimeError(f"Lease do shard {shard.id} perdido")
+
+    async def run_shard(self, shard: Shard) -> bool:
+        """Executa um shard e registra o resultado na fila."""
+        logger.info(f"[{self.worker_id}] Iniciando {shard}")
+        try:
+            n_editions, n_articles = await self._crawl(shard)
+        except Exception as e:
+            logger.exception(f"[{self.worker_id}] Falha em {shard}: {e}")
+            await asyncio.to_thread(self.queue.fail, shard.id, self.worker_id, str(e))
+            self.stats.failed += 1
+            return False
+
+        if not await asyncio.to_thread(self.queue.complete, shard.id, self.worker_id):
+            logger.warning(f"[{self.worker_id}] {shard} concluído após perder o lease")
+
+        self.stats.shards += 1
+        self.stats.editions += n_editions
+        self.stats.articles += n_articles
+        logger.info(
+            f"[{self.worker_id}] {shard} concluído: "
+            f"{n_editions} edições, {n_articles} artigos"
+        )
+        return True
+
+    async def run(self) -> BackfillStats:
+        """Consome shards até a fila esvaziar."""
+        try:
+            while True:
+                shard = await asyncio.to_thread(
+                    self.queue.claim, self.worker_id, self.lease_seconds
+                )
+                if shard is not None:
+                    await self.run_shard(shard)
+                    continue
+
+                # Shards reservados por outros podem voltar se o lease expirar
+                if not (await asyncio.to_thread(self.queue.stats))["leased"]:
+                    break
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            await self.writer.aclose()
+            await asyncio.to_thread(self.executors.shutdown)
+
+        logger.info(
+            f"[{self.worker_id}] Fila esgotada: {self.stats.shards} shards, "
+            f"{self.stats.failed} falhas"
+        )
+        return self.stats
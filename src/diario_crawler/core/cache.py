@@ -0,0 +1,158 @@
+"""Cache HTTP persistente em disco com revalidação condicional."""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+import httpx
+
+from diario_crawler.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Recebe a URL e retorna o TTL de frescor em segundos (None = não cachear)
+TtlResolver = Callable[[str], float | None]
+
+
+@dataclass
+class CacheEntry:
+    """Metadados de uma resposta armazenada no cache."""
+
+    url: str
+    stored_at: float
+    content_type: str = ""
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    def is_fresh(self, ttl: float | None) -> bool:
+        return bool(ttl) and self.age() < ttl
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Headers para revalidação (If-None-Match / If-Modified-Since)."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    Cache de respostas HTTP em disco, chaveado pela URL.
+
+    Cada entrada guarda o corpo (``<sha256>.body``) e os metadados
+    (``<sha256>.json``) com ETag/Last-Modified. Entradas dentro do TTL são
+    servidas sem rede; as demais são revalidadas com requisição condicional e
+    um 304 reaproveita o corpo salvo.
+
+    Os métodos fazem I/O de disco bloqueante: no event loop, o HttpClient os
+    chama via ``asyncio.to_thread``.
+
+    Uso:
+        cache = HttpCache("data/http_cache", ttl_for=lambda url: 3600)
+        client = HttpClient(cache=cache)
+    """
+
+    def __init__(
+        self,
+        directory: Path | str,
+        ttl_for: TtlResolver | None = None,
+        default_ttl: float | None = 0.0,
+    ):
+        """
+        Args:
+            directory: Diretório raiz do cache
+            ttl_for: Função que define o TTL por URL (None = não cachear a URL)
+            default_ttl: TTL usado quando ttl_for não é informado
+                (0 = sempre revalidar)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl_for = ttl_for
+        self.default_ttl = default_ttl
+
+    def __repr__(self) -> str:
+        return f"<HttpCache dir={self.directory}>"
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = self.directory / key[:2] / key
+        return base.with_suffix(".json"), base.with_suffix(".body")
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Nome temporário único: várias tarefas (e processos) podem gravar a
+        # mesma URL ao mesmo tempo
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+        ) as tmp:
+            tmp.write(data)
+        try:
+            os.replace(tmp.name, path)
+        except OSError:
+            os.unlink(tmp.name)
+            raise
+
+    def ttl(self, url: str) -> float | None:
+        """TTL de frescor da URL em segundos (None se não cacheável)."""
+        if self.ttl_for is not None:
+            return self.ttl_for(url)
+        return self.default_ttl
+
+    def get(self, url: str) -> CacheEntry | None:
+        """Retorna a entrada da URL, se existir."""
+        meta_path, body_path = self._paths(url)
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        try:
+            return CacheEntry(**json.loads(meta_path.read_bytes()))
+        except Exception as e:
+            logger.warning(f"Entrada de cache corrompida para {url}: {e}")
+            return None
+
+    def store(self, url: str, response: httpx.Response) -> None:
+        """Armazena uma resposta 200 com seus validadores."""
+        meta_path, body_path = self._paths(url)
+        entry = CacheEntry(
+            url=url,
+            stored_at=time.time(),
+            content_type=response.headers.get("content-type", ""),
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+        )
+        # Corpo primeiro: metadados só existem com corpo completo
+        self._atomic_write(body_path, response.content)
+        self._atomic_write(meta_path, json.dumps(asdict(entry)).encode("utf-8"))
+
+    def touch(self, entry: CacheEntry) -> None:
+        """Renova o frescor de uma entrada revalidada (304)."""
+        entry.stored_at = time.time()
+        meta_path, _ = self._paths(entry.url)
+        self._atomic_write(meta_path, json.dumps(asdict(entry)).encode("utf-8"))
+
+    def to_response(self, entry: CacheEntry) -> httpx.Response:
+        """Reconstrói um httpx.Response 200 a partir da entrada."""
+        _, body_path = self._paths(entry.url)
+        headers = {"x-cache": "HIT"}
+        if entry.content_type:
+            headers["content-type"] = entry.content_type
+        if entry.etag:
+            headers["etag"] = entry.etag
+        if entry.last_modified:
+            headers["last-modified"] = entry.last_modified
+        return httpx.Response(
+            200,
+            headers=headers,
+            content=body_path.read_bytes(),
+            request=httpx.Request("GET", entry.url),
+        )
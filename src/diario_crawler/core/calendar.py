@@ -0,0 +1,170 @@
+"""Calendário de publicação aprendido por município."""
+
+from datetime import date, timedelta
+
+from diario_crawler.storage import ParquetStorage
+from diario_crawler.utils import get_logger, metrics
+from diario_crawler.utils.holidays import get_holidays
+
+logger = get_logger(__name__)
+
+# Datas mais recentes que isso podem ainda ganhar edições: não são
+# registradas como vazias
+SETTLE_DAYS = 7
+
+# Feriados e fins de semana são só um palpite: uma semana a cada PROBE_WEEKS
+# eles são consultados mesmo assim, para descobrir publicações nesses dias
+PROBE_WEEKS = 4
+
+
+class PublicationCalendar:
+    """
+    Decide quais datas valem uma requisição de metadados.
+
+    Combina a tabela de feriados nacionais/estaduais com o que foi observado
+    em execuções anteriores: datas com edição são sempre consultadas e datas
+    que a API confirmou vazias são puladas. Feriados e sábados/domingos são
+    um palpite: são consultados se o município já publicou naquele feriado
+    (mesmo dia e mês) ou dia da semana e, fora isso, uma semana a cada
+    ``probe_weeks``. Só respostas definitivas (sem ``erro``) entram no
+    calendário. O estado é persistido em ``_state/calendar_<município>``
+    (documento base mais deltas).
+
+    Uso:
+        calendar = PublicationCalendar(storage, "sp_sao_jose_dos_campos", "SP")
+        dates = calendar.candidate_dates(start, end)
+        calendar.observe("2024-01-03", published=True)
+        calendar.save()
+    """
+
+    def __init__(
+        self,
+        storage: ParquetStorage,
+        name: str,
+        state: str | None = None,
+        settle_days: int = SETTLE_DAYS,
+        probe_weeks: int = PROBE_WEEKS,
+    ):
+        """
+        Args:
+            storage: Storage onde o calendário é persistido
+            name: Identificador do município (config.NAME)
+            state: UF do município, para os feriados estaduais
+            settle_days: Idade mínima (dias) para registrar uma data como vazia
+            probe_weeks: Intervalo (semanas) da sondagem de feriados e fins
+                de semana ainda sem publicação conhecida
+        """
+        self.storage = storage
+        self.name = name
+        self.state = state
+        self.settle_days = settle_days
+        self.probe_weeks = probe_weeks
+        self.state_name = f"calendar_{name}"
+
+        saved = self.storage.load_state(self.state_name)
+        self.published: set[str] = set(saved.get("published", []))
+        # Deltas antigos podem ter como vazia uma data publicada depois
+        self.empty: set[str] = set(saved.get("empty", [])) - self.published
+        # Observações ainda não persistidas
+        self._new_published: set[str] = set()
+        self._new_empty: set[str] = set()
+
+    def __repr__(self) -> str:
+        return (
+            f"<PublicationCalendar name={self.name} "
+            f"published={len(self.published)} empty={len(self.empty)}>"
+        )
+
+    def weekend_days(self) -> set[int]:
+        """Dias de fim de semana (5=sáb, 6=dom) em que o município já publicou."""
+        return {
+            weekday
+            for weekday in (date.fromisoformat(d).weekday() for d in self.published)
+            if weekday >= 5
+        }
+
+    def is_probe_week(self, day: date) -> bool:
+        """True na semana (segunda a domingo) de sondagem periódica."""
+        return ((day.toordinal() - 1) // 7) % self.probe_weeks == 0
+
+    def candidate_dates(self, start: date, end: date) -> list[date]:
+        """
+        Datas do intervalo que podem ter edição publicada.
+
+        Returns:
+            Datas em ordem crescente
+        """
+        holidays = get_holidays(start, end, self.state)
+        weekend_days = self.weekend_days()
+        # (mês, dia) com edição: feriados em que o município já publicou
+        published_days = {
+            (d.month, d.day) for d in map(date.fromisoformat, self.published)
+        }
+
+        dates = []
+        skipped = 0
+        for offset in range((end - start).days + 1):
+            day = start + timedelta(days=offset)
+            key = day.isoformat()
+
+            hinted = (
+                day in holidays and (day.month, day.day) not in published_days
+            ) or (day.weekday() >= 5 and day.weekday() not in weekend_days)
+            if key in self.published or not (
+                key in self.empty or (hinted and not self.is_probe_week(day))
+            ):
+                dates.append(day)
+            elif day.weekday() < 5:
+                skipped += 1
+
+        if skipped:
+            logger.info(f"Calendário: {skipped} dias úteis sem publicação pulados")
+            metrics.inc("calendar_skipped_dates", skipped, municipality=self.name)
+        return dates
+
+    def observe(self, pub_date: str, published: bool) -> None:
+        """
+        Registra o resultado definitivo de uma consulta de metadados.
+
+        Respostas com ``erro`` (possivelmente transitório) não devem ser
+        registradas: uma data só vira vazia quando a API confirma que não
+        há edições nela.
+        """
+        try:
+            day = date.fromisoformat(pub_date)
+        except (TypeError, ValueError):
+            return
+
+        if published:
+            if pub_date not in self.published:
+                self.published.add(pub_date)
+                self.empty.discard(pub_date)
+                self._new_published.add(pub_date)
+                self._new_empty.discard(pub_date)
+            return
+
+        age = (date.today() - day).days
+        if age >= self.settle_days and pub_date not in self.empty:
+            self.empty.add(pub_date)
+            self._new_empty.add(pub_date)
+
+    def save(self) -> None:
+        """
+        Persiste as novas observações, se houver.
+
+        Grava só um delta com o que foi observado desde o último ``save``,
+        sem reler o calendário: workers que sondam o mesmo município não
+        sobrescrevem as observações uns dos outros.
+        """
+        if not (self._new_published or self._new_empty):
+            return
+
+        self.storage.append_state(
+            self.state_name,
+            {
+                "published": sorted(self._new_published),
+                "empty": sorted(self._new_empty),
+            },
+        )
+        self._new_published.clear()
+        self._new_empty.clear()
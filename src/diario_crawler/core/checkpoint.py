@@ -0,0 +1,122 @@
+"""Manifesto de checkpoint para retomar crawlings interrompidos."""
+
+import threading
+from datetime import date
+from typing import Iterable, Mapping
+
+from diario_crawler.core.calendar import SETTLE_DAYS
+from diario_crawler.models import GazetteMetadata
+from diario_crawler.storage import ParquetStorage
+from diario_crawler.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class CheckpointManifest:
+    """
+    Registro persistente das datas e edições já concluídas.
+
+    Uma edição só entra no manifesto depois que suas três fases (metadados,
+    estrutura e conteúdo) terminaram sem falhas e o lote foi salvo pelo
+    storage. Uma data é concluída quando todas as edições publicadas nela
+    estão concluídas; uma data sem nenhuma edição só é concluída depois de
+    ``settle_days`` (como no calendário de publicação), já que datas recentes
+    ainda podem ganhar edições. O manifesto é gravado como estado operacional do
+    storage (``_state/checkpoint_<município>``), sempre depois do
+    ``save_editions``, de modo que uma queda nunca marca como concluído algo
+    que não foi escrito. Cada commit grava só as novas conclusões como um
+    delta, então workers do backfill distribuído não sobrescrevem o
+    progresso uns dos outros.
+
+    Uso:
+        manifest = CheckpointManifest(storage, "rj_rio_de_janeiro")
+        urls = [u for d, u in pares if not manifest.is_date_done(d)]
+        ...
+        manifest.commit(edition_ids, editions_by_date)
+    """
+
+    def __init__(
+        self, storage: ParquetStorage, name: str, settle_days: int = SETTLE_DAYS
+    ):
+        """
+        Args:
+            storage: Storage onde o manifesto é persistido
+            name: Identificador do município (config.NAME)
+            settle_days: Idade mínima (dias) para concluir uma data sem edições
+        """
+        self.storage = storage
+        self.state_name = f"checkpoint_{name}"
+        self.settle_days = settle_days
+        # Lotes diferentes podem ser confirmados em threads de escrita paralelas
+        self._lock = threading.Lock()
+
+        state = self.storage.load_state(self.state_name)
+        self.dates: set[str] = set(state.get("dates", []))
+        self.editions: set[str] = set(state.get("editions", []))
+
+        if self.dates or self.editions:
+            logger.info(
+                f"Checkpoint carregado: {len(self.dates)} datas e "
+                f"{len(self.editions)} edições concluídas"
+            )
+
+    def __repr__(self) -> str:
+        return (
+            f"<CheckpointManifest name={self.state_name} "
+            f"dates={len(self.dates)} editions={len(self.editions)}>"
+        )
+
+    def is_date_done(self, pub_date: str) -> bool:
+        return pub_date in self.dates
+
+    def is_edition_done(self, edition_id: str) -> bool:
+        return edition_id in self.editions
+
+    def _is_settled(self, pub_date: str) -> bool:
+        """True quando a data é antiga o bastante para não ganhar edições."""
+        try:
+            day = date.fromisoformat(pub_date)
+        except (TypeError, ValueError):
+            return False
+        return (date.today() - day).days >= self.settle_days
+
+    def pending(self, metadata_list: list[GazetteMetadata]) -> list[GazetteMetadata]:
+        """Filtra as edições que ainda não foram concluídas."""
+        return [m for m in metadata_list if not self.is_edition_done(m.edition_id)]
+
+    def commit(
+        self,
+        edition_ids: Iterable[str],
+        editions_by_date: Mapping[str, Iterable[str]],
+    ) -> list[str]:
+        """
+        Marca edições salvas como concluídas e persiste o manifesto.
+
+        Deve ser chamado somente depois que o storage confirmou a escrita.
+
+        Args:
+            edition_ids: Edições salvas sem falhas
+            editions_by_date: Edições publicadas em cada data conhecida
+
+        Returns:
+            Datas que passaram a ficar concluídas
+        """
+        with self._lock:
+            new_editions = set(edition_ids) - self.editions
+            self.editions.update(new_editions)
+
+            completed = [
+                pub_date
+                for pub_date, ids in editions_by_date.items()
+                if pub_date not in self.dates
+                and (ids or self._is_settled(pub_date))
+                and all(i in self.editions for i in ids)
+            ]
+            self.dates.update(completed)
+
+        if new_editions or completed:
+            self.storage.append_state(
+                self.state_name,
+                {"dates": sorted(completed), "editions": sorted(new_editions)},
+            )
+        return completed
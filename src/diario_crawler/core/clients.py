@@ -1,20 +1,53 @@
 """Cliente HTTP básico para requisições."""
 
 import asyncio
+import hashlib
 import logging
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Callable
+from urllib.parse import urlsplit
 
 import httpx
 from tenacity import (
+    AsyncRetrying,
     after_log,
     before_sleep_log,
     retry,
     retry_if_exception_type,
     stop_after_attempt,
-    wait_exponential,
+    wait_random_exponential,
 )
 
+from diario_crawler.core.cache import HttpCache
+from diario_crawler.core.limiter import (
+    AdaptiveConcurrencyLimiter,
+    ByteBudget,
+    RequestBudget,
+)
+from diario_crawler.core.ratelimit import TokenBucket, parse_retry_after
+from diario_crawler.crawler_configs.base import BaseCrawlerConfig
+from diario_crawler.utils import metrics
+
 logger = logging.getLogger(__name__)
 
+# Tamanho dos blocos gravados em disco por download
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# (url, status_code, tempo decorrido, exceção) de cada tentativa HTTP
+AttemptObserver = Callable[[str, int | None, float, Exception | None], None]
+
+
+def host_of(url: str) -> str:
+    """Retorna o host (netloc) de uma URL."""
+    return urlsplit(url).netloc
+
+
+def limiter_key(url: str) -> str:
+    """Chave do limitador (e do orçamento) de uma URL: o host ou, sem host, a URL."""
+    return host_of(url) or url
+
 
 class HttpClient:
     """Cliente HTTP com tratamento de erros e timeouts configurados."""
@@ -25,7 +58,6 @@ class HttpClient:
         "Accept-Language": "pt-BR,pt;q=0.8,en-US;q=0.5,en;q=0.3",
         "Accept-Encoding": "gzip, deflate, br, zstd",
         "X-Requested-With": "XMLHttpRequest",
-        "Connection": "keep-alive",
         "Referer": "https://diariodomunicipio.sjc.sp.gov.br/",
         "Sec-Fetch-Dest": "empty",
         "Sec-Fetch-Mode": "cors",
@@ -41,18 +73,93 @@ class HttpClient:
         pool=5.0,  # Obter conexão do pool
     )
 
+    # Pausa aplicada ao domínio em 429 sem header Retry-After
+    DEFAULT_429_PAUSE = 5.0
+
     def __init__(
         self,
         headers: dict | None = None,
         timeout: httpx.Timeout | None = None,
+        rate_limit: float | None = None,
+        burst: int | None = None,
+        cache: HttpCache | None = None,
     ):
         """
         Args:
             headers: Headers customizados (merge com DEFAULT_HEADERS)
             timeout: Configuração de timeout customizada
+            rate_limit: Teto de requisições por segundo por domínio (None = sem teto)
+            burst: Rajada máxima do token bucket (padrão: rate_limit)
+            cache: Cache HTTP em disco (None desabilita)
         """
         self.headers = {**self.DEFAULT_HEADERS, **(headers or {})}
         self.timeout = timeout or self.DEFAULT_TIMEOUT
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.cache = cache
+        self._observers: list[AttemptObserver] = []
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        """Token bucket do processo para o domínio da URL."""
+        return TokenBucket.for_host(
+            host_of(url), rate=self.rate_limit, capacity=self.burst
+        )
+
+    def _apply_retry_after(self, url: str, response: httpx.Response) -> None:
+        """Pausa o domínio inteiro em 429 ou quando o servidor envia Retry-After."""
+        delay = parse_retry_after(response.headers.get("retry-after"))
+        if delay is None and response.status_code == 429:
+            delay = self.DEFAULT_429_PAUSE
+        if delay is not None:
+            self.bucket_for(url).pause(delay)
+
+    def add_observer(self, observer: AttemptObserver) -> None:
+        """Registra um callback chamado ao fim de cada tentativa HTTP."""
+        self._observers.append(observer)
+
+    def _notify(
+        self,
+        url: str,
+        status_code: int | None,
+        elapsed: float,
+        error: Exception | None,
+    ) -> None:
+        for observer in self._observers:
+            try:
+                observer(url, status_code, elapsed, error)
+            except Exception as e:
+                logger.error(f"Erro em observador HTTP: {e}")
+
+    def create_session(
+        self,
+        max_connections: int = 10,
+        http2: bool = True,
+    ) -> httpx.AsyncClient:
+        """
+        Cria um cliente httpx de longa duração para ser compartilhado no crawling.
+
+        O pool mantém conexões keep-alive (e sessões TLS) entre lotes e, quando
+        o servidor negocia HTTP/2 via ALPN, multiplexa as requisições sobre
+        poucas conexões.
+
+        Args:
+            max_connections: Limite de conexões simultâneas do pool
+            http2: Habilita negociação de HTTP/2
+
+        Returns:
+            Cliente httpx configurado
+        """
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=30.0,
+        )
+        return httpx.AsyncClient(
+            http2=http2,
+            limits=limits,
+            timeout=self.timeout,
+            follow_redirects=True,
+        )
 
     async def _fetch_internal(
         self,
@@ -62,6 +169,9 @@ class HttpClient:
         """
         Realiza uma requisição HTTP GET assíncrona (internal, raises exceptions).
 
+        Com cache habilitado, entradas frescas são servidas do disco e as demais
+        são revalidadas com If-None-Match/If-Modified-Since.
+
         Args:
             url: URL alvo
             client: Cliente httpx compartilhado
@@ -74,15 +184,52 @@ class HttpClient:
             httpx.TimeoutException: Em caso de timeout
             httpx.RequestError: Em caso de erro de requisição
         """
-        response = await client.get(
-            url,
-            headers=self.headers,
-            timeout=self.timeout,
-            follow_redirects=True,
+        ttl = self.cache.ttl(url) if self.cache else None
+        # Leitura e escrita do cache em disco fora do event loop
+        entry = (
+            await asyncio.to_thread(self.cache.get, url) if ttl is not None else None
         )
+        headers = self.headers
+
+        if entry is not None:
+            if entry.is_fresh(ttl):
+                metrics.inc("http_cache", outcome="fresh")
+                return await asyncio.to_thread(self.cache.to_response, entry)
+            headers = {**self.headers, **entry.conditional_headers()}
+
+        await self.bucket_for(url).acquire()
 
-        # Verifica status code (raise_for_status levanta exceção em 4xx/5xx)
-        response.raise_for_status()
+        start = time.perf_counter()
+        try:
+            response = await client.get(
+                url,
+                headers=headers,
+                timeout=self.timeout,
+                follow_redirects=True,
+            )
+
+            if response.status_code == 304 and entry is not None:
+                # Conteúdo inalterado: serve o corpo do disco
+                self._notify(url, 304, time.perf_counter() - start, None)
+                await asyncio.to_thread(self.cache.touch, entry)
+                metrics.inc("http_cache", outcome="revalidated")
+                return await asyncio.to_thread(self.cache.to_response, entry)
+
+            # Verifica status code (raise_for_status levanta exceção em 4xx/5xx)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            self._notify(url, e.response.status_code, time.perf_counter() - start, e)
+            self._apply_retry_after(url, e.response)
+            raise
+        except httpx.RequestError as e:
+            self._notify(url, None, time.perf_counter() - start, e)
+            raise
+
+        self._notify(url, response.status_code, time.perf_counter() - start, None)
+
+        if ttl is not None and response.status_code == 200:
+            await asyncio.to_thread(self.cache.store, url, response)
+            metrics.inc("http_cache", outcome="miss")
 
         logger.debug(
             f"Requisição bem-sucedida para {url} - Status: {response.status_code}"
@@ -109,6 +256,9 @@ class HttpClient:
         """
         Realiza uma requisição HTTP GET assíncrona com retry automático via tenacity.
 
+        Cada tentativa consome um token do bucket do domínio; respostas 429 ou
+        com Retry-After pausam o bucket, atrasando também as demais tarefas.
+
         Args:
             url: URL alvo
             client: Cliente httpx compartilhado
@@ -124,7 +274,8 @@ class HttpClient:
                 (httpx.TimeoutException, httpx.RequestError, httpx.HTTPStatusError)
             ),
             stop=stop_after_attempt(max_retries),
-            wait=wait_exponential(multiplier=1, min=1, max=10),
+            # Jitter evita que tarefas concorrentes retentem todas juntas
+            wait=wait_random_exponential(multiplier=1, min=1, max=10),
             before_sleep=before_sleep_log(logger, logging.WARNING),
             after=after_log(logger, logging.ERROR),
             reraise=False,
@@ -165,57 +316,233 @@ class HttpClient:
             logger.error(f"Erro crítico após retries em {url}: {e}")
             return None
 
+    async def _download_internal(
+        self, url: str, client: httpx.AsyncClient, dest: Path
+    ) -> tuple[str, int]:
+        """
+        Baixa ``url`` em streaming para ``dest`` (internal, raises exceptions).
+
+        Returns:
+            Tupla (sha256 hexadecimal, tamanho em bytes)
+        """
+        await self.bucket_for(url).acquire()
+
+        start = time.perf_counter()
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async with client.stream(
+                "GET", url, headers=self.headers, timeout=self.timeout
+            ) as response:
+                response.raise_for_status()
+                with open(dest, "wb") as f:
+                    async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        digest.update(chunk)
+                        size += len(chunk)
+        except httpx.HTTPStatusError as e:
+            self._notify(url, e.response.status_code, time.perf_counter() - start, e)
+            self._apply_retry_after(url, e.response)
+            raise
+        except httpx.RequestError as e:
+            self._notify(url, None, time.perf_counter() - start, e)
+            raise
+
+        self._notify(url, response.status_code, time.perf_counter() - start, None)
+        return digest.hexdigest(), size
+
+    async def download(
+        self,
+        url: str,
+        client: httpx.AsyncClient,
+        dest: Path,
+        max_retries: int = 3,
+    ) -> tuple[str, int] | None:
+        """
+        Baixa um arquivo grande (ex.: PDF da edição) direto para o disco.
+
+        O corpo é gravado em blocos à medida que chega, calculando o hash no
+        caminho, sem nunca ficar inteiro em memória. Não passa pelo cache
+        HTTP. Retry e rate limit seguem as mesmas regras de ``fetch``.
+
+        Args:
+            url: URL alvo
+            client: Cliente httpx compartilhado
+            dest: Arquivo de destino (sobrescrito a cada tentativa)
+            max_retries: Número máximo de tentativas (padrão: 3)
+
+        Returns:
+            Tupla (sha256 hexadecimal, tamanho) ou None em caso de erro
+        """
+        retrying = AsyncRetrying(
+            retry=retry_if_exception_type(
+                (httpx.TimeoutException, httpx.RequestError, httpx.HTTPStatusError)
+            ),
+            stop=stop_after_attempt(max_retries),
+            wait=wait_random_exponential(multiplier=1, min=1, max=10),
+            before_sleep=before_sleep_log(logger, logging.WARNING),
+            reraise=True,
+        )
+        try:
+            async for attempt in retrying:
+                with attempt:
+                    try:
+                        return await self._download_internal(url, client, dest)
+                    except httpx.HTTPStatusError as e:
+                        status_code = e.response.status_code
+                        if not self._should_retry_status_error(status_code):
+                            logger.warning(
+                                f"Erro HTTP {status_code} em {url}: {e} (não retentável)"
+                            )
+                            return None
+                        raise
+        except Exception as e:
+            logger.error(f"Falha ao baixar {url} após {max_retries} tentativas: {e}")
+            return None
+
 
 class ConcurrentHttpClient:
     """
-    Cliente HTTP para requisições concorrentes com limitação via asyncio.Semaphore.
+    Cliente HTTP para requisições concorrentes com limitação adaptativa por host.
 
     O retry é gerenciado pelo HttpClient base usando tenacity.
-    Esta classe apenas gerencia a concorrência com semáforo.
+    Esta classe controla a concorrência com um AdaptiveConcurrencyLimiter (AIMD)
+    por host e é dona da sessão httpx compartilhada (pool de conexões) usada
+    durante todo o crawling.
     """
 
     def __init__(
         self,
         base_client: HttpClient | None = None,
         max_concurrent: int = 10,
+        http2: bool = True,
+        max_limit: int = BaseCrawlerConfig.MAX_ADAPTIVE_CONCURRENCY,
+        initial_limits: dict[str, int] | None = None,
+        budget: RequestBudget | None = None,
+        byte_budget: ByteBudget | None = None,
     ):
         """
         Args:
             base_client: Cliente HTTP base (usará o padrão se None)
-            max_concurrent: Número máximo de requisições concorrentes (controlado por asyncio.Semaphore)
+            max_concurrent: Limite inicial de requisições concorrentes por host
+            http2: Habilita HTTP/2 na sessão compartilhada
+            max_limit: Teto do limite adaptativo (nunca abaixo de
+                max_concurrent)
+            initial_limits: Limites aprendidos em execuções anteriores, por host
+            budget: Orçamento global compartilhado com outros clientes do
+                processo (None = só o limite por host)
+            byte_budget: Teto de bytes em memória; novas requisições aguardam
+                enquanto ele estiver excedido (None = sem teto)
         """
         self.client = base_client or HttpClient()
-        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.max_concurrent = max_concurrent
+        self.max_limit = max(max_limit, max_concurrent)
+        self.http2 = http2
+        self.initial_limits = dict(initial_limits or {})
+        self.limiters: dict[str, AdaptiveConcurrencyLimiter] = {}
+        self.budget = budget
+        self.byte_budget = byte_budget
+        self._session: httpx.AsyncClient | None = None
+
+        self.client.add_observer(self._observe)
+
+    @property
+    def session(self) -> httpx.AsyncClient:
+        """Sessão httpx compartilhada, criada sob demanda."""
+        if self._session is None or self._session.is_closed:
+            self._session = self.client.create_session(
+                max_connections=self.max_limit,
+                http2=self.http2,
+            )
+        return self._session
+
+    def limiter_for(self, url: str) -> AdaptiveConcurrencyLimiter:
+        """Retorna (criando se preciso) o limitador do host da URL."""
+        host = limiter_key(url)
+        limiter = self.limiters.get(host)
+        if limiter is None:
+            limiter = AdaptiveConcurrencyLimiter(
+                initial_limit=self.initial_limits.get(host, self.max_concurrent),
+                max_limit=self.max_limit,
+                name=host,
+            )
+            self.limiters[host] = limiter
+        return limiter
+
+    async def wait_for_memory(self) -> None:
+        """Segura novas requisições enquanto o teto de memória estiver excedido."""
+        if self.byte_budget is not None:
+            await self.byte_budget.wait()
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Ocupa uma vaga do host e, se houver, do orçamento global."""
+        async with self.limiter_for(url):
+            if self.budget is None:
+                yield
+            else:
+                async with self.budget.slot(limiter_key(url)):
+                    yield
+
+    def learned_limits(self) -> dict[str, int]:
+        """Limites atuais de concorrência por host."""
+        return {host: limiter.limit for host, limiter in self.limiters.items()}
+
+    def _observe(
+        self,
+        url: str,
+        status_code: int | None,
+        elapsed: float,
+        error: Exception | None,
+    ) -> None:
+        limiter = self.limiters.get(limiter_key(url))
+        if limiter is not None:
+            limiter.observe(url, status_code, elapsed, error)
+
+    async def aclose(self) -> None:
+        """Fecha a sessão compartilhada e libera as conexões do pool."""
+        if self._session is not None and not self._session.is_closed:
+            await self._session.aclose()
+            logger.debug("Sessão HTTP compartilhada encerrada")
+        self._session = None
+
+    async def __aenter__(self) -> "ConcurrentHttpClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
 
     async def fetch_all(
         self,
         urls: list[str],
-        client: httpx.AsyncClient,
+        client: httpx.AsyncClient | None = None,
         max_retries: int = 3,
     ) -> list[httpx.Response | None]:
         """
-        Realiza múltiplas requisições concorrentes com limitação via asyncio.Semaphore.
+        Realiza múltiplas requisições concorrentes com limitação adaptativa por host.
 
         O retry é gerenciado pelo HttpClient base usando tenacity.
 
         Args:
             urls: Lista de URLs para requisitar
-            client: Cliente httpx compartilhado
+            client: Cliente httpx (usa a sessão compartilhada se None)
             max_retries: Número máximo de retries por URL (passado para HttpClient.fetch)
 
         Returns:
             Lista de respostas (ou None para falhas) na mesma ordem das URLs
         """
+        client = client or self.session
 
-        async def fetch_with_semaphore(url: str) -> httpx.Response | None:
+        async def fetch_with_limiter(url: str) -> httpx.Response | None:
             """
-            Realiza uma requisição respeitando o limite de concorrência do semáforo.
+            Realiza uma requisição respeitando o limite de concorrência do host.
             O retry é gerenciado internamente pelo HttpClient via tenacity.
             """
-            async with self.semaphore:
+            await self.wait_for_memory()
+            async with self.slot(url):
                 return await self.client.fetch(url, client, max_retries=max_retries)
 
-        tasks = [fetch_with_semaphore(url) for url in urls]
+        tasks = [fetch_with_limiter(url) for url in urls]
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
         # Processa resultados, convertendo exceções em None
@@ -230,3 +557,106 @@ class ConcurrentHttpClient:
         successful = len([r for r in processed_results if r])
         logger.info(f"Concluídas {successful}/{len(urls)} requisições com sucesso")
         return processed_results
+
+    async def download(
+        self, url: str, dest: Path, max_retries: int = 3
+    ) -> tuple[str, int] | None:
+        """
+        Baixa ``url`` em streaming para ``dest`` respeitando o limite do host.
+
+        O corpo vai direto para o disco, então não conta no teto de memória.
+
+        Returns:
+            Tupla (sha256 hexadecimal, tamanho) ou None em caso de erro
+        """
+        async with self.slot(url):
+            return await self.client.download(
+                url, self.session, dest, max_retries=max_retries
+            )
+
+    async def fetch_iter(
+        self,
+        urls: list[str],
+        client: httpx.AsyncClient | None = None,
+        max_retries: int = 3,
+        max_buffered: int | None = None,
+        wait_for_memory: bool = True,
+    ) -> AsyncIterator[tuple[str, httpx.Response | None]]:
+        """
+        Realiza requisições concorrentes e entrega as respostas à medida que chegam.
+
+        Diferente de fetch_all, o consumidor pode processar cada resposta
+        enquanto as demais ainda estão em andamento. No máximo
+        ``max_buffered`` respostas prontas ficam aguardando consumo; quando o
+        buffer enche, os workers param de iniciar novas requisições. Falhas
+        de requisição viram ``None``; uma falha do worker fora da requisição
+        (ex.: em ``wait_for_memory``) é propagada ao consumidor.
+
+        Args:
+            urls: Lista de URLs para requisitar
+            client: Cliente httpx (usa a sessão compartilhada se None)
+            max_retries: Número máximo de retries por URL (passado para HttpClient.fetch)
+            max_buffered: Respostas prontas mantidas em memória (padrão: max_concurrent)
+            wait_for_memory: Segura novas requisições com o teto de memória
+                excedido (False para requisições que liberam memória ao
+                terminar, ex.: completar edições já iniciadas)
+
+        Yields:
+            Tuplas (url, resposta ou None) em ordem de conclusão
+        """
+        if not urls:
+            return
+
+        client = client or self.session
+        pending = iter(urls)
+        buffer: asyncio.Queue = asyncio.Queue(
+            maxsize=max_buffered or self.max_concurrent
+        )
+
+        async def worker() -> None:
+            error: Exception | None = None
+            try:
+                # Iterador compartilhado: cada worker pega a próxima URL livre
+                for url in pending:
+                    if wait_for_memory:
+                        await self.wait_for_memory()
+                    try:
+                        async with self.slot(url):
+                            response = await self.client.fetch(
+                                url, client, max_retries=max_retries
+                            )
+                    except Exception as e:
+                        logger.error(f"Erro durante requisição concorrente: {e}")
+                        response = None
+                    await buffer.put((url, response))
+            except Exception as e:
+                error = e
+            finally:
+                # Fim do worker (url None), com a falha fora da requisição, se
+                # houver; cancelado pelo consumidor, ninguém mais o espera
+                if not asyncio.current_task().cancelling():
+                    await buffer.put((None, error))
+
+        workers = [
+            asyncio.create_task(worker()) for _ in range(min(self.max_limit, len(urls)))
+        ]
+
+        successful = 0
+        try:
+            running = len(workers)
+            while running:
+                url, response = await buffer.get()
+                if url is None:
+                    running -= 1
+                    if response is not None:
+                        raise response
+                    continue
+                if response:
+                    successful += 1
+                yield url, response
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        logger.info(f"Concluídas {successful}/{len(urls)} requisições com sucesso")
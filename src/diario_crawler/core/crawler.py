@@ -1,20 +1,55 @@
 """Orquestrador principal do crawler."""
 
 import asyncio
+from dataclasses import replace
+from datetime import date
 from typing import AsyncIterator
 
 import httpx
 
-from diario_crawler.core.clients import ConcurrentHttpClient, HttpClient
+from diario_crawler.core.cache import HttpCache
+from diario_crawler.core.calendar import PublicationCalendar
+from diario_crawler.core.checkpoint import CheckpointManifest
+from diario_crawler.core.clients import (
+    ConcurrentHttpClient,
+    HttpClient,
+    limiter_key,
+)
+from diario_crawler.core.executors import ExecutorPool
+from diario_crawler.core.limiter import ByteBudget, RequestBudget
+from diario_crawler.core.pdf import PdfStage
 from diario_crawler.crawler_configs.base import BaseCrawlerConfig
-from diario_crawler.models import ArticleMetadata, GazetteEdition, GazetteMetadata
-from diario_crawler.parsers import ContentParser, HtmlStructureParser, MetadataParser
-from diario_crawler.processors import DataProcessor
-from diario_crawler.storage import ParquetStorage
-from diario_crawler.utils import get_logger, get_workdays
+from diario_crawler.models import (
+    Article,
+    ArticleContent,
+    ArticleMetadata,
+    ContentType,
+    GazetteEdition,
+    GazetteMetadata,
+)
+from diario_crawler.parsers import (
+    ContentParser,
+    HtmlStructureParser,
+    MetadataParser,
+    extract_texts,
+)
+from diario_crawler.parsers.structure import (
+    articles_from_record_batch,
+    parse_structure_to_record_batch,
+)
+from diario_crawler.processors import EditionAssembler
+from diario_crawler.storage import ParquetStorage, StorageWriter
+from diario_crawler.storage.index import IdentifierIndex
+from diario_crawler.utils import get_logger
+from diario_crawler.utils.dates import parse_date
 
 logger = get_logger(__name__)
 
+CONCURRENCY_STATE = "concurrency"
+
+# Suavização da taxa de artigos por dia usada no tamanho adaptativo de lote
+BATCH_RATE_ALPHA = 0.5
+
 
 class GazetteCrawler:
     """
@@ -22,30 +57,230 @@ class GazetteCrawler:
     Processa dados em lotes para otimizar uso de memória.
     """
 
-    def __init__(self, config: BaseCrawlerConfig, storage: ParquetStorage):
+    def __init__(
+        self,
+        config: BaseCrawlerConfig,
+        storage: ParquetStorage,
+        budget: RequestBudget | None = None,
+        writer: StorageWriter | None = None,
+        executors: ExecutorPool | None = None,
+        byte_budget: ByteBudget | None = None,
+    ):
         """
         Args:
             config: Configuração do crawler (usa padrão se None)
+            storage: Storage onde as edições são persistidas
+            budget: Orçamento global de requisições compartilhado com outros
+                crawlers do processo
+            writer: Escritor compartilhado (None = escritor próprio)
+            executors: Pools de parsing e escrita compartilhados (None = cria
+                a partir da configuração)
+            byte_budget: Teto de memória compartilhado com outros crawlers
+                (None = cria a partir de ``max_inflight_bytes``)
         """
         self.config = config
+        self.storage = storage
+
+        # Parsing de HTML e escrita de Parquet fora do event loop
+        self._owns_executors = executors is None
+        self.executors = executors or ExecutorPool(
+            parse_workers=self.config.parse_workers,
+            write_workers=self.config.write_workers,
+        )
+
+        # Escritor em segundo plano: o lote N é gravado enquanto o N+1 é
+        # baixado; até pipeline_depth lotes aguardam antes de segurar o crawling
+        self._owns_writer = writer is None
+        self.writer = writer or StorageWriter(
+            max_pending=self.config.pipeline_depth,
+            executor=self.executors.write_executor(),
+            name=self.config.NAME,
+            max_concurrent=self.executors.write_workers,
+        )
+
+        # Limite de concorrência aprendido em execuções anteriores
+        learned = self.storage.load_state(CONCURRENCY_STATE).get(self.config.DOMAIN_URL)
+        initial_limits = (
+            {limiter_key(self.config.DOMAIN_URL): learned} if learned else {}
+        )
+
+        # Datas de publicação por edição (define o TTL do cache das estruturas)
+        self._edition_dates: dict[str, str] = {}
+
+        # Checkpoint: edições de cada data baixada e edições com falhas
+        self.checkpoint = CheckpointManifest(self.storage, self.config.NAME)
+        self._date_editions: dict[str, set[str]] = {}
+        self._incomplete_editions: set[str] = set()
+
+        # Datas com e sem publicação observadas em execuções anteriores
+        self.calendar = PublicationCalendar(
+            self.storage, self.config.NAME, self.config.STATE
+        )
+
+        # Índice de artigos já armazenados (carregado sob demanda)
+        self._identifier_index: IdentifierIndex | None = None
+
+        # Teto de memória: bytes de conteúdo retidos por edição até o save
+        if byte_budget is None and self.config.max_inflight_bytes:
+            byte_budget = ByteBudget(self.config.max_inflight_bytes)
+        self.byte_budget = byte_budget
+        self._edition_bytes: dict[str, int] = {}
+
+        # Tamanho adaptativo de lote: datas por lote e artigos por data
+        self._batch_days: dict[int, int] = {}
+        self._articles_per_day: float | None = None
+
+        http_cache = None
+        if self.config.http_cache_dir:
+            http_cache = HttpCache(self.config.http_cache_dir, ttl_for=self._cache_ttl)
 
-        self.http_client = HttpClient()
+        self.http_client = HttpClient(
+            rate_limit=self.config.requests_per_second or None,
+            cache=http_cache,
+        )
         self.concurrent_client = ConcurrentHttpClient(
             base_client=self.http_client,
             max_concurrent=self.config.max_concurrent,
+            max_limit=self.config.max_adaptive_concurrency,
+            initial_limits=initial_limits,
+            budget=budget,
+            byte_budget=self.byte_budget,
         )
+
+        # PDFs de edições e matérias: extração em processos, em segundo plano
+        self.pdf_stage: PdfStage | None = None
+        if self.config.extract_pdf:
+            self.pdf_stage = PdfStage(
+                self.storage,
+                self.executors,
+                self.concurrent_client,
+                self.config.NAME,
+                writer=self.writer,
+                max_concurrent=2 * (self.config.parse_workers or 1),
+            )
+
         self.metadata_parser = MetadataParser()
         self.structure_parser = HtmlStructureParser()
         self.content_parser = ContentParser()
-        self.data_processor = DataProcessor()
-        self.storage = storage
 
     def __repr__(self) -> str:
         return f"<GazetteCrawler start={self.config.start_date} end={self.config.end_date}>"
 
+    async def aclose(self) -> None:
+        """Libera o pool de conexões HTTP compartilhado."""
+        await self.concurrent_client.aclose()
+
+    @property
+    def concurrency_limit(self) -> int:
+        """Limite de concorrência atual para o domínio do município."""
+        return self.concurrent_client.limiter_for(self.config.DOMAIN_URL).limit
+
+    def save_concurrency_state(self) -> None:
+        """
+        Persiste o limite aprendido para o DOMAIN_URL do município.
+
+        O estado é compartilhado por todos os municípios e workers: cada um
+        grava só o seu domínio, como delta, e o mais recente prevalece.
+        """
+        try:
+            self.storage.append_state(
+                CONCURRENCY_STATE, {self.config.DOMAIN_URL: self.concurrency_limit}
+            )
+        except Exception as e:
+            logger.warning(f"Falha ao salvar limite de concorrência: {e}")
+            return
+
+        logger.info(
+            f"Limite de concorrência aprendido para {self.config.DOMAIN_URL}: "
+            f"{self.concurrency_limit}"
+        )
+
+    def save_calendar_state(self) -> None:
+        """Persiste as datas com e sem publicação observadas."""
+        try:
+            self.calendar.save()
+        except Exception as e:
+            logger.warning(f"Falha ao salvar calendário de publicação: {e}")
+
+    def _cache_ttl(self, url: str) -> float | None:
+        """
+        TTL do cache HTTP por URL.
+
+        Só metadados e estruturas são cacheados. Páginas de datas antigas
+        ficam frescas por ``cache_ttl_days``; as recentes são revalidadas.
+        """
+        metadata_prefix = f"{self.config.DOMAIN_URL}{self.config.METADATA_URL}"
+        html_prefix = f"{self.config.DOMAIN_URL}{self.config.HTML_URL}"
+
+        if url.startswith(metadata_prefix):
+            pub_date = parse_date(url[len(metadata_prefix) :].removesuffix(".json"))
+        elif url.startswith(html_prefix):
+            edition_id = url[len(html_prefix) :]
+            pub_date = parse_date(self._edition_dates.get(edition_id, ""))
+        else:
+            return None
+
+        if pub_date is None:
+            return 0.0
+
+        if (date.today() - pub_date).days > self.config.cache_old_after_days:
+            return self.config.cache_ttl_days * 86400.0
+        return 0.0
+
+    @property
+    def identifier_index(self) -> IdentifierIndex:
+        """Identificadores de artigos cujo conteúdo já está no storage."""
+        if self._identifier_index is None:
+            if self.config.refresh:
+                self._identifier_index = IdentifierIndex()
+            else:
+                self._identifier_index = self.storage.identifier_index(self.config.NAME)
+        return self._identifier_index
+
+    def split_known_articles(
+        self, articles: list[ArticleMetadata]
+    ) -> tuple[list[ArticleMetadata], list[ArticleMetadata]]:
+        """
+        Separa artigos a baixar dos que já têm conteúdo armazenado.
+
+        Returns:
+            Tupla (artigos a baixar, artigos já armazenados)
+        """
+        index = self.identifier_index
+        to_fetch, known = [], []
+        for article in articles:
+            (known if article.identifier in index else to_fetch).append(article)
+
+        if known:
+            logger.debug(f"{len(known)} artigos já armazenados, conteúdo não baixado")
+        return to_fetch, known
+
+    def stored_content(self, article: ArticleMetadata) -> ArticleContent:
+        """
+        Referência ao conteúdo já armazenado de um artigo conhecido.
+
+        O artigo continua na edição (contagem, hash e linhas de articles e
+        relationships corretos), apontando para o conteúdo gravado antes.
+        """
+        return ArticleContent.stored(self.identifier_index.get(article.identifier))
+
     def create_metadata_urls(self) -> list[str]:
-        """Gera URLs para download dos metadados das edições."""
-        dates = get_workdays(start=self.config.start_date, end=self.config.end_date)
+        """
+        Gera URLs para download dos metadados das edições.
+
+        Só entram datas em que o calendário de publicação espera edições
+        (sem feriados, datas já vistas vazias ou fins de semana em que o
+        município não publica). Com ``resume`` habilitado, datas já
+        concluídas no checkpoint também são puladas.
+        """
+        dates = self.calendar.candidate_dates(
+            self.config.start_date, self.config.end_date
+        )
+        if self.config.resume:
+            total = len(dates)
+            dates = [dt for dt in dates if not self.checkpoint.is_date_done(f"{dt}")]
+            logger.info(f"Retomando: {total - len(dates)} datas já concluídas puladas")
+
         return [
             f"{self.config.DOMAIN_URL}{self.config.METADATA_URL}{dt:%Y-%m-%d}.json"
             for dt in dates
@@ -60,19 +295,39 @@ class GazetteCrawler:
         """
         logger.info(f"Baixando {len(urls)} metadados...")
 
-        async with httpx.AsyncClient() as client:
-            responses = await self.concurrent_client.fetch_all(urls, client)
-
         all_metadata = []
 
-        for response in responses:
+        # Parse acontece enquanto as demais requisições estão em andamento
+        metadata_prefix = f"{self.config.DOMAIN_URL}{self.config.METADATA_URL}"
+
+        async for url, response in self.concurrent_client.fetch_iter(urls):
             if not response:
                 continue
 
             try:
-                metadata_list = self.metadata_parser.parse(response)
+                metadata_list = self.metadata_parser.parse(
+                    response,
+                    pdf_url_prefix=f"{self.config.DOMAIN_URL}{self.config.PDF_URL}",
+                )
 
+                for metadata in metadata_list:
+                    self._edition_dates[metadata.edition_id] = metadata.publication_date
                 all_metadata.extend(metadata_list)
+
+                # Edições publicadas na data (inclusive nenhuma, se a API
+                # confirmou; uma resposta com erro não conclui nem esvazia a data)
+                pub_date = url.removeprefix(metadata_prefix).removesuffix(".json")
+                if metadata_list or self.metadata_parser.is_empty_listing(response):
+                    self._date_editions[pub_date] = {
+                        m.edition_id for m in metadata_list
+                    }
+                    self.calendar.observe(pub_date, published=bool(metadata_list))
+                else:
+                    logger.warning(
+                        f"Metadados de {pub_date} com erro: data não registrada"
+                    )
+                for metadata in metadata_list:
+                    self.calendar.observe(metadata.publication_date, published=True)
                 logger.debug(f"Metadados extraídos: {len(metadata_list)}")
 
             except Exception as e:
@@ -82,200 +337,408 @@ class GazetteCrawler:
         logger.info(f"Extraídos {len(all_metadata)} metadados de {len(urls)} URLs")
         return all_metadata
 
-    async def fetch_structure_batch(self, metadata_list: list) -> list[dict]:
+    def parse_edition_structure(
+        self, edition_id: str, html: str | bytes
+    ) -> list[ArticleMetadata]:
         """
-        Fase 2: Download das páginas HTML de estrutura.
+        Parseia os artigos de uma única edição.
 
         Returns:
-            Lista de dicionários com {edition_id, html, url}
+            Lista de ArticleMetadata deduplicados (vazia em caso de erro)
         """
-        if not metadata_list:
-            logger.warning("Nenhum metadado para buscar estrutura HTML")
+        try:
+            articles = self.structure_parser.parse(html=html, edition_id=edition_id)
+        except Exception as e:
+            logger.error(f"Erro ao parsear HTML da edição {edition_id}: {e}")
+            self._incomplete_editions.add(edition_id)
             return []
 
-        urls = [
-            f"{self.config.DOMAIN_URL}{self.config.HTML_URL}{metadata.edition_id}"
-            for metadata in metadata_list
-        ]
-
-        logger.info(f"Baixando {len(urls)} estruturas HTML...")
-
-        async with httpx.AsyncClient() as client:
-            responses = await self.concurrent_client.fetch_all(urls, client)
-
-        html_results = []
-
-        for metadata, response in zip(metadata_list, responses):
-            if not response:
-                continue
+        return self.structure_parser.deduplicate_keep_deepest(articles)
 
-            html_results.append(
-                {
-                    "edition_id": metadata.edition_id,
-                    "html": response.text,
-                    "url": str(response.url),
-                }
-            )
-
-        logger.info(f"Obtidas {len(html_results)} estruturas HTML")
-        return html_results
-
-    def parse_articles_from_html(
-        self, html_results: list[dict]
+    async def parse_edition_structure_async(
+        self, edition_id: str, html: str | bytes
     ) -> list[ArticleMetadata]:
         """
-        Parseia artigos das estruturas HTML usando HtmlStructureParser.
+        Parseia uma edição no pool de parsing (ou no loop, sem workers).
 
-        Args:
-            html_results: Lista de resultados HTML da fase 2
+        O worker devolve os artigos como um RecordBatch Arrow, reconstruído
+        aqui em ArticleMetadata.
 
         Returns:
-            Lista de ArticleMetadata deduplicados
+            Lista de ArticleMetadata deduplicados (vazia em caso de erro)
         """
-        all_articles = []
+        if self.executors.parse_inline:
+            return self.parse_edition_structure(edition_id, html)
 
-        for html_data in html_results:
-            try:
-                articles = self.structure_parser.parse(
-                    html=html_data["html"], edition_id=html_data["edition_id"]
-                )
-                all_articles.extend(articles)
-                logger.debug(
-                    f"Extraídos {len(articles)} artigos da edição {html_data['edition_id']}"
-                )
-
-            except Exception as e:
-                logger.error(
-                    f"Erro ao parsear HTML da edição {html_data['edition_id']}: {e}"
-                )
-                continue
-
-        # Remove duplicatas mantendo os artigos mais profundos
-        unique_articles = self.structure_parser.deduplicate_keep_deepest(all_articles)
+        try:
+            batch = await self.executors.parse(
+                parse_structure_to_record_batch, html, edition_id
+            )
+        except Exception as e:
+            logger.error(f"Erro ao parsear HTML da edição {edition_id}: {e}")
+            self._incomplete_editions.add(edition_id)
+            return []
 
-        logger.info(
-            f"Parseados {len(unique_articles)} artigos únicos de {len(html_results)} estruturas HTML"
-        )
-        return unique_articles
+        return articles_from_record_batch(batch)
+
+    def parse_article_content(
+        self, article: ArticleMetadata, response: httpx.Response
+    ) -> ArticleContent | None:
+        """Parseia o conteúdo de um artigo (None em caso de erro)."""
+        try:
+            return self.content_parser.parse(response) or None
+        except Exception as e:
+            logger.error(
+                f"Erro ao processar conteúdo do artigo {article.article_id}: {e}"
+            )
+            return None
 
-    async def fetch_content_batch(self, articles: list[ArticleMetadata]) -> list[dict]:
+    async def extract_edition_text(self, edition: GazetteEdition) -> GazetteEdition:
         """
-        Fase 3: Busca o conteúdo das matérias.
+        Extrai o texto limpo das matérias HTML de uma edição.
 
-        Args:
-            articles: Lista de ArticleMetadata
+        Roda em um único lote por edição no pool de parsing (ou no loop, sem
+        workers). Falhas deixam as matérias sem texto, sem afetar a edição.
 
         Returns:
-            Lista de dicionários com {article_metadata, content}
+            A edição com ``content.text`` preenchido nas matérias HTML
         """
-        if not articles:
-            logger.warning("Nenhum artigo para buscar conteúdo")
-            return []
-
-        urls = [
-            f"{self.config.DOMAIN_URL}{self.config.CONTENT_URL}{article.identifier}"
-            for article in articles
+        pending = [
+            i
+            for i, article in enumerate(edition.articles)
+            if article.content_type is ContentType.HTML and article.content.text is None
         ]
+        if not pending:
+            return edition
 
-        logger.info(f"Baixando {len(urls)} conteúdos de artigos...")
-
-        async with httpx.AsyncClient() as client:
-            responses = await self.concurrent_client.fetch_all(urls, client)
-
-        content_results = []
+        try:
+            texts = await self.executors.parse(
+                extract_texts, [edition.articles[i].raw_content for i in pending]
+            )
+        except Exception as e:
+            logger.error(f"Erro ao extrair texto da edição {edition.edition_id}: {e}")
+            return edition
+
+        articles = list(edition.articles)
+        for i, text in zip(pending, texts):
+            article = articles[i]
+            articles[i] = Article(
+                metadata=article.metadata,
+                content=replace(article.content, text=text),
+            )
+        return GazetteEdition(metadata=edition.metadata, articles=articles)
+
+    def _hold_bytes(self, edition_id: str, size: int) -> None:
+        """Cobra do teto de memória um conteúdo retido até o save da edição."""
+        if self.byte_budget is None:
+            return
+        self.byte_budget.charge(size)
+        self._edition_bytes[edition_id] = self._edition_bytes.get(edition_id, 0) + size
+
+    def _release_on_save(
+        self, save: asyncio.Future, batch: list[GazetteEdition]
+    ) -> None:
+        """Devolve ao teto de memória os bytes do lote quando o save termina."""
+        if self.byte_budget is None:
+            return
+        size = sum(self._edition_bytes.pop(e.edition_id, 0) for e in batch)
+        if size:
+            save.add_done_callback(lambda _: self.byte_budget.release(size))
+
+    async def stream_editions(
+        self, metadata_list: list[GazetteMetadata]
+    ) -> AsyncIterator[GazetteEdition]:
+        """
+        Fases 2 e 3 com granularidade de edição.
 
-        for article, response in zip(articles, responses):
-            if not response:
-                continue
+        Cada estrutura é parseada assim que chega e os conteúdos dos seus
+        artigos começam a ser baixados imediatamente, sem esperar as demais
+        edições do lote. Cada edição é emitida pelo EditionAssembler quando
+        todos os seus artigos foram resolvidos.
 
-            try:
-                content = self.content_parser.parse(response)
-                if content:
-                    content_results.append(
-                        {
-                            "article_metadata": article,
-                            "content": content,
-                        }
-                    )
+        Yields:
+            GazetteEdition completas, em ordem de conclusão
+        """
+        if not metadata_list:
+            return
 
-            except Exception as e:
-                logger.error(
-                    f"Erro ao processar conteúdo do artigo {article.article_id}: {e}"
+        metadata_by_url = {
+            f"{self.config.DOMAIN_URL}{self.config.HTML_URL}{metadata.edition_id}": metadata
+            for metadata in metadata_list
+        }
+        assembler = EditionAssembler()
+        completed: asyncio.Queue = asyncio.Queue()
+
+        async def fetch_contents(articles: list[ArticleMetadata]) -> None:
+            articles, known = self.split_known_articles(articles)
+            for article in known:
+                # Conteúdo já salvo em execução anterior: resolve sem baixar
+                edition = assembler.resolve(article, self.stored_content(article))
+                if edition is not None:
+                    completed.put_nowait(edition)
+
+            article_by_url = {
+                f"{self.config.DOMAIN_URL}{self.config.CONTENT_URL}{article.identifier}": article
+                for article in articles
+            }
+            # Sem esperar o teto de memória: concluir a edição é o que libera
+            async for url, response in self.concurrent_client.fetch_iter(
+                list(article_by_url), wait_for_memory=False
+            ):
+                article = article_by_url[url]
+                if response:
+                    self._hold_bytes(article.edition_id, len(response.content))
+                content = (
+                    self.parse_article_content(article, response) if response else None
                 )
-                continue
+                if content is None:
+                    self._incomplete_editions.add(article.edition_id)
+                edition = assembler.resolve(article, content)
+                if edition is not None:
+                    completed.put_nowait(edition)
 
-        logger.info(f"Obtidos {len(content_results)} conteúdos de artigos")
-        return content_results
-
-    async def process_batch(self, urls: list[str]) -> list[GazetteEdition]:
+        async def produce() -> None:
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    async for url, response in self.concurrent_client.fetch_iter(
+                        list(metadata_by_url)
+                    ):
+                        metadata = metadata_by_url[url]
+                        if not response:
+                            logger.warning(
+                                f"Estrutura da edição {metadata.edition_id} indisponível"
+                            )
+                            self._incomplete_editions.add(metadata.edition_id)
+                            continue
+
+                        size = len(response.content)
+                        if self.byte_budget is not None:
+                            self.byte_budget.charge(size)
+                        try:
+                            articles = await self.parse_edition_structure_async(
+                                metadata.edition_id, response.content
+                            )
+                        finally:
+                            if self.byte_budget is not None:
+                                self.byte_budget.release(size)
+                        edition = assembler.expect(metadata, articles)
+                        if edition is not None:
+                            completed.put_nowait(edition)
+                        else:
+                            tg.create_task(fetch_contents(articles))
+            finally:
+                completed.put_nowait(None)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while (edition := await completed.get()) is not None:
+                if self.config.extract_text:
+                    edition = await self.extract_edition_text(edition)
+                yield edition
+            await producer
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+    def _next_batch_days(self, remaining: int) -> int:
         """
-        Processa um lote de URLs e retorna edições completas.
+        Quantidade de datas do próximo lote.
 
-        Returns:
-            Lista de GazetteEdition com artigos e conteúdos
+        Sem ``target_batch_articles`` (ou antes da primeira medição), usa
+        ``batch_size``. Caso contrário, divide a meta de artigos pela taxa de
+        artigos por data observada nos lotes anteriores.
         """
-        # Fase 1: Metadados das edições
-        metadata_list = await self.fetch_metadata_batch(urls)
-
-        if not metadata_list:
-            logger.warning("Lote sem metadados válidos")
-            return []
-
-        # Fase 2: Estrutura HTML e parse de artigos
-        html_results = await self.fetch_structure_batch(metadata_list)
-
-        if not html_results:
-            logger.warning("Lote sem estruturas HTML válidas")
-            return []
-
-        # Parse dos artigos do HTML
-        articles = self.parse_articles_from_html(html_results)
-
-        if not articles:
-            logger.warning("Lote sem artigos válidos")
-            return []
+        target = self.config.target_batch_articles
+        if not target or self._articles_per_day is None:
+            days = self.config.batch_size
+        elif self._articles_per_day <= 0:
+            days = remaining
+        else:
+            days = round(target / self._articles_per_day)
+        return max(1, min(days, remaining))
+
+    def _observe_batch(self, batch_num: int, n_articles: int) -> None:
+        """Atualiza a taxa de artigos por data com um lote concluído."""
+        days = self._batch_days.pop(batch_num, 0)
+        if not days:
+            return
+        rate = n_articles / days
+        if self._articles_per_day is None:
+            self._articles_per_day = rate
+        else:
+            self._articles_per_day = (
+                BATCH_RATE_ALPHA * rate
+                + (1 - BATCH_RATE_ALPHA) * self._articles_per_day
+            )
 
-        # Fase 3: Conteúdo dos artigos
-        content_results = await self.fetch_content_batch(articles)
+    async def _metadata_stage(self, urls: list[str], out: asyncio.Queue) -> None:
+        """Estágio 1: divide as datas em lotes e baixa os metadados de cada um."""
+        start = 0
+        batch_num = 0
+        while start < len(urls):
+            days = self._next_batch_days(len(urls) - start)
+            batch_urls = urls[start : start + days]
+            start += days
+            batch_num += 1
+            self._batch_days[batch_num] = days
+
+            logger.info(
+                f"Processando lote {batch_num} ({days} datas, " f"{start}/{len(urls)})"
+            )
+            metadata_list = await self.fetch_metadata_batch(batch_urls)
+            if not metadata_list:
+                logger.warning("Lote sem metadados válidos")
+            if self.config.resume:
+                metadata_list = self.checkpoint.pending(metadata_list)
+            await out.put((batch_num, metadata_list))
+        await out.put(None)
+
+    async def _edition_stage(self, inp: asyncio.Queue, out: asyncio.Queue) -> None:
+        """
+        Estágios 2 e 3: estrutura e conteúdo por edição.
 
-        # Agrega os resultados em GazetteEdition
-        editions = self.data_processor.aggregate_editions(
-            metadata_list, content_results
-        )
+        Até ``pipeline_depth`` lotes ficam em andamento ao mesmo tempo; cada
+        edição concluída segue para a saída como ``(lote, edição)`` e o fim do
+        lote é sinalizado com ``(lote, None)``.
+        """
+        slots = asyncio.Semaphore(self.config.pipeline_depth)
 
-        logger.info(f"Processado lote com {len(editions)} edições")
-        return editions
+        async def crawl_batch(batch_num: int, metadata_list: list) -> None:
+            try:
+                async for edition in self.stream_editions(metadata_list):
+                    await out.put((batch_num, edition))
+                await out.put((batch_num, None))
+            finally:
+                slots.release()
+
+        async with asyncio.TaskGroup() as tg:
+            while (item := await inp.get()) is not None:
+                await slots.acquire()
+                tg.create_task(crawl_batch(*item))
+        await out.put(None)
 
     async def run_batched(self) -> AsyncIterator[list[GazetteEdition]]:
         """
-        Executa o crawling em lotes, gerando edições progressivamente.
+        Executa o crawling em pipeline, gerando edições progressivamente.
+
+        Metadados e edições rodam como estágios concorrentes ligados por
+        filas limitadas (``pipeline_depth`` lotes): os metadados do lote N+1
+        são baixados enquanto o conteúdo do lote N ainda está em andamento, e
+        dentro de cada lote o conteúdo de uma edição começa assim que sua
+        estrutura é parseada. O ritmo é controlado pelo limitador de
+        concorrência e pelo token bucket, não por pausas fixas entre lotes.
+
+        Com ``target_batch_articles`` o número de datas por lote se ajusta
+        para que cada lote tenha cerca dessa quantidade de artigos. Quando o
+        teto de memória é excedido, as edições já concluídas são entregues
+        antes do fim do lote para que o storage as libere, uma vez por
+        travessia do teto. Lotes vazios nunca são entregues.
 
         Yields:
-            Listas de GazetteEdition por lote
+            Listas de GazetteEdition por lote, em ordem de conclusão dos lotes
         """
-        all_urls = self.create_metadata_urls()
-        total_urls = len(all_urls)
+        urls = self.create_metadata_urls()
+        depth = self.config.pipeline_depth
 
-        logger.info(f"Iniciando crawling em lotes de {self.config.batch_size}")
-        logger.info(f"Total de {total_urls} URLs para processar")
+        logger.info(f"Total de {len(urls)} URLs para processar")
 
-        for i in range(0, total_urls, self.config.batch_size):
-            batch_urls = all_urls[i : i + self.config.batch_size]
-            batch_num = (i // self.config.batch_size) + 1
-            total_batches = (
-                total_urls + self.config.batch_size - 1
-            ) // self.config.batch_size
+        metadata_q: asyncio.Queue = asyncio.Queue(maxsize=depth)
+        output_q: asyncio.Queue = asyncio.Queue(maxsize=depth)
 
-            logger.info(f"Processando lote {batch_num}/{total_batches}")
+        stages = [
+            asyncio.create_task(self._metadata_stage(urls, metadata_q)),
+            asyncio.create_task(self._edition_stage(metadata_q, output_q)),
+        ]
+        pipeline = asyncio.gather(*stages)
+        pending: dict[int, list[GazetteEdition]] = {}
+        articles_by_batch: dict[int, int] = {}
+        # Entrega antecipada: uma vez por travessia do teto de memória
+        flush_armed = True
+
+        try:
+            while True:
+                getter = asyncio.ensure_future(output_q.get())
+                done, _ = await asyncio.wait(
+                    {getter, pipeline}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if getter not in done:
+                    # Pipeline terminou antes: propaga erro de algum estágio
+                    if pipeline.exception() is not None:
+                        getter.cancel()
+                        pipeline.result()
+                    await getter
+
+                item = getter.result()
+                if item is None:
+                    break
+
+                batch_num, edition = item
+                batch = pending.setdefault(batch_num, [])
+                if edition is not None:
+                    batch.append(edition)
+                    if self.config.target_batch_articles:
+                        articles_by_batch[batch_num] = articles_by_batch.get(
+                            batch_num, 0
+                        ) + len(edition.articles)
+                    if self.byte_budget is None:
+                        continue
+                    if not self.byte_budget.exceeded:
+                        flush_armed = True
+                    elif flush_armed:
+                        # Teto de memória: grava o que já está pronto e só
+                        # volta a antecipar depois de descer abaixo do teto
+                        flush_armed = False
+                        for num, ready in pending.items():
+                            if not ready:
+                                continue
+                            logger.info(
+                                f"Teto de memória excedido: gravando {len(ready)} "
+                                f"edições do lote {num} antecipadamente"
+                            )
+                            pending[num] = []
+                            yield ready
+                    continue
+
+                # Lote concluído: entrega as edições ainda não entregues
+                del pending[batch_num]
+                if self.config.target_batch_articles:
+                    self._observe_batch(batch_num, articles_by_batch.pop(batch_num, 0))
+                logger.info(f"Processado lote {batch_num} com {len(batch)} edições")
+                if batch:
+                    yield batch
+        finally:
+            # gather não cancela os irmãos quando um estágio falha
+            for stage in stages:
+                stage.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
 
-            batch_editions = await self.process_batch(batch_urls)
-            yield batch_editions
+        logger.info("Crawling em lotes concluído")
 
-            # Pausa entre lotes para não sobrecarregar o servidor
-            if i + self.config.batch_size < total_urls:
-                await asyncio.sleep(1)
+    def _checkpoint_args(
+        self, batch: list[GazetteEdition]
+    ) -> tuple[list[GazetteEdition], list[str], dict[str, frozenset[str]]]:
+        """Captura no loop de eventos o que o checkpoint do lote precisa."""
+        complete = [
+            edition.edition_id
+            for edition in batch
+            if edition.edition_id not in self._incomplete_editions
+        ]
+        by_date = {d: frozenset(ids) for d, ids in self._date_editions.items()}
+        return batch, complete, by_date
+
+    def _save_batch(
+        self,
+        batch: list[GazetteEdition],
+        complete: list[str],
+        by_date: dict[str, frozenset[str]],
+    ) -> None:
+        """Salva o lote e só então registra o checkpoint (roda em thread)."""
+        if batch:
+            self.storage.save_editions(batch, municipality=self.config.NAME)
 
-        logger.info("Crawling em lotes concluído")
+        done_dates = self.checkpoint.commit(complete, by_date)
+        if done_dates:
+            logger.debug(f"Checkpoint: {len(done_dates)} datas concluídas")
 
     async def run(self) -> int:
         """
@@ -286,11 +749,50 @@ class GazetteCrawler:
         """
         n_editions = 0
         n_articles = 0
-
-        async for batch in self.run_batched():
-            self.storage.save_editions(batch, municipality=self.config.NAME)
-            n_editions += len(batch)
-            n_articles += sum([len(g.articles) for g in batch])
+        saves: list[asyncio.Future] = []
+
+        try:
+            async for batch in self.run_batched():
+                # Estágio de storage: o lote é entregue ao escritor e o
+                # pipeline segue baixando; submit só espera com a fila cheia
+                save = await self.writer.submit(
+                    self._save_batch, *self._checkpoint_args(batch)
+                )
+                self._release_on_save(save, batch)
+                saves.append(save)
+                if self.pdf_stage is not None:
+                    self.pdf_stage.submit(batch, save)
+                n_editions += len(batch)
+                n_articles += sum([len(g.articles) for g in batch])
+
+                # Falha de escrita interrompe o crawling o quanto antes
+                for save in [f for f in saves if f.done()]:
+                    saves.remove(save)
+                    save.result()
+
+            # Lotes sem edições não são entregues: conclui as datas vazias
+            saves.append(
+                await self.writer.submit(self._save_batch, *self._checkpoint_args([]))
+            )
+            for save in saves:
+                await save
+            if self.pdf_stage is not None:
+                await self.pdf_stage.drain()
+        finally:
+            # PDFs pendentes são cancelados antes de fechar o escritor que
+            # eles usam; lotes já entregues ao storage não são abandonados
+            if self.pdf_stage is not None:
+                await self.pdf_stage.aclose()
+            if self._owns_writer:
+                await self.writer.aclose()
+            await asyncio.gather(*saves, return_exceptions=True)
+
+            # Sessão HTTP é compartilhada por todo o crawling
+            await self.aclose()
+            self.save_concurrency_state()
+            self.save_calendar_state()
+            if self._owns_executors:
+                await asyncio.to_thread(self.executors.shutdown)
 
         logger.info(f"Total: {n_editions} edições processadas")
         logger.info(f"Total: {n_articles} artigos processadas")
@@ -0,0 +1,126 @@
+"""Pools de execução para trabalho de CPU fora do event loop."""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from diario_crawler.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class ExecutorPool:
+    """
+    Executores para parsing de HTML e escrita de Parquet.
+
+    O parsing com lexbor segura o GIL, então roda em processos separados
+    (``parse_workers``); com 0 workers o parsing acontece no próprio event
+    loop, o que é mais barato para coletas pequenas. A compressão zstd e a
+    codificação do pyarrow liberam o GIL, então as escritas rodam em um pool
+    de threads (``write_workers``). Leituras do storage feitas durante o
+    crawling (``read``) usam um pool de threads próprio, do mesmo tamanho,
+    para não esperar atrás das escritas. Trabalho sempre pesado, como a
+    extração de texto de PDFs, usa ``process`` e roda em processos mesmo com
+    0 workers de parsing (um processo). Os pools são criados sob demanda.
+
+    Uso:
+        executors = ExecutorPool(parse_workers=4, write_workers=2)
+        batch = await executors.parse(parse_structure_to_record_batch, html, id)
+        await executors.write(storage.save_editions, editions)
+        executors.shutdown()
+    """
+
+    def __init__(self, parse_workers: int = 0, write_workers: int = 2):
+        """
+        Args:
+            parse_workers: Processos de parsing (0 = parsing no event loop)
+            write_workers: Threads de escrita do storage
+        """
+        if parse_workers < 0:
+            raise ValueError(f"parse_workers não pode ser negativo: {parse_workers}")
+        if write_workers <= 0:
+            raise ValueError(f"write_workers deve ser positivo: {write_workers}")
+
+        self.parse_workers = parse_workers
+        self.write_workers = write_workers
+        self._parse_pool: ProcessPoolExecutor | None = None
+        self._write_pool: ThreadPoolExecutor | None = None
+        self._read_pool: ThreadPoolExecutor | None = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<ExecutorPool parse_workers={self.parse_workers} "
+            f"write_workers={self.write_workers}>"
+        )
+
+    @property
+    def parse_inline(self) -> bool:
+        """True quando o parsing roda no próprio event loop."""
+        return self.parse_workers == 0
+
+    def _parse_executor(self) -> Executor:
+        if self._parse_pool is None:
+            # spawn: não herda o event loop nem conexões abertas do pai
+            workers = self.parse_workers or 1
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.debug(f"Pool de parsing iniciado ({workers} processos)")
+        return self._parse_pool
+
+    def write_executor(self) -> Executor:
+        """Pool de threads de escrita (compartilhável com o StorageWriter)."""
+        if self._write_pool is None:
+            self._write_pool = ThreadPoolExecutor(
+                max_workers=self.write_workers, thread_name_prefix="storage-writer"
+            )
+        return self._write_pool
+
+    async def parse(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Executa ``fn(*args)`` no pool de parsing.
+
+        ``fn`` e seus argumentos precisam ser serializáveis (função de módulo).
+        """
+        if self.parse_inline:
+            return fn(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._parse_executor(), fn, *args)
+
+    async def process(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Executa ``fn(*args)`` sempre em um processo do pool de parsing.
+
+        Para trabalho pesado demais para o event loop mesmo em coletas
+        pequenas; com ``parse_workers=0`` o pool tem um único processo.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._parse_executor(), fn, *args)
+
+    async def write(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Executa ``fn(*args)`` no pool de escrita."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.write_executor(), fn, *args)
+
+    async def read(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Executa ``fn(*args)`` (leitura bloqueante do storage) no pool de leitura."""
+        if self._read_pool is None:
+            self._read_pool = ThreadPoolExecutor(
+                max_workers=self.write_workers, thread_name_prefix="storage-reader"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._read_pool, fn, *args)
+
+    def shutdown(self) -> None:
+        """Encerra os pools, aguardando o trabalho em andamento."""
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=True, cancel_futures=True)
+            self._parse_pool = None
+        if self._write_pool is not None:
+            self._write_pool.shutdown(wait=True)
+            self._write_pool = None
+        if self._read_pool is not None:
+            self._read_pool.shutdown(wait=True)
+            self._read_pool = None
@@ -0,0 +1,258 @@
+"""Fila durável de shards para backfills distribuídos (SQLite)."""
+
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterator
+
+from diario_crawler.utils import get_logger
+
+logger = get_logger(__name__)
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+DEFAULT_LEASE_SECONDS = 600.0
+DEFAULT_MAX_ATTEMPTS = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shards (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    municipality TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    UNIQUE (municipality, start_date, end_date)
+);
+CREATE INDEX IF NOT EXISTS shards_status ON shards (status, lease_until);
+"""
+
+
+@dataclass(frozen=True)
+class Shard:
+    """Intervalo de datas de um município a ser coletado."""
+
+    id: int
+    municipality: str
+    start_date: date
+    end_date: date
+    attempts: int
+
+    def __repr__(self) -> str:
+        return (
+            f"<Shard {self.id} {self.municipality} "
+            f"{self.start_date}..{self.end_date}>"
+        )
+
+
+class JobQueue:
+    """
+    Fila de shards ``(município, intervalo de datas)`` com leases.
+
+    Guardada em um arquivo SQLite que pode ficar em disco compartilhado:
+    vários processos (ou hosts) chamam ``claim`` e recebem shards distintos,
+    pois a troca de estado acontece dentro de uma transação ``IMMEDIATE``.
+    Cada shard reservado tem um lease que o worker renova com ``heartbeat``;
+    se o worker morrer, o lease expira e o shard volta a ser reservável. Após
+    ``max_attempts`` falhas o shard fica como ``failed``.
+
+    Uso:
+        queue = JobQueue("data/backfill.sqlite")
+        queue.enqueue_range("rj_rio_de_janeiro", date(2012, 5, 29), date.today())
+        while (shard := queue.claim("host-1:123")) is not None:
+            ...
+            queue.complete(shard.id, "host-1:123")
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        timeout: float = 30.0,
+    ):
+        """
+        Args:
+            path: Arquivo SQLite da fila
+            max_attempts: Tentativas por shard antes de marcá-lo como falho
+            timeout: Espera (s) por locks de outros processos
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+
+        conn = sqlite3.connect(self.path, timeout=self.timeout)
+        try:
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def __repr__(self) -> str:
+        return f"<JobQueue path={self.path}>"
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Conexão curta com transação IMMEDIATE (lock de escrita no início)."""
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def enqueue_range(
+        self,
+        municipality: str,
+        start: date,
+        end: date,
+        shard_days: int = 30,
+    ) -> int:
+        """
+        Divide o intervalo em shards de ``shard_days`` dias e os enfileira.
+
+        Shards já existentes são mantidos (idempotente), então todos os
+        workers podem chamar com os mesmos argumentos.
+
+        Returns:
+            Número de shards novos
+        """
+        if shard_days <= 0:
+            raise ValueError(f"shard_days deve ser positivo: {shard_days}")
+
+        rows = []
+        current = start
+        while current <= end:
+            shard_end = min(end, current + timedelta(days=shard_days - 1))
+            rows.append((municipality, current.isoformat(), shard_end.isoformat()))
+            current = shard_end + timedelta(days=1)
+
+        now = time.time()
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO shards "
+                "(municipality, start_date, end_date, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(*row, now) for row in rows],
+            )
+            created = conn.total_changes - before
+
+        logger.info(f"{municipality}: {created} shards novos de {len(rows)}")
+        return created
+
+    def claim(
+        self, worker: str, lease_seconds: float = DEFAULT_LEASE_SECONDS
+    ) -> Shard | None:
+        """
+        Reserva o próximo shard pendente (ou com lease expirado).
+
+        Returns:
+            Shard reservado ou None se não houver trabalho disponível agora
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            # Leases expirados de shards que já esgotaram as tentativas
+            conn.execute(
+                "UPDATE shards SET status = ?, error = ?, updated_at = ? "
+                "WHERE status = ? AND lease_until < ? AND attempts >= ?",
+                (FAILED, "lease expirado", now, LEASED, now, self.max_attempts),
+            )
+            row = conn.execute(
+                "SELECT id, municipality, start_date, end_date, attempts "
+                "FROM shards "
+                "WHERE status = ? OR (status = ? AND lease_until < ?) "
+                "ORDER BY attempts, start_date, id LIMIT 1",
+                (PENDING, LEASED, now),
+            ).fetchone()
+            if row is None:
+                return None
+
+            shard_id, municipality, start_date, end_date, attempts = row
+            conn.execute(
+                "UPDATE shards SET status = ?, worker = ?, lease_until = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (LEASED, worker, now + lease_seconds, now, shard_id),
+            )
+
+        if attempts:
+            logger.warning(f"Shard {shard_id} retomado (tentativa {attempts + 1})")
+        return Shard(
+            id=shard_id,
+            municipality=municipality,
+            start_date=date.fromisoformat(start_date),
+            end_date=date.fromisoformat(end_date),
+            attempts=attempts + 1,
+        )
+
+    def heartbeat(
+        self, shard_id: int, worker: str, lease_seconds: float = DEFAULT_LEASE_SECONDS
+    ) -> bool:
+        """
+        Renova o lease do shard.
+
+        Returns:
+            False se o lease foi perdido (expirou e outro worker reservou)
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE shards SET lease_until = ?, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (now + lease_seconds, now, shard_id, worker, LEASED),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, shard_id: int, worker: str) -> bool:
+        """Marca o shard como concluído (só se o lease ainda for do worker)."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE shards SET status = ?, lease_until = NULL, error = NULL, "
+                "updated_at = ? WHERE id = ? AND worker = ? AND status = ?",
+                (DONE, time.time(), shard_id, worker, LEASED),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, shard_id: int, worker: str, error: str) -> None:
+        """Devolve o shard à fila, ou o marca como falho após max_attempts."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE shards SET "
+                "status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "lease_until = NULL, error = ?, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (
+                    self.max_attempts,
+                    FAILED,
+                    PENDING,
+                    error[:1000],
+                    time.time(),
+                    shard_id,
+                    worker,
+                    LEASED,
+                ),
+            )
+
+    def stats(self) -> dict[str, int]:
+        """Quantidade de shards por status."""
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) FROM shards GROUP BY status"
+            ).fetchall()
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows))
+        return counts
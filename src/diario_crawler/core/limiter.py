@@ -0,0 +1,389 @@
+"""Controle de concorrência: AIMD por host, orçamento global e de memória."""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+
+from diario_crawler.utils import get_logger, metrics
+
+logger = get_logger(__name__)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limitador de requisições simultâneas com ajuste AIMD.
+
+    Enquanto latência e taxa de erro estão saudáveis o limite cresce de forma
+    aditiva (+1 a cada ``limit`` respostas bem-sucedidas). Em 429, 5xx ou
+    timeout o limite é reduzido de forma multiplicativa, no máximo uma vez por
+    ``cooldown`` segundos para que uma rajada de erros conte como um único
+    sinal de congestionamento.
+
+    Uso:
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, name="host")
+        async with limiter:
+            ...
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff_ratio: float = 0.5,
+        latency_tolerance: float = 2.0,
+        cooldown: float = 1.0,
+        name: str = "",
+    ):
+        """
+        Args:
+            initial_limit: Limite inicial de requisições simultâneas
+            min_limit: Limite mínimo
+            max_limit: Limite máximo
+            backoff_ratio: Fator de redução em caso de sobrecarga
+            latency_tolerance: Razão latência atual / latência base a partir
+                da qual o limite para de crescer
+            cooldown: Intervalo mínimo (s) entre duas reduções
+            name: Nome usado em logs e métricas (normalmente o host)
+        """
+        if min_limit <= 0 or max_limit < min_limit:
+            raise ValueError(f"Limites inválidos: min={min_limit}, max={max_limit}")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self.name = name
+
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._latency: float | None = None
+        self._baseline_latency: float | None = None
+        self._last_decrease = float("-inf")
+
+        self._publish()
+
+    def __repr__(self) -> str:
+        return (
+            f"<AdaptiveConcurrencyLimiter name={self.name} "
+            f"limit={self.limit} in_flight={self._in_flight}>"
+        )
+
+    @property
+    def limit(self) -> int:
+        """Limite atual (inteiro) de requisições simultâneas."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    # -----------------------
+    # Aquisição
+    # -----------------------
+
+    async def acquire(self) -> None:
+        """Aguarda uma vaga respeitando o limite atual (ordem FIFO)."""
+        if not self._waiters and self._in_flight < self.limit:
+            self._in_flight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # A vaga já havia sido concedida: devolve
+                self.release()
+            else:
+                self._waiters.remove(future)
+            raise
+
+    def release(self) -> None:
+        """Libera uma vaga e acorda quem estiver esperando."""
+        self._in_flight -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            future = self._waiters.popleft()
+            if not future.done():
+                self._in_flight += 1
+                future.set_result(None)
+
+    async def __aenter__(self) -> "AdaptiveConcurrencyLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
+
+    # -----------------------
+    # Sinais de feedback
+    # -----------------------
+
+    def on_success(self, latency: float) -> None:
+        """Resposta saudável: cresce o limite se a latência estiver estável."""
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency = 0.8 * self._latency + 0.2 * latency
+
+        if self._baseline_latency is None or self._latency < self._baseline_latency:
+            self._baseline_latency = self._latency
+
+        if self._latency > self._baseline_latency * self.latency_tolerance:
+            # Latência subindo: fila se formando no servidor, mantém o limite
+            return
+
+        if self._limit < self.max_limit:
+            self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+            self._publish()
+            self._wake_waiters()
+
+    def on_overload(self) -> None:
+        """Sinal de sobrecarga (429, 5xx, timeout): reduz o limite."""
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+
+        self._last_decrease = now
+        previous = self.limit
+        self._limit = max(float(self.min_limit), self._limit * self.backoff_ratio)
+        # Latência base é reavaliada após o recuo
+        self._baseline_latency = self._latency
+
+        logger.warning(
+            f"Sobrecarga em {self.name}: concorrência {previous} -> {self.limit}"
+        )
+        metrics.inc("http_concurrency_backoffs", host=self.name)
+        self._publish()
+
+    def observe(
+        self,
+        url: str,
+        status_code: int | None,
+        elapsed: float,
+        error: Exception | None,
+    ) -> None:
+        """
+        Classifica o resultado de uma tentativa HTTP.
+
+        Compatível com ``HttpClient.add_observer``.
+        """
+        if isinstance(error, httpx.TimeoutException):
+            self.on_overload()
+        elif status_code is not None and (status_code == 429 or status_code >= 500):
+            self.on_overload()
+        elif error is None:
+            self.on_success(elapsed)
+
+    def _publish(self) -> None:
+        metrics.set_gauge("http_concurrency_limit", self.limit, host=self.name)
+
+
+class RequestBudget:
+    """
+    Teto global de requisições simultâneas compartilhado entre domínios.
+
+    Usado quando vários crawlers rodam no mesmo processo. Vagas liberadas são
+    distribuídas em rodízio entre os domínios que estão esperando, e enquanto
+    houver disputa nenhum domínio ocupa mais que sua parcela justa
+    (``max_in_flight / domínios ativos``). Assim um domínio lento não monopoliza
+    o orçamento e os rápidos não ficam sem vaga.
+
+    Uso:
+        budget = RequestBudget(max_in_flight=64)
+        async with budget.slot("doweb.rio.rj.gov.br"):
+            ...
+    """
+
+    def __init__(self, max_in_flight: int = 64):
+        """
+        Args:
+            max_in_flight: Máximo de requisições simultâneas no processo
+        """
+        if max_in_flight <= 0:
+            raise ValueError(f"Orçamento inválido: {max_in_flight}")
+
+        self.max_in_flight = max_in_flight
+        self._in_flight = 0
+        self._held: dict[str, int] = {}
+        self._waiters: dict[str, deque[asyncio.Future]] = {}
+        self._turns: deque[str] = deque()
+
+    def __repr__(self) -> str:
+        return (
+            f"<RequestBudget in_flight={self._in_flight}/{self.max_in_flight} "
+            f"domains={len(self._held)}>"
+        )
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def held_by(self, domain: str) -> int:
+        """Vagas ocupadas pelo domínio."""
+        return self._held.get(domain, 0)
+
+    def _fair_share(self) -> int:
+        active = set(self._held) | {d for d, w in self._waiters.items() if w}
+        return max(1, -(-self.max_in_flight // max(1, len(active))))
+
+    def _grant(self, domain: str) -> None:
+        self._in_flight += 1
+        self._held[domain] = self._held.get(domain, 0) + 1
+
+    async def acquire(self, domain: str) -> None:
+        """Aguarda uma vaga para o domínio."""
+        if self._in_flight < self.max_in_flight and not any(self._waiters.values()):
+            self._grant(domain)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        queue = self._waiters.setdefault(domain, deque())
+        if domain not in self._turns:
+            self._turns.append(domain)
+        queue.append(future)
+        self._wake_waiters()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(domain)
+            else:
+                queue.remove(future)
+            raise
+
+    def release(self, domain: str) -> None:
+        """Libera a vaga do domínio e entrega a próxima em rodízio."""
+        self._in_flight -= 1
+        self._held[domain] -= 1
+        if not self._held[domain]:
+            del self._held[domain]
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        fair_share = self._fair_share()
+        # Uma volta completa sem conceder vaga encerra a distribuição
+        skipped = 0
+        while self._in_flight < self.max_in_flight and self._turns:
+            if skipped >= len(self._turns):
+                # Todos acima da parcela justa: sobra de vaga vai em rodízio
+                fair_share = self.max_in_flight
+                skipped = 0
+
+            domain = self._turns.popleft()
+            queue = self._waiters.get(domain)
+            while queue and queue[0].done():
+                queue.popleft()
+            if not queue:
+                continue
+
+            if self.held_by(domain) >= fair_share:
+                self._turns.append(domain)
+                skipped += 1
+                continue
+
+            self._grant(domain)
+            queue.popleft().set_result(None)
+            skipped = 0
+            if queue:
+                self._turns.append(domain)
+
+    @asynccontextmanager
+    async def slot(self, domain: str) -> AsyncIterator[None]:
+        """Context manager que ocupa uma vaga do domínio."""
+        await self.acquire(domain)
+        try:
+            yield
+        finally:
+            self.release(domain)
+
+
+class ByteBudget:
+    """
+    Teto de bytes de respostas mantidos em memória pelo processo.
+
+    Os crawlers cobram o tamanho de cada corpo recebido (``charge``) e o
+    devolvem quando ele deixa a memória (``release``): estruturas logo após
+    o parsing, conteúdos depois que o lote foi salvo. Enquanto o total
+    estiver acima do teto, ``wait`` segura o início de novas requisições.
+
+    Uso:
+        budget = ByteBudget(512 * 1024 * 1024)
+        await budget.wait()
+        budget.charge(len(response.content))
+        ...
+        budget.release(n)
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Args:
+            max_bytes: Bytes em memória a partir dos quais novas requisições
+                aguardam
+        """
+        if max_bytes <= 0:
+            raise ValueError(f"Orçamento de memória inválido: {max_bytes}")
+
+        self.max_bytes = max_bytes
+        self._used = 0
+        self._below: asyncio.Event | None = None
+
+    def __repr__(self) -> str:
+        return f"<ByteBudget used={self._used}/{self.max_bytes}>"
+
+    @property
+    def used(self) -> int:
+        return self._used
+
+    @property
+    def exceeded(self) -> bool:
+        return self._used >= self.max_bytes
+
+    def _event(self) -> asyncio.Event:
+        if self._below is None:
+            self._below = asyncio.Event()
+            if not self.exceeded:
+                self._below.set()
+        return self._below
+
+    def charge(self, n: int) -> None:
+        """Registra ``n`` bytes mantidos em memória."""
+        was_exceeded = self.exceeded
+        self._used += n
+        if self.exceeded:
+            self._event().clear()
+            if not was_exceeded:
+                logger.info(
+                    f"Orçamento de memória atingido ({self._used} bytes): "
+                    "pausando novas requisições"
+                )
+        self._publish()
+
+    def release(self, n: int) -> None:
+        """Devolve ``n`` bytes que deixaram a memória."""
+        self._used = max(0, self._used - n)
+        if not self.exceeded:
+            self._event().set()
+        self._publish()
+
+    async def wait(self) -> None:
+        """Aguarda o total ficar abaixo do teto."""
+        if not self.exceeded:
+            return
+        started = time.monotonic()
+        await self._event().wait()
+        metrics.observe("memory_budget_wait_seconds", time.monotonic() - started)
+
+    def _publish(self) -> None:
+        metrics.set_gauge("memory_inflight_bytes", self._used)
@@ -0,0 +1,277 @@
+"""Estágio de extração de texto dos PDFs das edições e matérias."""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Coroutine, Iterable
+
+from diario_crawler.core.clients import ConcurrentHttpClient
+from diario_crawler.core.executors import ExecutorPool
+from diario_crawler.models import ArticleMetadata, ContentType, GazetteEdition
+from diario_crawler.parsers.pdf import extract_pdf_pages
+from diario_crawler.storage import ParquetStorage, StorageWriter
+from diario_crawler.utils import get_logger, metrics
+
+logger = get_logger(__name__)
+
+
+class PdfStage:
+    """
+    Armazena e extrai o texto dos PDFs dos lotes já salvos.
+
+    PDFs de matérias já chegam em memória pelo ContentParser e são gravados
+    como blob pelo ``save_editions``. Os PDFs das edições (``pdf_url``) são
+    baixados em streaming para um arquivo temporário, enviados ao storage e
+    apagados em seguida. O texto é extraído página a página em processos
+    (``ExecutorPool.process``), fora do event loop, e gravado na tabela
+    ``pdf_pages`` chaveada pelo ``content_hash``. O índice de PDFs do storage
+    garante que um mesmo PDF nunca é extraído duas vezes.
+
+    Toda escrita no storage passa pelo StorageWriter, a mesma fila dos
+    ``save_editions``. Já a releitura dos blobs para extração roda no pool
+    de leitura (``ExecutorPool.read``), sem esperar atrás das escritas
+    pendentes.
+
+    Uso:
+        stage = PdfStage(storage, executors, client, "sp_sao_jose_dos_campos")
+        stage.submit(batch, saved)  # não bloqueia o crawling
+        ...
+        await stage.drain()
+        await stage.aclose()
+    """
+
+    def __init__(
+        self,
+        storage: ParquetStorage,
+        executors: ExecutorPool,
+        client: ConcurrentHttpClient,
+        municipality: str,
+        writer: StorageWriter | None = None,
+        max_concurrent: int = 2,
+        tmp_dir: Path | None = None,
+    ):
+        """
+        Args:
+            storage: Storage dos blobs, das páginas e do índice de PDFs
+            executors: Pools de processos (extração) e de escrita
+            client: Cliente HTTP usado para baixar os PDFs das edições
+            municipality: Identificador do município (config.NAME)
+            writer: Escritor do storage (None = escritor próprio)
+            max_concurrent: PDFs baixados/extraídos ao mesmo tempo
+            tmp_dir: Diretório dos downloads temporários (padrão: do sistema)
+        """
+        self.storage = storage
+        self.executors = executors
+        self._owns_writer = writer is None
+        self.writer = writer or StorageWriter(
+            executor=executors.write_executor(),
+            name=f"{municipality}_pdf",
+            max_concurrent=executors.write_workers,
+        )
+        self.client = client
+        self.municipality = municipality
+        self.tmp_dir = tmp_dir
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._tasks: set[asyncio.Task] = set()
+        # Hashes e URLs já em processamento nesta execução
+        self._claimed: set[str] = set()
+
+    def __repr__(self) -> str:
+        return f"<PdfStage municipality={self.municipality} pending={len(self._tasks)}>"
+
+    @property
+    def pending(self) -> int:
+        """PDFs aguardando download ou extração."""
+        return len(self._tasks)
+
+    def _claim(self, key: str) -> bool:
+        """Reserva um PDF para esta execução (False se já extraído ou reservado)."""
+        if key in self._claimed or key in self.storage.pdf_index():
+            return False
+        self._claimed.add(key)
+        return True
+
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _write(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Executa uma escrita pelo StorageWriter e aguarda o resultado."""
+        return await (await self.writer.submit(fn, *args))
+
+    def submit(
+        self,
+        editions: Iterable[GazetteEdition],
+        saved: asyncio.Future | None = None,
+    ) -> None:
+        """
+        Agenda os PDFs das edições e de suas matérias em segundo plano.
+
+        Args:
+            editions: Edições do lote
+            saved: Save do lote no StorageWriter. Com ele, os PDFs de matérias
+                gravados como blob não ficam retidos em memória até a
+                extração (o teto de memória já os liberou no save): são
+                relidos do storage quando chega a vez deles
+        """
+        for edition in editions:
+            url = edition.metadata.pdf_url
+            if url and self._claim(url):
+                self._spawn(self._process_edition_pdf(edition, url))
+
+            for article in edition.articles:
+                data = article.raw_content
+                if article.content_type is not ContentType.PDF or not isinstance(
+                    data, bytes
+                ):
+                    continue
+                content_hash = hashlib.sha256(data).hexdigest()
+                if not self._claim(content_hash):
+                    continue
+                if saved is not None and self.storage.is_blob(data):
+                    data = None
+                self._spawn(
+                    self._process_article_pdf(
+                        article.metadata, content_hash, data, saved
+                    )
+                )
+
+    async def drain(self) -> None:
+        """Aguarda todos os PDFs agendados."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def aclose(self) -> None:
+        """Cancela os PDFs ainda pendentes (ex.: crawling interrompido)."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._owns_writer:
+            await self.writer.aclose()
+
+    async def _process_article_pdf(
+        self,
+        article: ArticleMetadata,
+        content_hash: str,
+        data: bytes | None,
+        saved: asyncio.Future | None,
+    ) -> None:
+        async with self._semaphore:
+            if data is None:
+                try:
+                    # Blob gravado pelo save do lote
+                    await asyncio.shield(saved)
+                    data = await self.executors.read(
+                        self.storage.get_blob, content_hash
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"PDF {content_hash[:12]} da matéria {article.article_id} "
+                        f"indisponível no storage: {e}"
+                    )
+                    metrics.inc("pdf_extractions", outcome="error")
+                    return
+
+            await self._extract(
+                data,
+                content_hash,
+                {content_hash: content_hash},
+                source="article",
+                edition_id=article.edition_id,
+                article_id=article.article_id,
+            )
+
+    async def _process_edition_pdf(self, edition: GazetteEdition, url: str) -> None:
+        async with self._semaphore:
+            fd, tmp_name = tempfile.mkstemp(suffix=".pdf", dir=self.tmp_dir)
+            os.close(fd)
+            path = Path(tmp_name)
+            try:
+                result = await self.client.download(url, path)
+                if result is None:
+                    metrics.inc("pdf_extractions", outcome="download_error")
+                    return
+
+                content_hash, size = result
+                if not self._claim(content_hash):
+                    # Mesmo PDF já extraído (ou em extração) por outra URL ou
+                    # matéria: só registra a URL, para não baixá-la de novo
+                    await self._write(
+                        self.storage.save_pdf_pages,
+                        [],
+                        {url: content_hash},
+                        self.municipality,
+                    )
+                    return
+
+                await self._write(
+                    self.storage.write_content_file, path, content_hash, size
+                )
+                await self._extract(
+                    path,
+                    content_hash,
+                    {url: content_hash, content_hash: content_hash},
+                    source="edition",
+                    edition_id=edition.edition_id,
+                    article_id=None,
+                )
+            except Exception as e:
+                logger.error(f"Erro no PDF da edição {edition.edition_id}: {e}")
+                metrics.inc("pdf_extractions", outcome="error")
+            finally:
+                path.unlink(missing_ok=True)
+
+    async def _extract(
+        self,
+        pdf: bytes | Path,
+        content_hash: str,
+        entries: dict[str, str],
+        source: str,
+        edition_id: str,
+        article_id: str | None,
+    ) -> None:
+        """Extrai as páginas em um processo e grava o texto e o índice."""
+        try:
+            pages = await self.executors.process(extract_pdf_pages, pdf)
+        except Exception as e:
+            logger.error(
+                f"Erro ao extrair texto do PDF {content_hash[:12]} "
+                f"(edição {edition_id}): {e}"
+            )
+            metrics.inc("pdf_extractions", outcome="error")
+            return
+
+        processed_at = datetime.now()
+        rows = [
+            {
+                "municipality": self.municipality,
+                "content_hash": content_hash,
+                "source": source,
+                "edition_id": edition_id,
+                "article_id": article_id,
+                "page": number,
+                "text": text,
+                "text_length": len(text),
+                "processed_at": processed_at,
+            }
+            for number, text in enumerate(pages, start=1)
+        ]
+        try:
+            await self._write(
+                self.storage.save_pdf_pages, rows, entries, self.municipality
+            )
+        except Exception as e:
+            logger.error(f"Erro ao salvar páginas do PDF {content_hash[:12]}: {e}")
+            metrics.inc("pdf_extractions", outcome="error")
+            return
+
+        metrics.inc("pdf_extractions", outcome="ok", source=source)
+        metrics.inc("pdf_pages", len(rows), source=source)
+        logger.debug(
+            f"PDF {content_hash[:12]} ({source}, edição {edition_id}): "
+            f"{len(rows)} páginas"
+        )
@@ -0,0 +1,149 @@
+"""Rate limiting por domínio (token bucket) com suporte a Retry-After."""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import ClassVar
+
+from diario_crawler.utils import get_logger, metrics
+
+logger = get_logger(__name__)
+
+# Teto para pausas pedidas pelo servidor (evita travar o crawling por horas)
+MAX_RETRY_AFTER = 300.0
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Interpreta o header Retry-After.
+
+    Args:
+        value: Segundos ("120") ou data HTTP ("Wed, 21 Oct 2015 07:28:00 GMT")
+
+    Returns:
+        Segundos de espera (>= 0) ou None se ausente/inválido
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """
+    Token bucket assíncrono compartilhado por todos os clientes de um domínio.
+
+    Cada tentativa HTTP consome um token; tokens são repostos a ``rate`` por
+    segundo até ``capacity``. Uma pausa (429/Retry-After) zera o bucket e
+    bloqueia todas as tarefas do domínio até expirar, e não só a que recebeu
+    a resposta.
+
+    Uso:
+        bucket = TokenBucket.for_host("doweb.rio.rj.gov.br", rate=20)
+        await bucket.acquire()
+    """
+
+    _registry: ClassVar[dict[str, "TokenBucket"]] = {}
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        capacity: float | None = None,
+        name: str = "",
+    ):
+        """
+        Args:
+            rate: Requisições por segundo (None = sem teto, só pausas)
+            capacity: Rajada máxima (padrão: igual a rate)
+            name: Nome usado em logs e métricas (normalmente o host)
+        """
+        self.name = name
+        self.configure(rate, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def __repr__(self) -> str:
+        return f"<TokenBucket name={self.name} rate={self.rate}>"
+
+    @classmethod
+    def for_host(
+        cls,
+        host: str,
+        rate: float | None = None,
+        capacity: float | None = None,
+    ) -> "TokenBucket":
+        """Retorna o bucket do processo para o host, criando se necessário."""
+        bucket = cls._registry.get(host)
+        if bucket is None:
+            bucket = cls(rate=rate, capacity=capacity, name=host)
+            cls._registry[host] = bucket
+        elif rate != bucket.rate:
+            bucket.configure(rate, capacity)
+        return bucket
+
+    @classmethod
+    def reset_registry(cls) -> None:
+        """Descarta todos os buckets registrados no processo."""
+        cls._registry.clear()
+
+    def configure(self, rate: float | None, capacity: float | None = None) -> None:
+        """Ajusta taxa e capacidade do bucket."""
+        self.rate = rate if rate and rate > 0 else None
+        self.capacity = max(1.0, float(capacity or self.rate or 1.0))
+        if hasattr(self, "_tokens"):
+            self._tokens = min(self._tokens, self.capacity)
+
+    @property
+    def paused_for(self) -> float:
+        """Segundos restantes de pausa (0 se liberado)."""
+        return max(0.0, self._paused_until - time.monotonic())
+
+    def pause(self, seconds: float) -> None:
+        """Bloqueia o domínio inteiro por ``seconds`` segundos."""
+        seconds = min(max(seconds, 0.0), MAX_RETRY_AFTER)
+        until = time.monotonic() + seconds
+        if until <= self._paused_until:
+            return
+
+        self._paused_until = until
+        # Tokens voltam a acumular só depois da pausa
+        self._tokens = 0.0
+        self._updated = until
+        logger.warning(f"Domínio {self.name} pausado por {seconds:.1f}s")
+        metrics.inc("http_rate_limit_pauses", host=self.name)
+
+    def _refill(self, now: float) -> None:
+        if self.rate is None:
+            self._tokens = self.capacity
+        else:
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Aguarda pausa e disponibilidade de token, consumindo um token."""
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+
+            self._refill(now)
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return
+
+            await asyncio.sleep((1.0 - self._tokens) / self.rate)
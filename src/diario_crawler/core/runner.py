@@ -0,0 +1,142 @@
+"""Execução de vários municípios no mesmo processo."""
+
+import asyncio
+from dataclasses import dataclass
+
+from diario_crawler.core.crawler import GazetteCrawler
+from diario_crawler.core.executors import ExecutorPool
+from diario_crawler.core.limiter import ByteBudget, RequestBudget
+from diario_crawler.crawler_configs.base import BaseCrawlerConfig
+from diario_crawler.storage import ParquetStorage, StorageWriter
+from diario_crawler.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Teto padrão de requisições simultâneas somando todos os municípios
+MAX_IN_FLIGHT = 64
+
+# Lotes aguardando o escritor compartilhado (limita a memória do processo)
+MAX_PENDING_WRITES = 4
+
+
+@dataclass
+class CrawlResult:
+    """Resultado do crawling de um município."""
+
+    municipality: str
+    editions: int = 0
+    articles: int = 0
+    concurrency_limit: int | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class MultiCrawlerRunner:
+    """
+    Roda vários GazetteCrawler no mesmo event loop.
+
+    Cada município mantém seu limitador AIMD e seu token bucket por domínio;
+    por cima deles um RequestBudget limita as requisições simultâneas do
+    processo e divide as vagas de forma justa entre os domínios. As edições
+    de todos os municípios passam por um único StorageWriter com fila
+    limitada, o que também limita a memória quando o storage fica para trás.
+    Os pools de parsing e de escrita e o teto de memória também são
+    compartilhados.
+    Uma falha em um município não interrompe os demais.
+
+    Uso:
+        runner = MultiCrawlerRunner([RjRioDeJaneiro(...), RoJaru(...)], storage)
+        results = await runner.run()
+    """
+
+    def __init__(
+        self,
+        configs: list[BaseCrawlerConfig],
+        storage: ParquetStorage,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        max_pending_writes: int = MAX_PENDING_WRITES,
+        parse_workers: int = BaseCrawlerConfig.PARSE_WORKERS,
+        write_workers: int = BaseCrawlerConfig.WRITE_WORKERS,
+        max_inflight_bytes: int = BaseCrawlerConfig.MAX_INFLIGHT_BYTES,
+    ):
+        """
+        Args:
+            configs: Configuração de cada município
+            storage: Storage compartilhado
+            max_in_flight: Máximo de requisições simultâneas no processo
+            max_pending_writes: Lotes aguardando escrita antes de segurar os
+                crawlers
+            parse_workers: Processos de parsing de HTML (0 = no event loop)
+            write_workers: Threads de escrita do storage
+            max_inflight_bytes: Teto de bytes de respostas em memória somando
+                todos os municípios (0 desabilita)
+        """
+        self.configs = configs
+        self.storage = storage
+        self.budget = RequestBudget(max_in_flight)
+        self.byte_budget = (
+            ByteBudget(max_inflight_bytes) if max_inflight_bytes else None
+        )
+        self.executors = ExecutorPool(parse_workers, write_workers)
+        self.writer = StorageWriter(
+            max_pending=max_pending_writes,
+            executor=self.executors.write_executor(),
+            max_concurrent=write_workers,
+        )
+        self.crawlers = [
+            GazetteCrawler(
+                config,
+                storage,
+                budget=self.budget,
+                writer=self.writer,
+                executors=self.executors,
+                byte_budget=self.byte_budget,
+            )
+            for config in configs
+        ]
+
+    def __repr__(self) -> str:
+        names = ", ".join(config.NAME for config in self.configs)
+        return f"<MultiCrawlerRunner [{names}] budget={self.budget.max_in_flight}>"
+
+    async def _run_one(self, crawler: GazetteCrawler) -> CrawlResult:
+        name = crawler.config.NAME
+        try:
+            n_editions, n_articles = await crawler.run()
+        except Exception as e:
+            logger.exception(f"Falha no crawling de {name}: {e}")
+            return CrawlResult(municipality=name, error=str(e))
+
+        return CrawlResult(
+            municipality=name,
+            editions=n_editions,
+            articles=n_articles,
+            concurrency_limit=crawler.concurrency_limit,
+        )
+
+    async def run(self) -> list[CrawlResult]:
+        """
+        Executa todos os municípios concorrentemente.
+
+        Returns:
+            Um CrawlResult por município, na ordem das configurações
+        """
+        logger.info(
+            f"Iniciando {len(self.crawlers)} municípios com até "
+            f"{self.budget.max_in_flight} requisições simultâneas"
+        )
+        try:
+            results = await asyncio.gather(
+                *(self._run_one(crawler) for crawler in self.crawlers)
+            )
+        finally:
+            await self.writer.aclose()
+            await asyncio.to_thread(self.executors.shutdown)
+
+        failed = [r.municipality for r in results if not r.ok]
+        if failed:
+            logger.warning(f"Municípios com falha: {', '.join(failed)}")
+        return list(results)
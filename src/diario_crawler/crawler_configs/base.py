@@ -7,6 +7,7 @@ class BaseCrawlerConfig:
 
     # Município
     NAME: str  # sp_sao_jose_dos_campos
+    STATE: str | None = None  # "SP" (UF para feriados estaduais)
     DEFAULT_START_DATE: date  # date(2022, 8, 15)
     DOMAIN_URL: str  # "https://diariodomunicipio.sjc.sp.gov.br"
 
@@ -14,16 +15,32 @@ class BaseCrawlerConfig:
     BASE_DATA_DIR = Path("data")
     METADATA_DIR = BASE_DATA_DIR / "metadata"
     CONTENT_DIR = BASE_DATA_DIR / "content"
+    HTTP_CACHE_DIR = BASE_DATA_DIR / "http_cache"
 
     # Limites
     DEFAULT_BATCH_SIZE = 30
+    TARGET_BATCH_ARTICLES: int | None = None  # Meta de artigos por lote (adaptativo)
     MAX_CONCURRENT_REQUESTS = 10
+    MAX_ADAPTIVE_CONCURRENCY = 50  # Teto do controle adaptativo (AIMD)
+    REQUESTS_PER_SECOND = 20.0  # Teto por domínio (token bucket)
     MAX_RETRIES = 3
+    PIPELINE_DEPTH = 2  # Lotes em espera entre estágios do pipeline
+    PARSE_WORKERS = 0  # Processos de parsing de HTML (0 = no event loop)
+    WRITE_WORKERS = 2  # Threads de escrita do storage (zstd/pyarrow)
+    MAX_INFLIGHT_BYTES = 512 * 1024 * 1024  # Teto de corpos em memória (0 = sem)
+    EXTRACT_TEXT = False  # Extrai texto limpo do HTML das matérias
+    EXTRACT_PDF = False  # Baixa PDFs das edições e extrai o texto dos PDFs
 
     # URLs base
     METADATA_URL = "/apifront/portal/edicoes/edicoes_from_data/"
     HTML_URL = "/portal/visualizacoes/view_html_diario/"
     CONTENT_URL = "/apifront/portal/edicoes/publicacoes_ver_conteudo/"
+    PDF_URL = "/apifront/portal/edicoes/pdf_diario/"
+
+    # Cache HTTP: páginas de datas mais antigas que CACHE_OLD_AFTER_DAYS não
+    # são baixadas de novo por CACHE_TTL_DAYS; as recentes são sempre revalidadas
+    CACHE_OLD_AFTER_DAYS = 14
+    CACHE_TTL_DAYS = 30
 
     # Timeouts (em segundos)
     CONNECT_TIMEOUT = 10.0
@@ -35,18 +52,83 @@ class BaseCrawlerConfig:
         end_date: date | None = None,
         batch_size: int | None = None,
         max_concurrent: int | None = None,
+        max_adaptive_concurrency: int | None = None,
+        requests_per_second: float | None = None,
+        http_cache_dir: Path | None = None,
+        cache_ttl_days: int | None = None,
+        cache_old_after_days: int | None = None,
+        resume: bool = False,
+        refresh: bool = False,
+        parse_workers: int | None = None,
+        write_workers: int | None = None,
+        max_inflight_bytes: int | None = None,
+        target_batch_articles: int | None = None,
+        extract_text: bool = False,
+        extract_pdf: bool = False,
     ):
         """
         Args:
             start_date: Data inicial do crawling
             end_date: Data final do crawling
-            batch_size: Tamanho do lote para processamento
-            max_concurrent: Número máximo de requisições concorrentes
+            batch_size: Datas por lote (inicial, com target_batch_articles)
+            max_concurrent: Concorrência inicial (antes de aprender o limite do host)
+            max_adaptive_concurrency: Teto para o limite adaptativo de concorrência
+            requests_per_second: Teto de requisições por segundo no domínio
+                (0 desabilita)
+            http_cache_dir: Diretório do cache HTTP (None desabilita)
+            cache_ttl_days: Frescor (dias) de páginas de datas antigas
+            cache_old_after_days: Idade (dias) a partir da qual uma data é antiga
+            resume: Pula datas e edições já concluídas no checkpoint
+            refresh: Baixa novamente conteúdos já presentes no índice de
+                identificadores
+            parse_workers: Processos de parsing de HTML (0 = no event loop)
+            write_workers: Threads de escrita do storage
+            max_inflight_bytes: Teto de bytes de respostas em memória
+                (0 desabilita)
+            target_batch_articles: Meta de artigos por lote; ajusta o número
+                de datas de cada lote (None = sempre batch_size datas)
+            extract_text: Extrai o texto limpo do HTML das matérias no pool
+                de parsing
+            extract_pdf: Baixa os PDFs das edições e extrai, em processos,
+                o texto das páginas dos PDFs de edições e matérias
         """
         self.start_date = start_date or self.DEFAULT_START_DATE
         self.end_date = end_date or date.today()
         self.batch_size = batch_size or self.DEFAULT_BATCH_SIZE
         self.max_concurrent = max_concurrent or self.MAX_CONCURRENT_REQUESTS
+        self.max_adaptive_concurrency = max(
+            max_adaptive_concurrency or self.MAX_ADAPTIVE_CONCURRENCY,
+            self.max_concurrent,
+        )
+        self.requests_per_second = (
+            self.REQUESTS_PER_SECOND
+            if requests_per_second is None
+            else requests_per_second
+        )
+        self.pipeline_depth = self.PIPELINE_DEPTH
+        self.http_cache_dir = http_cache_dir
+        self.cache_ttl_days = (
+            self.CACHE_TTL_DAYS if cache_ttl_days is None else cache_ttl_days
+        )
+        self.cache_old_after_days = (
+            self.CACHE_OLD_AFTER_DAYS
+            if cache_old_after_days is None
+            else cache_old_after_days
+        )
+        self.resume = resume
+        self.refresh = refresh
+        self.parse_workers = (
+            self.PARSE_WORKERS if parse_workers is None else parse_workers
+        )
+        self.write_workers = write_workers or self.WRITE_WORKERS
+        self.max_inflight_bytes = (
+            self.MAX_INFLIGHT_BYTES
+            if max_inflight_bytes is None
+            else max_inflight_bytes
+        )
+        self.target_batch_articles = target_batch_articles or self.TARGET_BATCH_ARTICLES
+        self.extract_text = extract_text or self.EXTRACT_TEXT
+        self.extract_pdf = extract_pdf or self.EXTRACT_PDF
 
         self._validate_config()
 
@@ -70,3 +152,15 @@ class BaseCrawlerConfig:
             raise ValueError(
                 f"Concorrência máxima deve ser positiva: {self.max_concurrent}"
             )
+        if self.requests_per_second < 0:
+            raise ValueError(
+                f"Taxa de requisições não pode ser negativa: {self.requests_per_second}"
+            )
+        if self.parse_workers < 0:
+            raise ValueError(
+                f"Workers de parsing não podem ser negativos: {self.parse_workers}"
+            )
+        if self.max_inflight_bytes < 0:
+            raise ValueError(
+                f"Teto de memória não pode ser negativo: {self.max_inflight_bytes}"
+            )
@@ -5,5 +5,6 @@ from diario_crawler.crawler_configs.base import BaseCrawlerConfig
 
 class MsCorumba(BaseCrawlerConfig):
     NAME = "ms_corumba"
+    STATE = "MS"
     DEFAULT_START_DATE = date(2012, 6, 26)
     DOMAIN_URL = "https://do.corumba.ms.gov.br"
@@ -5,5 +5,6 @@ from diario_crawler.crawler_configs.base import BaseCrawlerConfig
 
 class RjRioDeJaneiro(BaseCrawlerConfig):
     NAME = "rj_rio_de_janeiro"
+    STATE = "RJ"
     DEFAULT_START_DATE = date(2012, 5, 29)
     DOMAIN_URL = "https://doweb.rio.rj.gov.br"
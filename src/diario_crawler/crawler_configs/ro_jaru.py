@@ -5,5 +5,6 @@ from diario_crawler.crawler_configs.base import BaseCrawlerConfig
 
 class RoJaru(BaseCrawlerConfig):
     NAME = "ro_jaru"
+    STATE = "RO"
     DEFAULT_START_DATE = date(2022, 1, 1)
     DOMAIN_URL = "https://doe.jaru.ro.gov.br"
@@ -5,5 +5,6 @@ from diario_crawler.crawler_configs.base import BaseCrawlerConfig
 
 class SpSaoJoseDosCampos(BaseCrawlerConfig):
     NAME = "sp_sao_jose_dos_campos"
+    STATE = "SP"
     DEFAULT_START_DATE = date(2022, 8, 15)
     DOMAIN_URL = "https://diariodomunicipio.sjc.sp.gov.br"
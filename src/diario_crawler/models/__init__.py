@@ -1,6 +1,6 @@
 """Modelos de dados do crawler."""
 
-from .article import Article, ArticleContent, ArticleMetadata
+from .article import Article, ArticleContent, ArticleMetadata, intern_path
 from .content import ContentType
 from .gazette import GazetteEdition, GazetteMetadata
 
@@ -11,4 +11,5 @@ __all__ = [
     "ArticleMetadata",
     "ArticleContent",
     "ContentType",
+    "intern_path",
 ]
@@ -1,21 +1,54 @@
 """Modelos para artigos do diário."""
 
+import sys
 from dataclasses import dataclass
+from typing import Iterable
 
 from .content import ContentType
 
+# Caminhos hierárquicos já vistos: milhares de artigos compartilham poucas
+# categorias, então cada caminho distinto existe uma única vez em memória.
+_PATHS: dict[tuple[str, ...], tuple[str, ...]] = {}
 
-@dataclass
+
+def intern_path(path: Iterable[str]) -> tuple[str, ...]:
+    """
+    Retorna a tupla canônica (compartilhada) de um caminho hierárquico.
+
+    Args:
+        path: Categorias da raiz até o artigo (lista ou tupla)
+
+    Returns:
+        Tupla interna, idêntica (``is``) para caminhos iguais
+    """
+    key = path if type(path) is tuple else tuple(path)
+    cached = _PATHS.get(key)
+    if cached is None:
+        cached = _PATHS.setdefault(key, tuple(sys.intern(p) for p in key))
+    return cached
+
+
+@dataclass(slots=True, frozen=True)
 class ArticleMetadata:
-    """Metadados de um artigo."""
+    """
+    Metadados de um artigo.
+
+    Imutável e sem ``__dict__``: ``hierarchy_path`` é convertido para a
+    tupla interna de :func:`intern_path` e ``edition_id`` é internado, de
+    modo que os artigos de uma edição compartilham esses objetos.
+    """
 
     article_id: str
     edition_id: str
-    hierarchy_path: list[str]
+    hierarchy_path: tuple[str, ...]
     title: str
     identifier: str
     protocol: str | None = None
 
+    def __post_init__(self):
+        object.__setattr__(self, "hierarchy_path", intern_path(self.hierarchy_path))
+        object.__setattr__(self, "edition_id", sys.intern(self.edition_id))
+
     @property
     def depth(self) -> int:
         return len(self.hierarchy_path)
@@ -24,18 +57,54 @@ class ArticleMetadata:
         return f"<ArticleMetadata id={self.article_id} title='{self.title}'>"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ArticleContent:
-    """Conteúdo processado de um artigo."""
+    """
+    Conteúdo processado de um artigo.
+
+    ``text`` é o texto limpo extraído do HTML (None quando a extração está
+    desligada ou o conteúdo não é HTML).
 
-    raw_content: str | bytes
-    content_type: ContentType
+    Artigos cujo conteúdo já está no storage (de uma execução anterior) não
+    são baixados de novo: recebem uma referência criada por :meth:`stored`,
+    sem ``raw_content`` e com o ``content_hash`` do conteúdo gravado.
+    """
+
+    raw_content: str | bytes | None
+    content_type: ContentType | None
+    text: str | None = None
+    content_hash: str | None = None
+
+    @classmethod
+    def stored(cls, content_hash: str | None) -> "ArticleContent":
+        """
+        Referência ao conteúdo já armazenado de um artigo.
+
+        Args:
+            content_hash: Hash SHA-256 do conteúdo (do índice de identificadores)
+
+        Returns:
+            ArticleContent sem ``raw_content`` nem tipo
+        """
+        return cls(raw_content=None, content_type=None, content_hash=content_hash)
+
+    @property
+    def is_stored(self) -> bool:
+        """True para referências a conteúdo já armazenado."""
+        return self.raw_content is None
+
+    @property
+    def text_length(self) -> int | None:
+        """Número de caracteres do texto limpo."""
+        return None if self.text is None else len(self.text)
 
     def __repr__(self) -> str:
+        if self.is_stored:
+            return f"<ArticleContent stored hash={self.content_hash}>"
         return f"<ArticleContent type={self.content_type} size={len(self.raw_content)}>"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Article:
     """Artigo completo com metadados e conteúdo."""
 
@@ -51,7 +120,7 @@ class Article:
         return self.metadata.title
 
     @property
-    def hierarchy_path(self) -> list[str]:
+    def hierarchy_path(self) -> tuple[str, ...]:
         return self.metadata.hierarchy_path
 
     @property
@@ -59,11 +128,11 @@ class Article:
         return self.metadata.depth
 
     @property
-    def raw_content(self) -> str | bytes:
+    def raw_content(self) -> str | bytes | None:
         return self.content.raw_content
 
     @property
-    def content_type(self) -> ContentType:
+    def content_type(self) -> ContentType | None:
         return self.content.content_type
 
     def __repr__(self) -> str:
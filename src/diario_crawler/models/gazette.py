@@ -1,5 +1,6 @@
 """Modelos para edições do diário."""
 
+import sys
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
@@ -7,7 +8,7 @@ if TYPE_CHECKING:
     from .article import Article
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GazetteMetadata:
     """Metadados de uma edição do diário."""
 
@@ -19,11 +20,15 @@ class GazetteMetadata:
     edition_type_name: str
     pdf_url: str
 
+    def __post_init__(self):
+        # Mesmo objeto que o edition_id dos artigos da edição
+        object.__setattr__(self, "edition_id", sys.intern(self.edition_id))
+
     def __repr__(self) -> str:
         return f"<GazetteMetadata id={self.edition_id} date={self.publication_date}>"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GazetteEdition:
     """Edição completa do diário com seus artigos."""
 
@@ -3,5 +3,12 @@
 from .content import ContentParser
 from .metadata import MetadataParser
 from .structure import HtmlStructureParser
+from .text import extract_text, extract_texts
 
-__all__ = ["ContentParser", "MetadataParser", "HtmlStructureParser"]
+__all__ = [
+    "ContentParser",
+    "MetadataParser",
+    "HtmlStructureParser",
+    "extract_text",
+    "extract_texts",
+]
@@ -5,6 +5,7 @@ import logging
 import httpx
 
 from ..models import ArticleContent, ContentType
+from .json_decoder import JsonDecoder, default_decoder
 
 logger = logging.getLogger(__name__)
 
@@ -13,12 +14,15 @@ class ContentParser:
     """Parseia conteúdo final dos artigos."""
 
     @staticmethod
-    def parse(response: httpx.Response) -> ArticleContent | None:
+    def parse(
+        response: httpx.Response, decoder: JsonDecoder | None = None
+    ) -> ArticleContent | None:
         """
         Extrai e processa conteúdo de um artigo.
 
         Args:
             response: Resposta HTTP com conteúdo do artigo
+            decoder: Decodificador JSON (padrão: o mais rápido instalado)
 
         Returns:
             ArticleContent processado ou None se inválido
@@ -35,8 +39,8 @@ class ContentParser:
 
             elif "application/json" in content_type_header:
                 # Assume que o JSON contém HTML no campo 'conteudo'
-                data = response.json()
-                html_content = data.get("conteudo", "")
+                decoder = decoder or default_decoder
+                html_content = decoder.decode_content(response.content)
 
                 return ArticleContent(
                     raw_content=html_content,
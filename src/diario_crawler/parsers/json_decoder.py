@@ -0,0 +1,173 @@
+"""Decodificadores JSON das respostas da API (msgspec, orjson ou stdlib)."""
+
+import json
+from typing import Any, NamedTuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depende do ambiente
+    msgspec = None
+
+
+class EditionItem(NamedTuple):
+    """Campos de uma edição em ``edicoes_from_data`` usados pelo crawler."""
+
+    id: Any
+    numero: Any
+    suplemento: Any
+    tipo_edicao_id: Any
+    tipo_edicao_nome: Any
+
+
+class EditionsPayload(NamedTuple):
+    """Resposta de ``edicoes_from_data``."""
+
+    erro: Any
+    data: str
+    itens: list[EditionItem]
+
+
+def edition_items(itens: Any) -> list[EditionItem]:
+    """
+    Edições de ``itens`` já decodificado, comuns a todos os decodificadores.
+
+    Itens que não são objetos são pulados um a um; os valores dos campos
+    são validados item a item pelo MetadataParser, de modo que um item
+    malformado nunca descarta a data inteira.
+    """
+    if not isinstance(itens, list):
+        return []
+    return [
+        EditionItem(
+            item.get("id"),
+            item.get("numero", 0),
+            item.get("suplemento"),
+            item.get("tipo_edicao_id", 0),
+            item.get("tipo_edicao_nome", ""),
+        )
+        for item in itens
+        if isinstance(item, dict)
+    ]
+
+
+class JsonDecoder:
+    """
+    Decodificador da biblioteca padrão.
+
+    Todos os decodificadores leem direto dos bytes da resposta
+    (``response.content``), sem passar por ``response.text``.
+    """
+
+    name = "json"
+    errors: tuple[type[Exception], ...] = (ValueError,)
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+    def decode_editions(self, data: bytes) -> EditionsPayload:
+        """Decodifica a lista de edições de uma data."""
+        payload = self.loads(data)
+        if not isinstance(payload, dict):
+            return EditionsPayload(None, "unknown", [])
+        return EditionsPayload(
+            payload.get("erro"),
+            payload.get("data", "unknown"),
+            edition_items(payload.get("itens")),
+        )
+
+    def decode_content(self, data: bytes) -> str:
+        """Extrai o HTML do campo ``conteudo`` de uma matéria."""
+        payload = self.loads(data)
+        return payload.get("conteudo", "") if isinstance(payload, dict) else ""
+
+
+class OrjsonDecoder(JsonDecoder):
+    """Decodificador com orjson (mesmo resultado, parsing em Rust)."""
+
+    name = "orjson"
+
+    def __init__(self):
+        self.errors = (orjson.JSONDecodeError, ValueError)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+if msgspec is not None:
+
+    class _MsgspecEditions(msgspec.Struct):
+        # Valores crus: os itens são validados um a um por edition_items
+        erro: Any = None
+        data: Any = "unknown"
+        itens: Any = None
+
+    class _MsgspecContent(msgspec.Struct):
+        conteudo: str = ""
+
+
+class MsgspecDecoder(JsonDecoder):
+    """
+    Decodificador com schemas tipados do msgspec.
+
+    Campos que o crawler não usa são pulados sem criar objetos Python: para
+    conteúdos, só a string ``conteudo`` é materializada. Os itens de edições
+    são decodificados como valores crus e validados um a um, como nos
+    demais decodificadores.
+    """
+
+    name = "msgspec"
+
+    def __init__(self):
+        self.errors = (msgspec.DecodeError, ValueError)
+        self._generic = msgspec.json.Decoder()
+        self._editions = msgspec.json.Decoder(_MsgspecEditions)
+        self._content = msgspec.json.Decoder(_MsgspecContent)
+
+    def loads(self, data: bytes) -> Any:
+        return self._generic.decode(data)
+
+    def decode_editions(self, data: bytes) -> EditionsPayload:
+        try:
+            payload = self._editions.decode(data)
+        except msgspec.ValidationError:
+            # JSON válido que não é um objeto, como no decodificador padrão
+            return EditionsPayload(None, "unknown", [])
+        return EditionsPayload(payload.erro, payload.data, edition_items(payload.itens))
+
+    def decode_content(self, data: bytes) -> str:
+        return self._content.decode(data).conteudo
+
+
+DECODERS: dict[str, type[JsonDecoder]] = {"json": JsonDecoder}
+if orjson is not None:
+    DECODERS["orjson"] = OrjsonDecoder
+if msgspec is not None:
+    DECODERS["msgspec"] = MsgspecDecoder
+
+
+def get_decoder(name: str | None = None) -> JsonDecoder:
+    """
+    Retorna um decodificador pelo nome ou o mais rápido disponível.
+
+    Ordem de preferência: msgspec, orjson, json (stdlib).
+
+    Raises:
+        ValueError: Se o decodificador pedido não estiver instalado
+    """
+    if name is None:
+        name = next(n for n in ("msgspec", "orjson", "json") if n in DECODERS)
+    if name not in DECODERS:
+        raise ValueError(
+            f"Decodificador JSON indisponível: {name} "
+            f"(instalados: {', '.join(DECODERS)})"
+        )
+    return DECODERS[name]()
+
+
+# Decodificador usado pelos parsers quando nenhum é informado
+default_decoder = get_decoder()
@@ -1,49 +1,86 @@
 """Parser para metadados JSON das edições (Fase 1)."""
 
-import json
 import logging
 
 import httpx
 
 from ..models import GazetteMetadata
+from .json_decoder import JsonDecoder, default_decoder
 
 logger = logging.getLogger(__name__)
 
+# Caminho do PDF da edição, igual em todos os portais da plataforma
+PDF_PATH = "/apifront/portal/edicoes/pdf_diario/"
+
 
 class MetadataParser:
     """Parseia JSON de metadados das edições do diário."""
 
     @staticmethod
-    def parse(response: httpx.Response) -> list[GazetteMetadata]:
+    def is_empty_listing(
+        response: httpx.Response, decoder: JsonDecoder | None = None
+    ) -> bool:
+        """
+        Indica se a API confirmou que não há edições na data.
+
+        Distingue a listagem vazia (definitiva) de respostas com ``erro`` ou
+        JSON inválido, que podem ser transitórias.
+
+        Args:
+            response: Resposta HTTP com JSON de metadados
+            decoder: Decodificador JSON (padrão: o mais rápido instalado)
+
+        Returns:
+            True somente para uma listagem válida, sem erro e sem itens
+        """
+        decoder = decoder or default_decoder
+        try:
+            payload = decoder.decode_editions(response.content)
+        except decoder.errors:
+            return False
+        return not payload.erro and not payload.itens
+
+    @staticmethod
+    def parse(
+        response: httpx.Response,
+        decoder: JsonDecoder | None = None,
+        pdf_url_prefix: str | None = None,
+    ) -> list[GazetteMetadata]:
         """
         Extrai metadados de edições do JSON da API.
 
         Args:
             response: Resposta HTTP com JSON de metadados
+            decoder: Decodificador JSON (padrão: o mais rápido instalado)
+            pdf_url_prefix: URL do PDF sem o ID da edição (padrão: PDF_PATH
+                no mesmo domínio da resposta)
 
         Returns:
             Lista de GazetteMetadata extraídos
         """
+        decoder = decoder or default_decoder
         try:
-            data = response.json()
-        except json.JSONDecodeError as e:
+            payload = decoder.decode_editions(response.content)
+        except decoder.errors as e:
             logger.warning(f"JSON inválido em {response.url}: {e}")
             return []
 
         # Valida estrutura do JSON
-        if not data or data.get("erro") or not data.get("itens"):
+        if payload.erro or not payload.itens:
             logger.warning(f"JSON vazio ou com erro em {response.url}")
             return []
 
-        publication_date = data.get("data", "unknown")
-        items = data.get("itens", [])
+        publication_date = payload.data
+        if pdf_url_prefix is None:
+            url = response.url
+            pdf_url_prefix = f"{url.scheme}://{url.netloc.decode()}{PDF_PATH}"
 
         metadata_list = []
-        for item in items:
+        for item in payload.itens:
             try:
-                edition_id = str(item.get("id"))
+                edition_id = str(item.id)
 
-                supplement = item.get("suplemento")
+                supplement = item.suplemento
                 if supplement is None:
                     supplement_bool = False
                 elif isinstance(supplement, bool):
@@ -58,11 +95,11 @@ class MetadataParser:
                 metadata = GazetteMetadata(
                     edition_id=edition_id,
                     publication_date=publication_date,
-                    edition_number=int(item.get("numero", 0)),
+                    edition_number=int(item.numero),
                     supplement=supplement_bool,
-                    edition_type_id=int(item.get("tipo_edicao_id", 0)),
-                    edition_type_name=str(item.get("tipo_edicao_nome", "")),
-                    pdf_url=f"https://diariodomunicipio.sjc.sp.gov.br/apifront/portal/edicoes/pdf_diario/{edition_id}/",
+                    edition_type_id=int(item.tipo_edicao_id),
+                    edition_type_name=str(item.tipo_edicao_nome),
+                    pdf_url=f"{pdf_url_prefix}{edition_id}/",
                 )
                 metadata_list.append(metadata)
 
@@ -0,0 +1,52 @@
+"""Extração de texto de PDFs (edições e matérias), página a página."""
+
+import io
+import logging
+from pathlib import Path
+
+try:
+    import pypdf
+except ImportError:  # pragma: no cover - depende do ambiente
+    pypdf = None
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_page_text(text: str) -> str:
+    """Colapsa espaços em cada linha e descarta linhas vazias."""
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def extract_pdf_pages(source: bytes | str | Path) -> list[str]:
+    """
+    Extrai o texto de cada página de um PDF.
+
+    Função de módulo para rodar no pool de processos: a extração é
+    puramente CPU e seguraria o GIL no processo do crawler. PDFs grandes
+    (edições) são passados pelo caminho do arquivo em disco, e não pelos
+    bytes, para não serem copiados entre processos.
+
+    Args:
+        source: Bytes do PDF ou caminho do arquivo
+
+    Returns:
+        Texto normalizado de cada página, na ordem do documento ("" para
+        páginas sem texto, ex.: digitalizadas)
+
+    Raises:
+        RuntimeError: Se o pypdf não estiver instalado
+    """
+    if pypdf is None:
+        raise RuntimeError("Extração de PDF requer pypdf: pip install pypdf")
+
+    stream = io.BytesIO(source) if isinstance(source, bytes) else str(source)
+    reader = pypdf.PdfReader(stream)
+    pages = []
+    for number, page in enumerate(reader.pages, start=1):
+        try:
+            pages.append(normalize_page_text(page.extract_text() or ""))
+        except Exception as e:
+            logger.warning(f"Erro ao extrair texto da página {number}: {e}")
+            pages.append("")
+    return pages
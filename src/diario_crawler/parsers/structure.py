@@ -2,27 +2,47 @@
 
 import logging
 
+import pyarrow as pa
 from selectolax.lexbor import LexborHTMLParser, LexborNode
 
-from ..models import ArticleMetadata
+from ..models import ArticleMetadata, intern_path
 
 logger = logging.getLogger(__name__)
 
+# Formato compacto dos artigos devolvidos pelos workers de parsing
+STRUCTURE_SCHEMA = pa.schema(
+    [
+        ("article_id", pa.string()),
+        ("edition_id", pa.string()),
+        ("hierarchy_path", pa.list_(pa.string())),
+        ("title", pa.string()),
+        ("identifier", pa.string()),
+        ("protocol", pa.string()),
+    ]
+)
+
 
 class HtmlStructureParser:
     """Parseia HTML da árvore de navegação de artigos."""
 
     @staticmethod
-    def parse(html: str, edition_id: str) -> list[ArticleMetadata]:
+    def parse(html: str | bytes, edition_id: str) -> list[ArticleMetadata]:
         """
         Extrai metadados de artigos da árvore HTML de navegação.
 
+        Percorre a árvore uma única vez, descendo só pelos filhos diretos de
+        cada ``ul``/``li``: cada link de matéria é visitado uma vez, já com o
+        caminho hierárquico completo (O(n) no número de nós). O caminho de
+        cada pasta é internado uma vez e compartilhado por seus artigos.
+
         Args:
-            html: HTML da estrutura de navegação
+            html: HTML da estrutura de navegação (str ou bytes UTF-8, que
+                dispensam a decodificação de ``response.text``)
             edition_id: ID da edição (para associar aos artigos)
 
         Returns:
-            Lista de ArticleMetadata com hierarquia completa
+            Lista de ArticleMetadata com hierarquia completa, em ordem de
+            documento
         """
         tree = LexborHTMLParser(html)
         root_ul = tree.css_first("ul#tree")
@@ -35,26 +55,34 @@ class HtmlStructureParser:
 
         articles = []
 
-        def parse_node(li: LexborNode, path: list[str]) -> None:
-            """Recursivamente parseia nós da árvore."""
-            # Verifica se é uma pasta/categoria
-            folder_span = li.css_first("span.folder")
-            if folder_span:
-                folder_name = folder_span.text(strip=True)
-                sub_ul = li.css_first("ul")
-                new_path = path + [folder_name]
-
-                if sub_ul:
-                    for sub_li in sub_ul.css("li"):
-                        parse_node(sub_li, new_path)
-            else:
+        def parse_list(ul: LexborNode, path: tuple[str, ...]) -> None:
+            """Parseia os itens filhos diretos de um ``ul``."""
+            for li in ul.iter():
+                if li.tag != "li":
+                    continue
+
+                # Pasta/categoria: span.folder e sub-listas filhos diretos
+                folder_name = None
+                sub_lists = []
+                for child in li.iter():
+                    if child.tag == "span" and _has_class(child, "folder"):
+                        if folder_name is None:
+                            folder_name = child.text(strip=True)
+                    elif child.tag == "ul":
+                        sub_lists.append(child)
+
+                if folder_name is not None:
+                    for sub_ul in sub_lists:
+                        parse_list(sub_ul, intern_path(path + (folder_name,)))
+                    continue
+
                 # É um link de artigo
                 for link in li.css("a.linkMateria"):
                     try:
                         article = ArticleMetadata(
                             article_id=str(link.attributes.get("data-materia-id", "")),
                             edition_id=edition_id,  # Usa o edition_id passado, não do data-id
-                            hierarchy_path=path.copy(),
+                            hierarchy_path=path,
                             title=link.text(strip=True),
                             identifier=str(link.attributes.get("identificador")),
                             protocol=link.attributes.get("data-protocolo"),
@@ -64,9 +92,7 @@ class HtmlStructureParser:
                     except Exception as e:
                         logger.error(f"Erro ao parsear link de artigo: {e}")
 
-        # Processa todos os nós de primeiro nível
-        for li in root_ul.css("li"):
-            parse_node(li, path=[])
+        parse_list(root_ul, path=())
 
         logger.debug(f"Extraídos {len(articles)} artigos da estrutura HTML")
         return articles
@@ -78,7 +104,8 @@ class HtmlStructureParser:
         """
         Remove artigos duplicados, mantendo o de maior profundidade.
 
-        Útil quando um mesmo artigo aparece em múltiplas categorias.
+        Útil quando um mesmo artigo aparece em múltiplas categorias do
+        diário.
 
         Args:
             articles: Lista de artigos para deduplicar
@@ -106,3 +133,44 @@ class HtmlStructureParser:
             )
 
         return deduplicated
+
+
+def _has_class(node: LexborNode, name: str) -> bool:
+    """Verifica se o nó tem a classe CSS ``name``."""
+    return name in (node.attributes.get("class") or "").split()
+
+
+def articles_to_record_batch(articles: list[ArticleMetadata]) -> pa.RecordBatch:
+    """Converte artigos em um RecordBatch Arrow (colunar, barato de transferir)."""
+    return pa.RecordBatch.from_pydict(
+        {
+            "article_id": [a.article_id for a in articles],
+            "edition_id": [a.edition_id for a in articles],
+            "hierarchy_path": [a.hierarchy_path for a in articles],
+            "title": [a.title for a in articles],
+            "identifier": [a.identifier for a in articles],
+            "protocol": [a.protocol for a in articles],
+        },
+        schema=STRUCTURE_SCHEMA,
+    )
+
+
+def articles_from_record_batch(batch: pa.RecordBatch) -> list[ArticleMetadata]:
+    """Reconstrói os ArticleMetadata a partir de um RecordBatch."""
+    return [ArticleMetadata(**row) for row in batch.to_pylist()]
+
+
+def parse_structure_to_record_batch(
+    html: str | bytes, edition_id: str
+) -> pa.RecordBatch:
+    """
+    Parseia e deduplica a estrutura de uma edição, devolvendo Arrow.
+
+    Função de módulo para poder rodar em um ProcessPoolExecutor: o resultado
+    volta para o processo principal como buffers Arrow, e não como uma lista
+    de dataclasses serializadas com pickle.
+    """
+    articles = HtmlStructureParser.parse(html=html, edition_id=edition_id)
+    return articles_to_record_batch(
+        HtmlStructureParser.deduplicate_keep_deepest(articles)
+    )
@@ -0,0 +1,76 @@
+"""Extração de texto limpo do HTML das matérias."""
+
+import logging
+import re
+
+from selectolax.lexbor import LexborHTMLParser
+
+logger = logging.getLogger(__name__)
+
+# Tags cujo conteúdo não é texto da matéria
+SKIP_TAGS = ["script", "style", "noscript", "template", "head"]
+
+# Elementos de bloco: começam uma nova linha no texto extraído
+BLOCK_TAGS = frozenset(
+    "address article aside blockquote br dd div dl dt fieldset figcaption "
+    "figure footer form h1 h2 h3 h4 h5 h6 header hr li main nav ol p pre "
+    "section table tbody tfoot thead tr ul".split()
+)
+
+# Células de tabela: separadas por espaço na mesma linha
+CELL_TAGS = frozenset({"td", "th"})
+
+# Quebras de linha do código-fonte são espaço comum em HTML
+_WHITESPACE = re.compile(r"\s+")
+
+
+def extract_text(html: str | bytes) -> str:
+    """
+    Converte o HTML de uma matéria em texto simples normalizado.
+
+    Remove scripts e estilos, quebra linha nos elementos de bloco (parágrafos,
+    listas, linhas de tabela, ``br``), colapsa espaços dentro de cada linha e
+    descarta linhas vazias. Entidades HTML são decodificadas pelo lexbor.
+
+    Args:
+        html: HTML da matéria (str ou bytes UTF-8)
+
+    Returns:
+        Texto com um bloco por linha ("" se não houver texto)
+    """
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(SKIP_TAGS)
+    root = tree.body or tree.root
+    if root is None:
+        return ""
+
+    parts: list[str] = []
+    for node in root.traverse(include_text=True):
+        tag = node.tag
+        if tag == "-text":
+            parts.append(_WHITESPACE.sub(" ", node.text_content or ""))
+        elif tag in BLOCK_TAGS:
+            parts.append("\n")
+        elif tag in CELL_TAGS:
+            parts.append(" ")
+
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def extract_texts(htmls: list[str | bytes]) -> list[str | None]:
+    """
+    Extrai o texto de um lote de matérias.
+
+    Função de módulo para rodar no pool de parsing: um lote por edição
+    amortiza o custo de envio ao processo. Uma matéria com HTML inválido
+    resulta em None, sem derrubar o lote.
+    """
+    texts: list[str | None] = []
+    for html in htmls:
+        try:
+            texts.append(extract_text(html))
+        except Exception as e:
+            logger.error(f"Erro ao extrair texto da matéria: {e}")
+            texts.append(None)
+    return texts
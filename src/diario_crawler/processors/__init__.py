@@ -1,5 +1,5 @@
 """Processadores de dados para transformação e agregação."""
 
-from .aggregator import DataProcessor
+from .aggregator import DataProcessor, EditionAssembler
 
-__all__ = ["DataProcessor"]
+__all__ = ["DataProcessor", "EditionAssembler"]
@@ -2,7 +2,13 @@
 
 from typing import Any
 
-from ..models import Article, ArticleMetadata, GazetteEdition, GazetteMetadata
+from ..models import (
+    Article,
+    ArticleContent,
+    ArticleMetadata,
+    GazetteEdition,
+    GazetteMetadata,
+)
 from ..utils import get_logger
 
 logger = get_logger(__name__)
@@ -124,3 +130,79 @@ class DataProcessor:
             metadata=gazette_metadata,
             articles=articles or [],
         )
+
+
+class EditionAssembler:
+    """
+    Monta edições incrementalmente, à medida que os artigos chegam.
+
+    Cada edição é registrada com a lista de artigos esperados (``expect``) e
+    emitida por ``resolve`` assim que o último artigo é resolvido, seja com
+    conteúdo ou com falha. Assim uma edição lenta não segura as demais e
+    apenas as edições em andamento ficam em memória.
+    """
+
+    def __init__(self) -> None:
+        self._metadata: dict[str, GazetteMetadata] = {}
+        self._articles: dict[str, list[Article]] = {}
+        self._remaining: dict[str, int] = {}
+
+    @property
+    def pending(self) -> int:
+        """Número de edições aguardando artigos."""
+        return len(self._remaining)
+
+    def expect(
+        self, metadata: GazetteMetadata, articles: list[ArticleMetadata]
+    ) -> GazetteEdition | None:
+        """
+        Registra uma edição e quantos artigos ela aguarda.
+
+        Returns:
+            A edição pronta se não houver artigos a aguardar, senão None
+        """
+        edition_id = metadata.edition_id
+        if not articles:
+            logger.info(f"Edição {edition_id} agregada com 0 artigos")
+            return GazetteEdition(metadata=metadata, articles=[])
+
+        self._metadata[edition_id] = metadata
+        self._articles[edition_id] = []
+        self._remaining[edition_id] = len(articles)
+        return None
+
+    def resolve(
+        self,
+        article_metadata: ArticleMetadata,
+        content: ArticleContent | None,
+    ) -> GazetteEdition | None:
+        """
+        Resolve um artigo (content=None indica falha no download/parse).
+
+        Returns:
+            A edição completa quando este era o último artigo pendente
+        """
+        edition_id = article_metadata.edition_id
+        if edition_id not in self._remaining:
+            logger.warning(
+                f"Artigo {article_metadata.article_id} referencia edição "
+                f"{edition_id} não registrada"
+            )
+            return None
+
+        if content is not None:
+            self._articles[edition_id].append(
+                Article(metadata=article_metadata, content=content)
+            )
+
+        self._remaining[edition_id] -= 1
+        if self._remaining[edition_id] > 0:
+            return None
+
+        del self._remaining[edition_id]
+        articles = self._articles.pop(edition_id)
+        edition = GazetteEdition(
+            metadata=self._metadata.pop(edition_id), articles=articles
+        )
+        logger.info(f"Edição {edition_id} agregada com {len(articles)} artigos")
+        return edition
@@ -2,6 +2,7 @@ from diario_crawler.storage.base import StorageBackend
 from diario_crawler.storage.local import LocalBackend
 from diario_crawler.storage.minio import MinIOBackend
 from diario_crawler.storage.parquet import MockStorage, ParquetStorage
+from diario_crawler.storage.writer import StorageWriter
 
 __all__ = [
     "StorageBackend",
@@ -9,4 +10,5 @@ __all__ = [
     "MinIOBackend",
     "ParquetStorage",
     "MockStorage",
+    "StorageWriter",
 ]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from pathlib import Path
 from typing import Any
 
 import pyarrow as pa
@@ -56,6 +57,8 @@ ARTICLES_SCHEMA = pa.schema(
         ("content_hash", pa.string()),
         ("content_path", pa.string()),
         ("inline_text", pa.string()),
+        ("text", pa.string()),  # Texto limpo extraído do HTML
+        ("text_length", pa.int64()),
         ("processed_at", pa.timestamp("us")),
         ("batch_id", pa.string()),
         ("year", pa.int32()),
@@ -65,6 +68,34 @@ ARTICLES_SCHEMA = pa.schema(
 )
 
 
+RELATIONSHIPS_SCHEMA = pa.schema(
+    [
+        ("municipality", pa.string()),
+        ("edition_id", pa.string()),
+        ("article_id", pa.string()),
+        ("edition_hash", pa.string()),
+        ("publication_date", pa.date32()),
+        ("batch_id", pa.string()),
+        ("processed_at", pa.timestamp("us")),
+    ]
+)
+
+# Texto extraído dos PDFs, uma linha por página, chaveado pelo hash do PDF
+PDF_PAGES_SCHEMA = pa.schema(
+    [
+        ("municipality", pa.string()),
+        ("content_hash", pa.string()),
+        ("source", pa.string()),  # "edition" ou "article"
+        ("edition_id", pa.string()),
+        ("article_id", pa.string()),
+        ("page", pa.int32()),  # A partir de 1
+        ("text", pa.string()),
+        ("text_length", pa.int64()),
+        ("processed_at", pa.timestamp("us")),
+    ]
+)
+
+
 # ============================================================================
 # Interfaces e Classes Base
 # ============================================================================
@@ -80,16 +111,48 @@ class StorageBackend(ABC):
         """Escreve bytes e retorna o path/URI final."""
         pass
 
+    def write_file(
+        self, path: str, local_path: Path, metadata: dict[str, Any] | None = None
+    ) -> str:
+        """
+        Copia um arquivo local para o backend e retorna o path/URI final.
+
+        A implementação padrão lê o arquivo inteiro; backends que suportam
+        envio em streaming devem sobrescrevê-la.
+        """
+        return self.write_bytes(path, Path(local_path).read_bytes(), metadata)
+
     @abstractmethod
     def read_bytes(self, path: str) -> bytes:
         """Lê bytes de um path/URI."""
         pass
 
+    def read_range(self, path: str, offset: int, length: int) -> bytes:
+        """
+        Lê ``length`` bytes a partir de ``offset``.
+
+        A implementação padrão lê o objeto inteiro; backends que suportam
+        leitura de intervalo devem sobrescrevê-la.
+        """
+        return self.read_bytes(path)[offset : offset + length]
+
     @abstractmethod
     def exists(self, path: str) -> bool:
         """Verifica se path existe."""
         pass
 
+    def delete(self, path: str) -> None:
+        """
+        Remove o path (sem erro se não existir).
+
+        Não há implementação padrão segura; backends que suportam remoção
+        (necessária para compactação e migração para packs) devem
+        sobrescrevê-la.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} não suporta remoção de arquivos"
+        )
+
     @abstractmethod
     def write_parquet(self, path: str, table: pa.Table, **kwargs: Any) -> str:
         """Escreve tabela Parquet."""
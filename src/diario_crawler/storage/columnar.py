@@ -0,0 +1,105 @@
+"""Acumulador colunar para montar lotes Arrow sem passar por linhas."""
+
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+class ColumnarBuilder:
+    """
+    Acumula valores coluna a coluna para um schema Arrow fixo.
+
+    Há três tipos de coluna:
+
+    - por linha: uma lista Python por coluna (``column(nome).append``),
+      convertida de uma vez por ``pa.array`` com o tipo do schema;
+    - em sequências (``extend_run``): valores repetidos por várias linhas
+      seguidas, como os dados da edição em cada um de seus artigos, guardados
+      uma vez por sequência e expandidos em C (run-end encoding);
+    - constantes: o mesmo valor no lote inteiro (município, batch_id,
+      processed_at), preenchidas com ``pa.repeat`` ao montar o lote.
+
+    Uso:
+        builder = ColumnarBuilder(SCHEMA, constants={"batch_id": batch_id})
+        ids = builder.column("article_id")
+        for article in articles:
+            ids.append(article.article_id)
+        builder.extend_run("edition_id", edition_id, len(articles))
+        batch = builder.to_record_batch()
+    """
+
+    def __init__(
+        self,
+        schema: pa.Schema,
+        constants: dict[str, Any] | None = None,
+        runs: tuple[str, ...] = (),
+    ):
+        """
+        Args:
+            schema: Schema do lote gerado
+            constants: Valor fixo de colunas iguais em todas as linhas
+            runs: Colunas preenchidas por ``extend_run``
+        """
+        self.schema = schema
+        self.constants = dict(constants or {})
+        self._runs: dict[str, tuple[list[Any], list[int]]] = {
+            name: ([], []) for name in runs
+        }
+        self._columns: dict[str, list[Any]] = {
+            name: []
+            for name in schema.names
+            if name not in self.constants and name not in self._runs
+        }
+
+    def __repr__(self) -> str:
+        return f"<ColumnarBuilder columns={len(self.schema)} rows={len(self)}>"
+
+    def __len__(self) -> int:
+        for values in self._columns.values():
+            return len(values)
+        for _, ends in self._runs.values():
+            return ends[-1] if ends else 0
+        return 0
+
+    @property
+    def row_columns(self) -> dict[str, list[Any]]:
+        """Listas das colunas por linha, indexadas pelo nome."""
+        return self._columns
+
+    def column(self, name: str) -> list[Any]:
+        """Lista de valores de uma coluna por linha (para ``append`` direto)."""
+        return self._columns[name]
+
+    def extend_run(self, name: str, value: Any, count: int) -> None:
+        """Acrescenta ``count`` linhas com o mesmo ``value`` na coluna."""
+        if count <= 0:
+            return
+        values, ends = self._runs[name]
+        values.append(value)
+        ends.append((ends[-1] if ends else 0) + count)
+
+    def _build_column(self, field: pa.Field, num_rows: int) -> pa.Array:
+        if field.name in self.constants:
+            return pa.repeat(
+                pa.scalar(self.constants[field.name], field.type), num_rows
+            )
+
+        if field.name in self._runs:
+            values, ends = self._runs[field.name]
+            if not ends:
+                return pa.array([], type=field.type)
+            encoded = pa.RunEndEncodedArray.from_arrays(
+                pa.array(ends, type=pa.int32()), pa.array(values, type=field.type)
+            )
+            return pc.run_end_decode(encoded)
+
+        return pa.array(self._columns[field.name], type=field.type)
+
+    def to_record_batch(self) -> pa.RecordBatch:
+        """Monta o RecordBatch (levanta erro se as colunas divergirem)."""
+        num_rows = len(self)
+        return pa.RecordBatch.from_arrays(
+            [self._build_column(field, num_rows) for field in self.schema],
+            schema=self.schema,
+        )
@@ -0,0 +1,95 @@
+"""Regras de compactação: ajuste de schema, deduplicação e ordenação."""
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from diario_crawler.storage.base import (
+    ARTICLES_SCHEMA,
+    EDITIONS_SCHEMA,
+    RELATIONSHIPS_SCHEMA,
+)
+
+# Schema e chave de deduplicação de cada dataset compactável
+COMPACTION_DATASETS: dict[str, tuple[pa.Schema, tuple[str, ...]]] = {
+    "gazettes": (EDITIONS_SCHEMA, ("municipality", "edition_id")),
+    "articles": (ARTICLES_SCHEMA, ("municipality", "article_id")),
+    "relationships": (
+        RELATIONSHIPS_SCHEMA,
+        ("municipality", "edition_id", "article_id"),
+    ),
+}
+
+SORT_KEYS = ("municipality", "publication_date", "edition_id")
+
+# Coluna temporária usada na deduplicação de articles
+HAS_CONTENT = "_has_content"
+
+# Linhas por arquivo e por row group dos arquivos compactados
+TARGET_FILE_ROWS = 1_000_000
+TARGET_ROW_GROUP_ROWS = 128 * 1024
+
+
+def conform(table: pa.Table, schema: pa.Schema) -> pa.Table:
+    """
+    Ajusta um arquivo de lote ao schema atual do dataset.
+
+    Lotes antigos podem não ter colunas novas (preenchidas com nulos) ou
+    ter tipos antigos, como datas e horários gravados como string.
+    """
+    columns = []
+    for field in schema:
+        if field.name in table.column_names:
+            column = table.column(field.name)
+            if column.type != field.type:
+                column = pc.cast(column, field.type)
+            columns.append(column)
+        else:
+            columns.append(pa.nulls(table.num_rows, field.type))
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def deduplicate(
+    table: pa.Table, keys: tuple[str, ...], prefer: str | None = None
+) -> pa.Table:
+    """
+    Mantém, para cada chave, a linha com o ``processed_at`` mais recente.
+
+    Args:
+        table: Linhas a deduplicar
+        keys: Colunas da chave de deduplicação
+        prefer: Coluna booleana opcional; linhas com True vencem as demais
+            antes do critério de ``processed_at``
+    """
+    if table.num_rows < 2:
+        return table
+    order = [(key, "ascending") for key in keys]
+    if prefer is not None:
+        order.append((prefer, "descending"))
+    order.append(("processed_at", "descending"))
+    ordered = table.sort_by(order).combine_chunks()
+    # Primeira linha de cada chave: alguma coluna difere da linha anterior
+    first = None
+    for key in keys:
+        column = ordered.column(key)
+        changed = pc.fill_null(pc.not_equal(column[1:], column[:-1]), True)
+        first = changed if first is None else pc.or_(first, changed)
+    mask = pa.concat_arrays([pa.array([True])] + first.chunks)
+    return ordered.filter(mask)
+
+
+def compact_table(tables: list[pa.Table], dataset: str) -> pa.Table:
+    """Une os lotes de uma partição, deduplica e ordena as linhas."""
+    schema, keys = COMPACTION_DATASETS[dataset]
+    table = pa.concat_tables([conform(t, schema) for t in tables])
+    if dataset == "articles":
+        # Referências de recrawls (sem conteúdo) não substituem a linha
+        # original, que guarda o ``inline_text``
+        has_content = pc.or_(
+            pc.is_valid(table.column("content_path")),
+            pc.is_valid(table.column("inline_text")),
+        )
+        table = table.append_column(HAS_CONTENT, has_content)
+        table = deduplicate(table, keys, prefer=HAS_CONTENT).drop_columns([HAS_CONTENT])
+    else:
+        table = deduplicate(table, keys)
+    return table.sort_by([(key, "ascending") for key in SORT_KEYS])
@@ -0,0 +1,171 @@
+"""Índice persistente dos hashes de conteúdo já gravados como blob."""
+
+import math
+import threading
+from typing import Iterable
+
+import pyarrow as pa
+
+CONTENT_INDEX_SCHEMA = pa.schema([("content_hash", pa.string())])
+
+# Tamanho mínimo do filtro: evita filtros minúsculos em storages novos
+MIN_CAPACITY = 100_000
+
+# Bytes de um SHA-256 binário
+DIGEST_SIZE = 32
+
+
+def _to_digest(content_hash: str) -> bytes | None:
+    """Digest binário de um hash hexadecimal (None se inválido)."""
+    try:
+        digest = bytes.fromhex(content_hash)
+    except (TypeError, ValueError):
+        return None
+    return digest if len(digest) == DIGEST_SIZE else None
+
+
+def _search(digests: bytes, digest: bytes) -> bool:
+    """Busca binária em digests ordenados e concatenados."""
+    lo, hi = 0, len(digests) // DIGEST_SIZE
+    while lo < hi:
+        mid = (lo + hi) // 2
+        item = digests[mid * DIGEST_SIZE : (mid + 1) * DIGEST_SIZE]
+        if item < digest:
+            lo = mid + 1
+        elif item > digest:
+            hi = mid
+        else:
+            return True
+    return False
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom sobre hashes SHA-256 em hexadecimal.
+
+    Os hashes já são uniformes, então as posições saem do próprio hash
+    (hashing duplo com os dois primeiros blocos de 64 bits), sem recalcular
+    nenhuma função de hash.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        Args:
+            capacity: Número de itens para o qual o filtro é dimensionado
+            error_rate: Taxa de falsos positivos esperada nessa capacidade
+        """
+        capacity = max(capacity, 1)
+        self.num_bits = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def __repr__(self) -> str:
+        return f"<BloomFilter bits={self.num_bits} hashes={self.num_hashes}>"
+
+    def _positions(self, content_hash: str) -> Iterable[int]:
+        h1 = int(content_hash[:16], 16)
+        h2 = int(content_hash[16:32], 16) | 1
+        m = self.num_bits
+        return ((h1 + i * h2) % m for i in range(self.num_hashes))
+
+    def add(self, content_hash: str) -> None:
+        bits = self._bits
+        for pos in self._positions(content_hash):
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, content_hash: object) -> bool:
+        if not isinstance(content_hash, str):
+            return False
+        bits = self._bits
+        return all(
+            bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(content_hash)
+        )
+
+
+class ContentHashIndex:
+    """
+    Conjunto dos ``content_hash`` com blob no storage.
+
+    Em memória ficam um filtro de Bloom e os hashes carregados, ordenados e
+    compactados como digests binários de 32 bytes. Um "não" do filtro é
+    definitivo; um "talvez" é confirmado por busca binária nos digests, sem
+    ``exists()`` no backend (um ``stat_object`` por blob no MinIO). Hashes
+    gravados nesta execução ficam em um conjunto à parte. A persistência é
+    feita pelo ParquetStorage em segmentos Parquet ordenados e só-acréscimo
+    (``_content_index/segment_*.parquet``); hashes gravados desde o último
+    segmento ficam em ``pending``.
+
+    Blobs gravados por outros processos depois da carga não estão no filtro
+    e são reenviados uma vez, o que é inofensivo: o path é endereçado pelo
+    conteúdo.
+    """
+
+    def __init__(self, hashes: Iterable[str] = (), capacity: int | None = None):
+        digests = sorted({d for d in map(_to_digest, hashes) if d is not None})
+        self.capacity = max(capacity or 2 * len(digests), MIN_CAPACITY)
+        self._filter = BloomFilter(self.capacity)
+        for digest in digests:
+            self._filter.add(digest.hex())
+        self._digests = b"".join(digests)
+        self._size = len(digests)
+        # Hashes gravados desde a carga (os ainda não persistidos em pending)
+        self._added: set[str] = set()
+        self.pending: set[str] = set()
+        # Escritas de lotes rodam em paralelo no pool de threads do storage
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return (
+            f"<ContentHashIndex size={self._size} pending={len(self.pending)} "
+            f"capacity={self.capacity}>"
+        )
+
+    def __len__(self) -> int:
+        return self._size
+
+    def might_contain(self, content_hash: str) -> bool:
+        """False quando o blob certamente não foi indexado."""
+        return content_hash in self._added or content_hash in self._filter
+
+    def __contains__(self, content_hash: object) -> bool:
+        """Pertinência exata: filtro de Bloom seguido de busca binária."""
+        if not isinstance(content_hash, str) or not self.might_contain(content_hash):
+            return False
+        if content_hash in self._added:
+            return True
+        digest = _to_digest(content_hash)
+        return digest is not None and _search(self._digests, digest)
+
+    def add(self, content_hash: str) -> None:
+        """Registra um blob gravado (persistido no próximo segmento)."""
+        with self._lock:
+            if content_hash in self._added:
+                return
+            self._filter.add(content_hash)
+            self._added.add(content_hash)
+            self.pending.add(content_hash)
+            self._size += 1
+
+    def take_pending(self) -> list[str]:
+        """Retorna (ordenados) e esquece os hashes ainda não persistidos."""
+        with self._lock:
+            hashes = sorted(self.pending)
+            self.pending.clear()
+        return hashes
+
+    @classmethod
+    def from_tables(cls, tables: list[pa.Table]) -> "ContentHashIndex":
+        """Monta o índice a partir dos segmentos."""
+        hashes: list[str] = []
+        for table in tables:
+            hashes.extend(table.column("content_hash").to_pylist())
+        return cls(hashes)
+
+    @staticmethod
+    def to_table(hashes: Iterable[str]) -> pa.Table:
+        """Serializa hashes (ordenados) como um segmento Parquet."""
+        return pa.Table.from_pydict(
+            {"content_hash": sorted(hashes)}, schema=CONTENT_INDEX_SCHEMA
+        )
@@ -0,0 +1,88 @@
+"""Índice persistente de identificadores de artigos já armazenados."""
+
+from typing import Iterator, Mapping
+
+import pyarrow as pa
+
+from diario_crawler.utils import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_SCHEMA = pa.schema(
+    [
+        ("identifier", pa.string()),
+        ("content_hash", pa.string()),
+    ]
+)
+
+
+class IdentifierIndex:
+    """
+    Mapa ``identifier -> content_hash`` dos artigos de um município.
+
+    Fica inteiro em memória (dict), então consultas de pertinência são O(1)
+    mesmo com milhões de identificadores. A persistência é feita pelo
+    ParquetStorage em segmentos Parquet pequenos e só-acréscimo
+    (``_index/<município>/segment_*.parquet``), lidos uma única vez na
+    carga, sem varrer ``articles/*.parquet``.
+    """
+
+    def __init__(self, entries: Mapping[str, str | None] | None = None):
+        self._entries: dict[str, str | None] = dict(entries or {})
+
+    def __repr__(self) -> str:
+        return f"<IdentifierIndex size={len(self._entries)}>"
+
+    def __contains__(self, identifier: object) -> bool:
+        return identifier in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def items(self) -> Iterator[tuple[str, str | None]]:
+        return iter(self._entries.items())
+
+    def get(self, identifier: str) -> str | None:
+        """Hash do conteúdo armazenado para o identificador (ou None)."""
+        return self._entries.get(identifier)
+
+    def new_entries(self, entries: Mapping[str, str | None]) -> dict[str, str | None]:
+        """Filtra entradas ausentes ou com conteúdo diferente do indexado."""
+        return {
+            identifier: content_hash
+            for identifier, content_hash in entries.items()
+            if identifier not in self._entries
+            or self._entries[identifier] != content_hash
+        }
+
+    def update(self, entries: Mapping[str, str | None]) -> None:
+        self._entries.update(entries)
+
+    @classmethod
+    def from_tables(cls, tables: list[pa.Table]) -> "IdentifierIndex":
+        """Monta o índice a partir dos segmentos (o mais recente prevalece)."""
+        index = cls()
+        for table in tables:
+            index.update(
+                dict(
+                    zip(
+                        table.column("identifier").to_pylist(),
+                        table.column("content_hash").to_pylist(),
+                    )
+                )
+            )
+        return index
+
+    @staticmethod
+    def to_table(entries: Mapping[str, str | None]) -> pa.Table:
+        """Serializa entradas como um segmento Parquet."""
+        return pa.Table.from_pydict(
+            {
+                "identifier": list(entries.keys()),
+                "content_hash": list(entries.values()),
+            },
+            schema=INDEX_SCHEMA,
+        )
@@ -1,4 +1,7 @@
 import json
+import os
+import shutil
+import uuid
 from pathlib import Path
 from typing import Any
 
@@ -16,19 +19,33 @@ logger = get_logger(__name__)
 
 
 class LocalBackend(StorageBackend):
-    """Backend para armazenamento em filesystem local."""
+    """
+    Backend para armazenamento em filesystem local.
+
+    Escritas são atômicas (arquivo temporário + ``os.replace``): uma queda no
+    meio da escrita nunca deixa um arquivo truncado no lugar do original.
+    """
 
     def __init__(self, base_path: Path | str = "data/raw"):
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
         logger.info(f"LocalBackend inicializado em {self.base_path}")
 
+    @staticmethod
+    def _tmp_path(full_path: Path) -> Path:
+        # Único por escrita: vários processos/hosts podem gravar no mesmo disco
+        return full_path.with_name(
+            f".{full_path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+        )
+
     def write_bytes(
         self, path: str, data: bytes, metadata: dict[str, Any] | None = None
     ) -> str:
         full_path = self.base_path / path
         full_path.parent.mkdir(parents=True, exist_ok=True)
-        full_path.write_bytes(data)
+        tmp_path = self._tmp_path(full_path)
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, full_path)
 
         # Opcionalmente salva metadados em sidecar
         if metadata:
@@ -37,27 +54,53 @@ class LocalBackend(StorageBackend):
 
         return str(full_path.relative_to(self.base_path))
 
+    def write_file(
+        self, path: str, local_path: Path, metadata: dict[str, Any] | None = None
+    ) -> str:
+        full_path = self.base_path / path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._tmp_path(full_path)
+        shutil.copyfile(local_path, tmp_path)
+        os.replace(tmp_path, full_path)
+
+        if metadata:
+            meta_path = full_path.with_suffix(full_path.suffix + ".meta.json")
+            meta_path.write_text(json.dumps(metadata, indent=2))
+
+        return str(full_path.relative_to(self.base_path))
+
     def read_bytes(self, path: str) -> bytes:
         full_path = self.base_path / path
         return full_path.read_bytes()
 
+    def read_range(self, path: str, offset: int, length: int) -> bytes:
+        with open(self.base_path / path, "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
     def exists(self, path: str) -> bool:
         return (self.base_path / path).exists()
 
+    def delete(self, path: str) -> None:
+        (self.base_path / path).unlink(missing_ok=True)
+
     def write_parquet(self, path: str, table: pa.Table, **kwargs: Any) -> str:
         full_path = self.base_path / path
         full_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._tmp_path(full_path)
 
         pq.write_table(
             table,
-            str(full_path),
+            str(tmp_path),
             compression=kwargs.get("compression", PARQUET_COMPRESSION),
             compression_level=kwargs.get(
                 "compression_level", PARQUET_COMPRESSION_LEVEL
             ),
             use_dictionary=kwargs.get("use_dictionary", True),
             write_statistics=kwargs.get("write_statistics", True),
+            row_group_size=kwargs.get("row_group_size"),
         )
+        os.replace(tmp_path, full_path)
         return str(full_path.relative_to(self.base_path))
 
     def read_parquet(self, path: str, columns: list[str] | None = None) -> pa.Table:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from io import BytesIO
+from pathlib import Path
 from typing import Any
 from urllib.parse import urlparse
 
@@ -90,6 +91,16 @@ class MinIOBackend(StorageBackend):
         )
         return key
 
+    def write_file(
+        self, path: str, local_path: Path, metadata: dict[str, Any] | None = None
+    ) -> str:
+        key = self._full_key(path)
+        meta = {f"x-amz-meta-{k}": str(v) for k, v in (metadata or {}).items()}
+
+        # fput_object envia em partes, sem carregar o arquivo em memória
+        self.client.fput_object(self.bucket, key, str(local_path), metadata=meta)
+        return key
+
     def read_bytes(self, path: str) -> bytes:
         key = self._full_key(path)
         response = self.client.get_object(self.bucket, key)
@@ -99,6 +110,17 @@ class MinIOBackend(StorageBackend):
             response.close()
             response.release_conn()
 
+    def read_range(self, path: str, offset: int, length: int) -> bytes:
+        key = self._full_key(path)
+        response = self.client.get_object(
+            self.bucket, key, offset=offset, length=length
+        )
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
     def exists(self, path: str) -> bool:
         key = self._full_key(path)
         try:
@@ -107,6 +129,9 @@ class MinIOBackend(StorageBackend):
         except S3Error:
             return False
 
+    def delete(self, path: str) -> None:
+        self.client.remove_object(self.bucket, self._full_key(path))
+
     def write_parquet(self, path: str, table: pa.Table, **kwargs: Any) -> str:
         # Serializa parquet para memória
         buf = BytesIO()
@@ -119,6 +144,7 @@ class MinIOBackend(StorageBackend):
             ),
             use_dictionary=kwargs.get("use_dictionary", True),
             write_statistics=kwargs.get("write_statistics", True),
+            row_group_size=kwargs.get("row_group_size"),
         )
 
         # Upload
@@ -0,0 +1,178 @@
+"""Packfiles: blobs pequenos agrupados em objetos grandes com índice de offsets."""
+
+import uuid
+from datetime import datetime
+from typing import Iterator, NamedTuple
+
+import pyarrow as pa
+
+PACKS_DIRNAME = "packs"
+
+# Tamanho (comprimido) a partir do qual um pack é fechado e outro é aberto
+PACK_TARGET_SIZE = 64 * 1024**2
+PACK_COMPRESSION_LEVEL = 3
+
+PACK_INDEX_SCHEMA = pa.schema(
+    [
+        ("content_hash", pa.string()),
+        ("pack", pa.string()),
+        ("offset", pa.int64()),
+        ("length", pa.int64()),  # Bytes do frame zstd no pack
+        ("size", pa.int64()),  # Bytes do blob descomprimido
+    ]
+)
+
+_CODEC = pa.Codec("zstd", compression_level=PACK_COMPRESSION_LEVEL)
+
+
+class PackLocation(NamedTuple):
+    """Posição de um blob dentro de um pack."""
+
+    pack: str
+    offset: int
+    length: int
+    size: int
+
+
+def decompress_frame(frame: bytes, size: int) -> bytes:
+    """Descomprime o frame zstd de um blob."""
+    return _CODEC.decompress(frame, decompressed_size=size).to_pybytes()
+
+
+class PackWriter:
+    """
+    Acumula blobs de um lote como frames zstd independentes.
+
+    Cada blob vira um frame próprio, de modo que basta uma leitura de
+    intervalo (``offset``, ``length``) para recuperá-lo. Quando o pack atual
+    passa de ``target_size`` um novo é aberto; os packs prontos são gravados
+    pelo ParquetStorage, uma única vez (packs são imutáveis).
+
+    Não é compartilhado entre threads: cada ``save_editions`` usa o seu.
+    """
+
+    def __init__(self, target_size: int = PACK_TARGET_SIZE):
+        self.target_size = target_size
+        self.entries: dict[str, PackLocation] = {}
+        self._packs: list[tuple[str, bytearray]] = []
+
+    def __repr__(self) -> str:
+        return f"<PackWriter packs={len(self._packs)} blobs={len(self.entries)}>"
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, content_hash: object) -> bool:
+        return content_hash in self.entries
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes (comprimidos) acumulados em todos os packs."""
+        return sum(len(data) for _, data in self._packs)
+
+    @staticmethod
+    def _new_pack_path() -> str:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        return f"{PACKS_DIRNAME}/pack_{timestamp}_{uuid.uuid4().hex[:12]}.pack"
+
+    def add(self, content_hash: str, raw_bytes: bytes) -> PackLocation:
+        """Acrescenta um blob (ou retorna a posição de um já acrescentado)."""
+        location = self.entries.get(content_hash)
+        if location is not None:
+            return location
+        frame = _CODEC.compress(raw_bytes, asbytes=True)
+        return self.add_frame(content_hash, frame, len(raw_bytes))
+
+    def add_frame(self, content_hash: str, frame: bytes, size: int) -> PackLocation:
+        """
+        Acrescenta um frame zstd já comprimido (ex.: copiado de outro pack).
+
+        Args:
+            content_hash: Hash do blob
+            frame: Frame zstd do blob
+            size: Bytes do blob descomprimido
+        """
+        location = self.entries.get(content_hash)
+        if location is not None:
+            return location
+
+        if not self._packs or len(self._packs[-1][1]) >= self.target_size:
+            self._packs.append((self._new_pack_path(), bytearray()))
+        path, data = self._packs[-1]
+
+        location = PackLocation(path, len(data), len(frame), size)
+        data += frame
+        self.entries[content_hash] = location
+        return location
+
+    def packs(self) -> Iterator[tuple[str, bytes, dict[str, PackLocation]]]:
+        """Packs prontos: (path, conteúdo, entradas do índice de cada pack)."""
+        for path, data in self._packs:
+            entries = {h: loc for h, loc in self.entries.items() if loc.pack == path}
+            yield path, bytes(data), entries
+
+
+class PackIndex:
+    """
+    Mapa ``content_hash -> PackLocation`` dos blobs guardados em packs.
+
+    Fica em memória (dict) e é persistido pelo ParquetStorage em segmentos
+    Parquet só-acréscimo (``_pack_index/segment_*.parquet``), gravados
+    sempre depois do pack a que se referem.
+    """
+
+    def __init__(self, entries: dict[str, PackLocation] | None = None):
+        self._entries: dict[str, PackLocation] = dict(entries or {})
+
+    def __repr__(self) -> str:
+        return f"<PackIndex size={len(self._entries)}>"
+
+    def __contains__(self, content_hash: object) -> bool:
+        return content_hash in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, content_hash: str) -> PackLocation | None:
+        return self._entries.get(content_hash)
+
+    def items(self) -> Iterator[tuple[str, PackLocation]]:
+        return iter(self._entries.items())
+
+    def update(self, entries: dict[str, PackLocation]) -> None:
+        self._entries.update(entries)
+
+    def packs(self) -> set[str]:
+        """Packs referenciados pelo índice."""
+        return {location.pack for location in self._entries.values()}
+
+    @classmethod
+    def from_tables(cls, tables: list[pa.Table]) -> "PackIndex":
+        """Monta o índice a partir dos segmentos (o mais recente prevalece)."""
+        index = cls()
+        for table in tables:
+            columns = [
+                table.column(name).to_pylist() for name in PACK_INDEX_SCHEMA.names
+            ]
+            index.update(
+                {
+                    content_hash: PackLocation(pack, offset, length, size)
+                    for content_hash, pack, offset, length, size in zip(*columns)
+                }
+            )
+        return index
+
+    @staticmethod
+    def to_table(entries: dict[str, PackLocation]) -> pa.Table:
+        """Serializa entradas como um segmento Parquet."""
+        locations = list(entries.values())
+        return pa.Table.from_pydict(
+            {
+                "content_hash": list(entries.keys()),
+                "pack": [loc.pack for loc in locations],
+                "offset": [loc.offset for loc in locations],
+                "length": [loc.length for loc in locations],
+                "size": [loc.size for loc in locations],
+            },
+            schema=PACK_INDEX_SCHEMA,
+        )
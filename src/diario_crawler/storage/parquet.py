@@ -1,21 +1,65 @@
 import hashlib
 import json
-from datetime import datetime
-from typing import Any
+import string
+import threading
+import uuid
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable
 
 import duckdb
 import pyarrow as pa
 
 from diario_crawler.models import ContentType, GazetteEdition
-from diario_crawler.storage.base import ARTICLES_SCHEMA, EDITIONS_SCHEMA, StorageBackend
+from diario_crawler.storage.base import (
+    ARTICLES_SCHEMA,
+    EDITIONS_SCHEMA,
+    PDF_PAGES_SCHEMA,
+    RELATIONSHIPS_SCHEMA,
+    StorageBackend,
+)
+from diario_crawler.storage.columnar import ColumnarBuilder
+from diario_crawler.storage.compaction import (
+    COMPACTION_DATASETS,
+    TARGET_FILE_ROWS,
+    TARGET_ROW_GROUP_ROWS,
+    compact_table,
+)
+from diario_crawler.storage.content_index import ContentHashIndex
+from diario_crawler.storage.index import IdentifierIndex
 from diario_crawler.storage.local import LocalBackend
-from diario_crawler.utils import get_logger
+from diario_crawler.storage.packfile import (
+    PACK_TARGET_SIZE,
+    PACKS_DIRNAME,
+    PackIndex,
+    PackLocation,
+    PackWriter,
+    decompress_frame,
+)
+from diario_crawler.storage.partitioning import (
+    PARTITION_LEVELS,
+    partition_dir,
+    prune_files,
+    split_by_partition,
+)
+from diario_crawler.storage.state import delta_name, merge_state
+from diario_crawler.utils import get_logger, metrics
 
 logger = get_logger(__name__)
 
 
 CONTENT_INLINE_THRESHOLD = 2000
 CONTENT_DIRNAME = "content"
+STATE_DIRNAME = "_state"
+INDEX_DIRNAME = "_index"
+PDF_INDEX_DIRNAME = "_pdf_index"
+PDF_PAGES_DIRNAME = "pdf_pages"
+CONTENT_INDEX_DIRNAME = "_content_index"
+PACK_INDEX_DIRNAME = "_pack_index"
+COMPACTION_STATE = "compaction"
+
+# Prefixo dos nomes de segmento até o timestamp (``segment_%Y%m%d_%H%M%S_%f``)
+SEGMENT_TIMESTAMP_END = len("segment_") + len("20240101_000000_000000")
 
 
 class MockStorage:
@@ -25,6 +69,21 @@ class MockStorage:
     def save_editions(self, editions: Any, **kwargs):
         pass
 
+    def load_state(self, name: str) -> dict[str, Any]:
+        return {}
+
+    def save_state(self, name: str, state: dict[str, Any]) -> None:
+        pass
+
+    def append_state(self, name: str, delta: dict[str, Any]) -> None:
+        pass
+
+    def identifier_index(self, municipality: str) -> IdentifierIndex:
+        return IdentifierIndex()
+
+    def pdf_index(self) -> IdentifierIndex:
+        return IdentifierIndex()
+
 
 class ParquetStorage:
     """
@@ -42,18 +101,53 @@ class ParquetStorage:
             secret_key="minioadmin",
             secure=False,
         ))
+
+        # Blobs de conteúdo agrupados em packfiles
+        storage = ParquetStorage(LocalBackend("data/raw"), pack_blobs=True)
     """
 
     def __init__(
         self,
         backend: StorageBackend,
-        partition_by: str = "day",  # "day", "month", "year"
+        partition_by: str = "month",  # "day", "month", "year"
         enable_duckdb: bool = True,
         duckdb_path: str | None = None,
+        pack_blobs: bool = False,
+        pack_size: int = PACK_TARGET_SIZE,
     ):
+        """
+        Args:
+            backend: Backend de persistência
+            partition_by: Nível de partição Hive de gazettes, articles e
+                relationships (``municipality=../year=..[/month=..[/day=..]]``).
+                O padrão é mensal: com "day", cada lote vira um arquivo por
+                dia publicado, multiplicando arquivos pequenos (e GETs por
+                consulta) sem ganho de poda em consultas por período
+            enable_duckdb: Habilita consultas com DuckDB
+            duckdb_path: Arquivo do DuckDB (padrão: em memória)
+            pack_blobs: Grava blobs novos em packfiles em vez de um objeto
+                por blob em ``content/``
+            pack_size: Tamanho a partir do qual um pack é fechado
+        """
+        if partition_by not in PARTITION_LEVELS:
+            raise ValueError(
+                f"partition_by inválido: {partition_by} "
+                f"(opções: {', '.join(PARTITION_LEVELS)})"
+            )
         self.backend = backend
         self.partition_by = partition_by
         self.enable_duckdb = enable_duckdb
+        self.pack_blobs = pack_blobs
+        self.pack_size = pack_size
+
+        # Índices de identificadores já carregados, por município; a carga
+        # preguiçosa dos índices é protegida porque leitores no event loop
+        # podem disputá-la com o escritor do storage
+        self._load_lock = threading.RLock()
+        self._indexes: dict[str, IdentifierIndex] = {}
+        self._pdf_index: IdentifierIndex | None = None
+        self._content_index: ContentHashIndex | None = None
+        self._pack_index: PackIndex | None = None
 
         # DuckDB para consultas (opcional)
         self._duck_conn = None
@@ -75,8 +169,23 @@ class ParquetStorage:
         content = f"{edition.metadata.edition_id}_{edition.metadata.publication_date}_{len(edition.articles)}"
         return hashlib.md5(content.encode("utf-8")).hexdigest()
 
-    def _write_content_blob(self, raw: str | bytes) -> dict[str, Any]:
-        """Persiste conteúdo pesado e retorna metadados."""
+    @staticmethod
+    def _content_path(content_hash: str) -> str:
+        """Path do blob endereçado pelo hash do conteúdo."""
+        filename = f"{content_hash}.bin"
+        return f"{CONTENT_DIRNAME}/{content_hash[:2]}/{content_hash[2:4]}/{filename}"
+
+    def _write_content_blob(
+        self, raw: str | bytes, pack: PackWriter | None = None
+    ) -> dict[str, Any]:
+        """
+        Persiste conteúdo pesado e retorna metadados.
+
+        Com ``pack``, blobs novos são acrescentados ao pack do lote (gravado
+        depois por ``_write_packs``) em vez de virarem um objeto próprio. O
+        ``content_path`` é sempre o endereço lógico ``content/..``, resolvido
+        por ``get_content`` tanto para blobs soltos quanto empacotados.
+        """
         if isinstance(raw, str):
             raw_bytes = raw.encode("utf-8")
         else:
@@ -84,11 +193,17 @@ class ParquetStorage:
 
         size = len(raw_bytes)
         content_hash = hashlib.sha256(raw_bytes).hexdigest()
-        filename = f"{content_hash}.bin"
-        path = f"{CONTENT_DIRNAME}/{content_hash[:2]}/{content_hash[2:4]}/{filename}"
+        path = self._content_path(content_hash)
 
-        # Escreve se não existir (deduplicação por hash)
-        if not self.backend.exists(path):
+        # Escreve se não existir, solto ou empacotado (deduplicação por hash)
+        stored = (
+            (pack is not None and content_hash in pack)
+            or content_hash in self.pack_index()
+            or self._blob_exists(content_hash, path)
+        )
+        if not stored and pack is not None:
+            pack.add(content_hash, raw_bytes)
+        elif not stored:
             self.backend.write_bytes(
                 path,
                 raw_bytes,
@@ -98,6 +213,7 @@ class ParquetStorage:
                     "created_at": datetime.now().isoformat(),
                 },
             )
+            self.content_index().add(content_hash)
 
         return {
             "content_hash": content_hash,
@@ -105,6 +221,70 @@ class ParquetStorage:
             "content_size": size,
         }
 
+    def write_content_file(
+        self, local_path: Path, content_hash: str, size: int
+    ) -> dict[str, Any]:
+        """
+        Persiste como blob um arquivo já baixado em disco (ex.: PDF da edição).
+
+        O hash é calculado por quem baixou o arquivo; blobs já existentes não
+        são enviados de novo.
+
+        Returns:
+            Dict com content_hash, content_path e content_size
+        """
+        path = self._content_path(content_hash)
+        if not self._blob_exists(content_hash, path):
+            self.backend.write_file(
+                path,
+                local_path,
+                metadata={
+                    "content_hash": content_hash,
+                    "content_size": size,
+                    "created_at": datetime.now().isoformat(),
+                },
+            )
+            self.content_index().add(content_hash)
+        return {
+            "content_hash": content_hash,
+            "content_path": path,
+            "content_size": size,
+        }
+
+    def _blob_exists(self, content_hash: str, path: str) -> bool:
+        """
+        Verifica se o blob já existe, consultando o backend só se preciso.
+
+        O índice de conteúdo responde localmente quando o hash nunca foi
+        gravado (filtro de Bloom) ou quando está indexado (busca binária);
+        só um falso positivo do filtro é confirmado com ``exists()``.
+        """
+        index = self.content_index()
+        if not index.might_contain(content_hash):
+            metrics.inc("storage_blob_checks", source="index")
+            return False
+        if content_hash in index:
+            metrics.inc("storage_blob_checks", source="index")
+            return True
+        metrics.inc("storage_blob_checks", source="backend")
+        return self.backend.exists(path)
+
+    @staticmethod
+    def _batch_path(
+        dataset: str,
+        timestamp: str,
+        token: str,
+        municipality: str,
+        partition: dict[str, int] | None = None,
+    ) -> str:
+        """Path único do arquivo do lote, seguro para escritores concorrentes."""
+        if partition is not None:
+            directory = partition_dir(dataset, municipality, partition)
+            return f"{directory}/batch_{timestamp}_{token}.parquet"
+        if municipality:
+            return f"{dataset}/batch_{timestamp}_{municipality}_{token}.parquet"
+        return f"{dataset}/batch_{timestamp}_{token}.parquet"
+
     def _publication_date_parts(self, publication_date: str) -> dict[str, int]:
         """Extrai year/month/day da data."""
         try:
@@ -132,114 +312,15 @@ class ParquetStorage:
             return {"editions": 0, "articles": 0, "relationships": 0}
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        batch_id = kwargs.get("batch_id", f"batch_{timestamp}")
+        # Sufixo aleatório: processos/hosts concorrentes nunca colidem
+        token = uuid.uuid4().hex[:12]
+        batch_id = kwargs.get("batch_id", f"batch_{timestamp}_{token}")
+        municipality = kwargs.get("municipality", "")
 
-        editions_rows: list[dict[str, Any]] = []
-        articles_rows: list[dict[str, Any]] = []
-        relationships_rows: list[dict[str, Any]] = []
-
-        # Processa edições e artigos
-        for edition in editions:
-            meta = edition.metadata
-            edition_hash = self._generate_edition_hash(edition)
-            pub_parts = self._publication_date_parts(meta.publication_date)
-
-            # Parse publication_date para date32
-            pub_date_obj = datetime.strptime(meta.publication_date, "%Y-%m-%d").date()
-
-            editions_rows.append(
-                {
-                    "municipality": kwargs.get("municipality", ""),
-                    "edition_id": str(meta.edition_id),
-                    "publication_date": pub_date_obj,
-                    "edition_number": int(meta.edition_number),
-                    "supplement": bool(meta.supplement),
-                    "edition_type_id": int(meta.edition_type_id),
-                    "edition_type_name": str(meta.edition_type_name),
-                    "pdf_url": str(meta.pdf_url),
-                    "total_articles": len(edition.articles),
-                    "processed_at": datetime.now(),
-                    "edition_hash": edition_hash,
-                    "batch_id": batch_id,
-                    "year": pub_parts["year"],
-                    "month": pub_parts["month"],
-                    "day": pub_parts["day"],
-                }
-            )
-
-            for article in edition.articles:
-                raw_content = article.content.raw_content
-
-                # Normaliza conteúdo
-                if isinstance(raw_content, bytes):
-                    try:
-                        raw_text = raw_content.decode("utf-8")
-                        raw_bytes = raw_content
-                    except Exception:
-                        raw_text = None
-                        raw_bytes = raw_content
-                else:
-                    raw_text = str(raw_content) if raw_content is not None else ""
-                    raw_bytes = raw_text.encode("utf-8")
-
-                # Decide inline vs blob
-                if raw_text is None or len(raw_text) > CONTENT_INLINE_THRESHOLD:
-                    content_meta = self._write_content_blob(raw_bytes)
-                    inline_text = None
-                else:
-                    content_meta = {
-                        "content_hash": None,
-                        "content_path": None,
-                        "content_size": len(raw_bytes),
-                    }
-                    inline_text = raw_text
-
-                hierarchy = getattr(article.metadata, "hierarchy_path", []) or []
-
-                articles_rows.append(
-                    {
-                        "municipality": kwargs.get("municipality", ""),
-                        "article_id": str(article.metadata.article_id),
-                        "edition_id": str(article.metadata.edition_id),
-                        "edition_hash": edition_hash,
-                        "publication_date": pub_date_obj,
-                        "title": getattr(article.metadata, "title", "") or "",
-                        "hierarchy_path": json.dumps(hierarchy),
-                        "identifier": str(
-                            getattr(article.metadata, "identifier", None) or ""
-                        ),
-                        "protocol": str(
-                            getattr(article.metadata, "protocol", None) or ""
-                        ),
-                        "depth": len(hierarchy),
-                        "content_type": (
-                            article.content.content_type.value
-                            if isinstance(article.content.content_type, ContentType)
-                            else str(article.content.content_type)
-                        ),
-                        "content_size": content_meta.get("content_size", 0),
-                        "content_hash": content_meta.get("content_hash"),
-                        "content_path": content_meta.get("content_path"),
-                        "inline_text": inline_text,
-                        "processed_at": datetime.now(),
-                        "batch_id": batch_id,
-                        "year": pub_parts["year"],
-                        "month": pub_parts["month"],
-                        "day": pub_parts["day"],
-                    }
-                )
-
-                relationships_rows.append(
-                    {
-                        "municipality": kwargs.get("municipality", ""),
-                        "edition_id": str(meta.edition_id),
-                        "article_id": str(article.metadata.article_id),
-                        "edition_hash": edition_hash,
-                        "publication_date": meta.publication_date,
-                        "batch_id": batch_id,
-                        "processed_at": datetime.now().isoformat(),
-                    }
-                )
+        pack = PackWriter(self.pack_size) if self.pack_blobs else None
+        batches, index_entries = self._build_batches(
+            editions, batch_id, municipality, pack
+        )
 
         # Persiste usando backend
         stats = {
@@ -252,29 +333,32 @@ class ParquetStorage:
         }
 
         try:
-            # Editions (particionado por year/month)
-            if editions_rows:
-                table = pa.Table.from_pylist(editions_rows, schema=EDITIONS_SCHEMA)
-                path = f"gazettes/batch_{timestamp}.parquet"
-                self.backend.write_parquet(path, table)
-                stats["editions"] = len(editions_rows)
-                logger.info(f"✓ {len(editions_rows)} edições salvas")
-
-            # Articles (particionado por year/month/day)
-            if articles_rows:
-                table = pa.Table.from_pylist(articles_rows, schema=ARTICLES_SCHEMA)
-                path = f"articles/batch_{timestamp}.parquet"
-                self.backend.write_parquet(path, table)
-                stats["articles"] = len(articles_rows)
-                logger.info(f"✓ {len(articles_rows)} artigos salvos")
-
-            # Relationships (sem schema fixo, mais flexível)
-            if relationships_rows:
-                table = pa.Table.from_pylist(relationships_rows)
-                path = f"relationships/batch_{timestamp}.parquet"
-                self.backend.write_parquet(path, table)
-                stats["relationships"] = len(relationships_rows)
-                logger.info(f"✓ {len(relationships_rows)} relações salvas")
+            # Packs antes dos artigos que apontam para eles
+            if pack:
+                self._write_packs(pack)
+
+            for dataset, stat, label in (
+                ("gazettes", "editions", "edições salvas"),
+                ("articles", "articles", "artigos salvos"),
+                ("relationships", "relationships", "relações salvas"),
+            ):
+                batch = batches[dataset]
+                if not batch.num_rows:
+                    continue
+                # Um arquivo por partição do lote
+                levels = PARTITION_LEVELS[self.partition_by]
+                for partition, rows in split_by_partition(batch, levels):
+                    path = self._batch_path(
+                        dataset, timestamp, token, municipality, partition
+                    )
+                    self.backend.write_parquet(path, pa.Table.from_batches([rows]))
+                stats[stat] = batch.num_rows
+                logger.info(f"✓ {batch.num_rows} {label}")
+
+            # Índices (só depois dos blobs e artigos gravados)
+            if index_entries:
+                self._append_index(municipality, index_entries)
+            self._flush_content_index()
 
             return stats
 
@@ -282,6 +366,211 @@ class ParquetStorage:
             logger.error(f"Erro ao salvar: {exc}", exc_info=True)
             raise
 
+    @staticmethod
+    def _split_content(raw_content: str | bytes | None) -> tuple[bytes, str | None]:
+        """
+        Normaliza o conteúdo e decide entre texto inline e blob.
+
+        Returns:
+            Tupla (bytes do conteúdo, texto inline ou None quando vira blob)
+        """
+        if isinstance(raw_content, bytes):
+            try:
+                raw_text = raw_content.decode("utf-8")
+            except Exception:
+                raw_text = None
+            raw_bytes = raw_content
+        else:
+            raw_text = str(raw_content) if raw_content is not None else ""
+            raw_bytes = raw_text.encode("utf-8")
+
+        if raw_text is None or len(raw_text) > CONTENT_INLINE_THRESHOLD:
+            return raw_bytes, None
+        return raw_bytes, raw_text
+
+    @classmethod
+    def is_blob(cls, raw_content: str | bytes) -> bool:
+        """True quando ``save_editions`` grava o conteúdo como blob."""
+        return cls._split_content(raw_content)[1] is None
+
+    def _store_content(
+        self, raw_content: str | bytes, pack: PackWriter | None = None
+    ) -> tuple[dict[str, Any], str | None]:
+        """
+        Grava o conteúdo como blob quando não cabe inline.
+
+        Returns:
+            Tupla (metadados do conteúdo, texto inline ou None)
+        """
+        raw_bytes, inline_text = self._split_content(raw_content)
+        if inline_text is None:
+            return self._write_content_blob(raw_bytes, pack), None
+
+        # O hash do texto inline permite achar esta linha a partir de
+        # referências gravadas em recrawls (ver ``_stored_content_meta``)
+        content_meta = {
+            "content_hash": hashlib.sha256(raw_bytes).hexdigest(),
+            "content_path": None,
+            "content_size": len(raw_bytes),
+        }
+        return content_meta, inline_text
+
+    def _stored_content_meta(self, content_hash: str | None) -> dict[str, Any]:
+        """
+        Metadados de um conteúdo já armazenado, sem lê-lo nem regravá-lo.
+
+        Blobs (soltos ou empacotados) recebem o ``content_path``; conteúdo
+        que foi gravado inline fica só com o ``content_hash``, que leva à
+        linha de ``articles`` com o ``inline_text``.
+        """
+        meta: dict[str, Any] = {
+            "content_hash": content_hash,
+            "content_path": None,
+            "content_size": None,
+        }
+        if content_hash is None:
+            return meta
+
+        path = self._content_path(content_hash)
+        location = self.pack_index().get(content_hash)
+        if location is not None:
+            meta.update(content_path=path, content_size=location.size)
+        elif self._blob_exists(content_hash, path):
+            meta["content_path"] = path
+        return meta
+
+    def _build_batches(
+        self,
+        editions: list[GazetteEdition],
+        batch_id: str,
+        municipality: str,
+        pack: PackWriter | None = None,
+    ) -> tuple[dict[str, pa.RecordBatch], dict[str, str]]:
+        """
+        Monta os lotes Arrow de edições, artigos e relações, coluna a coluna.
+
+        Os valores vão direto para as colunas de um ColumnarBuilder por
+        tabela, sem dicionários por linha: os dados da edição entram uma vez
+        por edição (sequências repetidas nos artigos), o horário de
+        processamento é um só por lote e o JSON de cada ``hierarchy_path``
+        distinto é gerado uma única vez.
+
+        Returns:
+            Tupla (lotes por dataset, entradas do índice de identificadores)
+        """
+        processed_at = datetime.now()
+        constants = {
+            "municipality": municipality,
+            "batch_id": batch_id,
+            "processed_at": processed_at,
+        }
+        edition_runs = (
+            "edition_id",
+            "edition_hash",
+            "publication_date",
+            "year",
+            "month",
+            "day",
+        )
+        gazettes = ColumnarBuilder(EDITIONS_SCHEMA, constants)
+        articles = ColumnarBuilder(ARTICLES_SCHEMA, constants, runs=edition_runs)
+        relationships = ColumnarBuilder(
+            RELATIONSHIPS_SCHEMA,
+            constants,
+            runs=("edition_id", "edition_hash", "publication_date"),
+        )
+        index_entries: dict[str, str] = {}
+        path_json: dict[tuple[str, ...], str] = {}
+
+        g = gazettes.row_columns
+        a = articles.row_columns
+        rel_article_ids = relationships.column("article_id")
+
+        for edition in editions:
+            meta = edition.metadata
+            edition_id = str(meta.edition_id)
+            edition_hash = self._generate_edition_hash(edition)
+            pub_parts = self._publication_date_parts(meta.publication_date)
+            pub_date_obj = datetime.strptime(meta.publication_date, "%Y-%m-%d").date()
+            n_articles = len(edition.articles)
+
+            g["edition_id"].append(edition_id)
+            g["publication_date"].append(pub_date_obj)
+            g["edition_number"].append(int(meta.edition_number))
+            g["supplement"].append(bool(meta.supplement))
+            g["edition_type_id"].append(int(meta.edition_type_id))
+            g["edition_type_name"].append(str(meta.edition_type_name))
+            g["pdf_url"].append(str(meta.pdf_url))
+            g["total_articles"].append(n_articles)
+            g["edition_hash"].append(edition_hash)
+            g["year"].append(pub_parts["year"])
+            g["month"].append(pub_parts["month"])
+            g["day"].append(pub_parts["day"])
+
+            edition_values = {
+                "edition_id": edition_id,
+                "edition_hash": edition_hash,
+                "publication_date": pub_date_obj,
+                **pub_parts,
+            }
+            for name, value in edition_values.items():
+                articles.extend_run(name, value, n_articles)
+            for name in ("edition_id", "edition_hash", "publication_date"):
+                relationships.extend_run(name, edition_values[name], n_articles)
+
+            for article in edition.articles:
+                if article.content.is_stored:
+                    # Conteúdo gravado em execução anterior: só referencia
+                    content_meta = self._stored_content_meta(
+                        article.content.content_hash
+                    )
+                    inline_text = None
+                else:
+                    content_meta, inline_text = self._store_content(
+                        article.content.raw_content, pack
+                    )
+
+                identifier = getattr(article.metadata, "identifier", None)
+                if identifier and content_meta["content_hash"]:
+                    index_entries[str(identifier)] = content_meta["content_hash"]
+
+                hierarchy = tuple(getattr(article.metadata, "hierarchy_path", ()) or ())
+                hierarchy_json = path_json.get(hierarchy)
+                if hierarchy_json is None:
+                    hierarchy_json = path_json[hierarchy] = json.dumps(list(hierarchy))
+
+                content_type = article.content.content_type
+                text = getattr(article.content, "text", None)
+                article_id = str(article.metadata.article_id)
+
+                a["article_id"].append(article_id)
+                a["title"].append(getattr(article.metadata, "title", "") or "")
+                a["hierarchy_path"].append(hierarchy_json)
+                a["identifier"].append(str(identifier or ""))
+                a["protocol"].append(
+                    str(getattr(article.metadata, "protocol", None) or "")
+                )
+                a["depth"].append(len(hierarchy))
+                a["content_type"].append(
+                    content_type.value
+                    if isinstance(content_type, ContentType)
+                    else None if content_type is None else str(content_type)
+                )
+                a["content_size"].append(content_meta.get("content_size", 0))
+                a["content_hash"].append(content_meta.get("content_hash"))
+                a["content_path"].append(content_meta.get("content_path"))
+                a["inline_text"].append(inline_text)
+                a["text"].append(text)
+                a["text_length"].append(None if text is None else len(text))
+                rel_article_ids.append(article_id)
+
+        batches = {
+            "gazettes": gazettes.to_record_batch(),
+            "articles": articles.to_record_batch(),
+            "relationships": relationships.to_record_batch(),
+        }
+        return batches, index_entries
+
     def query_articles(
         self,
         municipality: str | None = None,
@@ -293,6 +582,9 @@ class ParquetStorage:
         """
         Consulta artigos com filtros (requer DuckDB habilitado).
 
+        As partições que não podem conter o município ou as datas pedidas são
+        descartadas pelo path, antes de qualquer arquivo ser aberto.
+
         Example:
             results = storage.query_articles(
                 start_date="2024-01-01",
@@ -304,8 +596,15 @@ class ParquetStorage:
         if not self.enable_duckdb:
             raise RuntimeError("DuckDB não habilitado")
 
-        # Lista arquivos parquet de artigos
-        files = self.backend.list_files("articles", suffix=".parquet")
+        # Lista arquivos parquet de artigos e poda as partições
+        listed = self._live_files("articles")
+        files = prune_files(
+            listed,
+            municipality=municipality,
+            start_date=date.fromisoformat(str(start_date)) if start_date else None,
+            end_date=date.fromisoformat(str(end_date)) if end_date else None,
+        )
+        logger.debug(f"Consulta de artigos: {len(files)} de {len(listed)} arquivos")
 
         if not files:
             logger.warning("Nenhum arquivo de artigos encontrado")
@@ -336,18 +635,728 @@ class ParquetStorage:
             paths = [self.backend.get_uri(f) for f in files]
 
         paths_str = "', '".join(paths)
+        # union_by_name: lotes antigos não têm as colunas de texto extraído;
+        # as colunas de partição já estão nos arquivos, então o Hive fica off
         query = f"""
-            SELECT * FROM read_parquet(['{paths_str}'])
+            SELECT * FROM read_parquet(
+                ['{paths_str}'], union_by_name = true, hive_partitioning = false
+            )
             WHERE {where_sql}
             {limit_sql}
         """
 
-        result = self._duck_conn.execute(query).fetch_arrow_table()
+        result = self._duck_conn.execute(query).to_arrow_table()
         return result
 
+    def _live_files(self, dataset: str) -> list[str]:
+        """
+        Arquivos visíveis do dataset, segundo o manifesto de compactação.
+
+        Arquivos compactados ainda não publicados (``staged``) e lotes já
+        substituídos (``retired``) ficam de fora, e os substituídos só são
+        apagados na compactação seguinte. O manifesto é lido antes e depois
+        da listagem: se a ``generation`` mudou no meio (uma compactação
+        registrou ou publicou arquivos), a listagem pode misturar lotes
+        antigos e arquivos compactados, e é refeita.
+        """
+        state = self.load_state(COMPACTION_STATE)
+        while True:
+            files = self.backend.list_files(dataset, suffix=".parquet")
+            current = self.load_state(COMPACTION_STATE)
+            if current.get("generation") == state.get("generation"):
+                break
+            state = current
+        hidden = set(state.get("staged", [])) | set(state.get("retired", []))
+        return [path for path in files if path not in hidden]
+
+    def compact(
+        self,
+        datasets: list[str] | None = None,
+        target_file_rows: int = TARGET_FILE_ROWS,
+        row_group_size: int = TARGET_ROW_GROUP_ROWS,
+        min_files: int = 2,
+    ) -> dict[str, int]:
+        """
+        Reescreve cada partição com vários lotes em poucos arquivos grandes.
+
+        As linhas são deduplicadas pela chave do dataset (ex.: município e
+        ``article_id``), mantendo o ``processed_at`` mais recente, e ordenadas
+        por (municipality, publication_date, edition_id).
+
+        A troca é atômica para leitores que passam por ``_live_files``: os
+        arquivos novos são registrados como ``staged`` no manifesto antes de
+        gravados, e uma única escrita do manifesto os publica e aposenta os
+        lotes antigos. Os aposentados só são apagados na próxima execução,
+        quando nenhuma leitura que os listou ainda pode estar em andamento.
+        Deve haver um único compactador por storage. Também reagrupa packs
+        pequenos (``compact_packs``), une os segmentos de cada índice
+        (``compact_indexes``) e consolida os deltas dos estados operacionais
+        (``compact_state``).
+
+        Args:
+            datasets: Datasets a compactar (padrão: gazettes, articles e
+                relationships)
+            target_file_rows: Máximo de linhas por arquivo compactado
+            row_group_size: Linhas por row group
+            min_files: Partições (e índices, e packs pequenos) com menos
+                arquivos que isso são mantidas
+
+        Returns:
+            Dict com partições, arquivos, linhas, packs e segmentos de índice
+            antes/depois
+        """
+        self._drop_compaction_leftovers()
+
+        stats = dict.fromkeys(
+            ("partitions", "files_in", "files_out", "rows_in", "rows_out"), 0
+        )
+        for dataset in datasets or list(COMPACTION_DATASETS):
+            partitions: dict[str, list[str]] = {}
+            for path in self._live_files(dataset):
+                partitions.setdefault(path.rsplit("/", 1)[0], []).append(path)
+
+            for directory, files in partitions.items():
+                if len(files) < min_files:
+                    continue
+                tables = [self.backend.read_parquet(path) for path in files]
+                rows_in = sum(t.num_rows for t in tables)
+                table = compact_table(tables, dataset)
+
+                token = uuid.uuid4().hex[:12]
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                chunks = [
+                    table.slice(offset, target_file_rows)
+                    for offset in range(0, max(table.num_rows, 1), target_file_rows)
+                ]
+                new_files = [
+                    f"{directory}/compact_{timestamp}_{token}_{i}.parquet"
+                    for i in range(len(chunks))
+                ]
+
+                self._update_compaction_state(add_staged=new_files)
+                for path, chunk in zip(new_files, chunks):
+                    self.backend.write_parquet(
+                        path, chunk, row_group_size=row_group_size
+                    )
+                # Troca atômica: publica os novos e aposenta os antigos
+                self._update_compaction_state(
+                    remove_staged=new_files, add_retired=files
+                )
+
+                stats["partitions"] += 1
+                stats["files_in"] += len(files)
+                stats["files_out"] += len(new_files)
+                stats["rows_in"] += rows_in
+                stats["rows_out"] += table.num_rows
+                logger.info(
+                    f"✓ {directory}: {len(files)} arquivos → {len(new_files)} "
+                    f"({rows_in} → {table.num_rows} linhas)"
+                )
+
+        stats["packs_in"], stats["packs_out"] = self.compact_packs(min_files)
+        stats["segments_in"], stats["segments_out"] = self.compact_indexes(min_files)
+        self.compact_state()
+        return stats
+
+    def _update_compaction_state(
+        self,
+        add_staged: Iterable[str] = (),
+        remove_staged: Iterable[str] = (),
+        add_retired: Iterable[str] = (),
+        remove_retired: Iterable[str] = (),
+    ) -> None:
+        """
+        Atualiza o manifesto de compactação com uma única escrita.
+
+        Cada escrita incrementa a ``generation``, que ``_live_files`` usa
+        para detectar manifestos alterados durante a listagem.
+        """
+        state = self.load_state(COMPACTION_STATE)
+        staged = set(state.get("staged", [])) - set(remove_staged)
+        retired = set(state.get("retired", [])) - set(remove_retired)
+        self.save_state(
+            COMPACTION_STATE,
+            {
+                "generation": state.get("generation", 0) + 1,
+                "staged": sorted(staged | set(add_staged)),
+                "retired": sorted(retired | set(add_retired)),
+            },
+        )
+
+    def _drop_compaction_leftovers(self) -> None:
+        """
+        Apaga lotes aposentados e arquivos compactados nunca publicados.
+
+        ``staged`` restante vem de uma compactação interrompida; esses
+        arquivos nunca ficaram visíveis.
+        """
+        state = self.load_state(COMPACTION_STATE)
+        leftovers = state.get("retired", []) + state.get("staged", [])
+        if not leftovers:
+            return
+        for path in leftovers:
+            self.backend.delete(path)
+        self._update_compaction_state(
+            remove_staged=state.get("staged", []),
+            remove_retired=state.get("retired", []),
+        )
+        logger.info(f"✓ {len(leftovers)} arquivos substituídos removidos")
+
+    def _read_state(self, path: str) -> dict[str, Any] | None:
+        """Lê um documento de estado (None se ausente ou ilegível)."""
+        try:
+            if not self.backend.exists(path):
+                return None
+            return json.loads(self.backend.read_bytes(path))
+        except Exception as e:
+            logger.warning(f"Estado ilegível, ignorando {path}: {e}")
+            return None
+
+    def _state_deltas(self, name: str) -> list[str]:
+        """Deltas de um estado, do mais antigo ao mais novo."""
+        # Barra final: "checkpoint_a/" não pode casar com "checkpoint_ab/"
+        return self.backend.list_files(f"{STATE_DIRNAME}/{name}/", ".json")
+
+    def load_state(self, name: str) -> dict[str, Any]:
+        """
+        Lê um documento de estado operacional (JSON) salvo pelo crawler.
+
+        O documento base (``_state/<name>.json``) é mesclado com os deltas
+        gravados por ``append_state`` (``_state/<name>/delta_*.json``), na
+        ordem em que foram gravados (ver ``merge_state``).
+
+        Returns:
+            Dicionário com o estado, ou vazio se ainda não existir.
+        """
+        documents = [self._read_state(f"{STATE_DIRNAME}/{name}.json")]
+        documents.extend(self._read_state(path) for path in self._state_deltas(name))
+        return merge_state(d for d in documents if d is not None)
+
+    def save_state(self, name: str, state: dict[str, Any]) -> None:
+        """
+        Substitui o documento base de um estado operacional (JSON).
+
+        É uma escrita sem controle de concorrência: só para estados com um
+        único escritor (ex.: o manifesto de compactação). Estados
+        compartilhados entre workers usam ``append_state``.
+        """
+        path = f"{STATE_DIRNAME}/{name}.json"
+        self.backend.write_bytes(
+            path, json.dumps(state, indent=2, sort_keys=True).encode("utf-8")
+        )
+
+    def append_state(self, name: str, delta: dict[str, Any]) -> None:
+        """
+        Grava as novas observações de um estado como um delta imutável.
+
+        Vários workers podem gravar o mesmo estado ao mesmo tempo sem
+        leitura-modificação-escrita: cada um grava apenas o que observou, e
+        ``load_state`` mescla tudo. Os deltas são consolidados no documento
+        base por ``compact_state``.
+        """
+        path = f"{STATE_DIRNAME}/{name}/{delta_name()}"
+        self.backend.write_bytes(
+            path, json.dumps(delta, indent=2, sort_keys=True).encode("utf-8")
+        )
+
+    def compact_state(self) -> int:
+        """
+        Consolida os deltas de cada estado no seu documento base.
+
+        Só os deltas lidos são apagados, e só depois da gravação da base;
+        deltas gravados entretanto ficam para a próxima consolidação. Como a
+        base é reescrita, deve haver um único compactador por storage.
+
+        Returns:
+            Número de deltas consolidados
+        """
+        names = {
+            path.split("/")[1]
+            for path in self.backend.list_files(f"{STATE_DIRNAME}/", ".json")
+            if path.count("/") == 2
+        }
+        merged = 0
+        for name in sorted(names):
+            documents = []
+            base = self._read_state(f"{STATE_DIRNAME}/{name}.json")
+            if base is not None:
+                documents.append(base)
+            paths = []
+            for path in self._state_deltas(name):
+                delta = self._read_state(path)
+                if delta is not None:
+                    documents.append(delta)
+                    paths.append(path)
+            if not paths:
+                continue
+
+            self.save_state(name, merge_state(documents))
+            for path in paths:
+                self.backend.delete(path)
+            merged += len(paths)
+            logger.info(f"✓ Estado '{name}': {len(paths)} deltas consolidados")
+        return merged
+
+    def identifier_index(self, municipality: str) -> IdentifierIndex:
+        """
+        Índice ``identifier -> content_hash`` dos artigos já armazenados.
+
+        Os segmentos são lidos na primeira chamada e o índice fica em memória,
+        sendo atualizado por ``save_editions``.
+        """
+        index = self._indexes.get(municipality)
+        if index is not None:
+            return index
+
+        with self._load_lock:
+            if municipality in self._indexes:
+                return self._indexes[municipality]
+            index, n_segments = self._load_index(f"{INDEX_DIRNAME}/{municipality}")
+            self._indexes[municipality] = index
+        logger.info(
+            f"Índice de identificadores de {municipality or 'N/A'}: "
+            f"{len(index)} artigos em {n_segments} segmentos"
+        )
+        return index
+
+    def _read_segments(self, prefix: str) -> list[pa.Table]:
+        """Lê os segmentos de um índice, ignorando os ilegíveis."""
+        tables = []
+        for path in self.backend.list_files(prefix, ".parquet"):
+            try:
+                tables.append(self.backend.read_parquet(path))
+            except Exception as e:
+                logger.warning(f"Segmento de índice ilegível, ignorando {path}: {e}")
+        return tables
+
+    def _load_index(self, prefix: str) -> tuple[IdentifierIndex, int]:
+        """Carrega um índice de identificadores a partir dos segmentos."""
+        tables = self._read_segments(prefix)
+        return IdentifierIndex.from_tables(tables), len(tables)
+
+    @staticmethod
+    def _segment_path(prefix: str) -> str:
+        """Path de um novo segmento de índice."""
+        # Microssegundos no nome: segmentos ordenados do mais antigo ao mais novo
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        return f"{prefix}/segment_{timestamp}_{uuid.uuid4().hex[:8]}.parquet"
+
+    @staticmethod
+    def _merged_segment_path(newest: str) -> str:
+        """
+        Path do segmento que une outros, com ``newest`` o mais novo deles.
+
+        Fica logo depois de ``newest`` na ordem dos nomes ("~" vem depois de
+        qualquer dígito hexadecimal), e portanto antes de segmentos gravados
+        por outros processos enquanto a união acontecia, que continuam
+        prevalecendo sobre ele.
+        """
+        directory, name = newest.rsplit("/", 1)
+        prefix = name[:SEGMENT_TIMESTAMP_END]
+        return f"{directory}/{prefix}_~{uuid.uuid4().hex[:8]}.parquet"
+
+    def _merge_segments(
+        self,
+        prefix: str,
+        merge: Callable[[list[pa.Table]], pa.Table],
+        min_segments: int = 2,
+    ) -> tuple[int, int]:
+        """
+        Une os segmentos de um índice em um único segmento.
+
+        O segmento unido é gravado antes da remoção dos originais, e só os
+        segmentos lidos são removidos. Uma queda no meio deixa entradas
+        duplicadas, o que é inofensivo.
+
+        Args:
+            prefix: Diretório dos segmentos
+            merge: Monta o segmento unido a partir dos segmentos, em ordem
+            min_segments: Índices com menos segmentos que isso são mantidos
+
+        Returns:
+            Segmentos antes e depois
+        """
+        # Barra final: "_index/a/" não pode casar com "_index/ab/"
+        paths = self.backend.list_files(f"{prefix}/", ".parquet")
+        if len(paths) < min_segments:
+            return 0, 0
+
+        tables, read = [], []
+        for path in paths:
+            try:
+                tables.append(self.backend.read_parquet(path))
+                read.append(path)
+            except Exception as e:
+                logger.warning(f"Segmento de índice ilegível, mantendo {path}: {e}")
+        if len(read) < min_segments:
+            return 0, 0
+
+        self.backend.write_parquet(self._merged_segment_path(read[-1]), merge(tables))
+        for path in read:
+            self.backend.delete(path)
+        logger.info(f"✓ {prefix}: {len(read)} segmentos → 1")
+        return len(read), 1
+
+    def compact_indexes(self, min_segments: int = 2) -> tuple[int, int]:
+        """
+        Une os segmentos de cada índice (identificadores, PDFs, conteúdo e
+        packs), que crescem um por lote gravado.
+
+        Leitores que listaram os segmentos antes da união podem não achar
+        alguns deles; o efeito é o mesmo de um índice desatualizado (um
+        download ou envio repetido), nunca um dado errado.
+
+        Returns:
+            Segmentos antes e depois
+        """
+
+        def merge_identifiers(tables: list[pa.Table]) -> pa.Table:
+            index = IdentifierIndex.from_tables(tables)
+            return IdentifierIndex.to_table(dict(index.items()))
+
+        def merge_content(tables: list[pa.Table]) -> pa.Table:
+            hashes = {h for t in tables for h in t.column("content_hash").to_pylist()}
+            return ContentHashIndex.to_table(hashes)
+
+        def merge_packs(tables: list[pa.Table]) -> pa.Table:
+            return PackIndex.to_table(dict(PackIndex.from_tables(tables).items()))
+
+        prefixes = {
+            path.rsplit("/", 1)[0]: merge_identifiers
+            for path in self.backend.list_files(f"{INDEX_DIRNAME}/", ".parquet")
+        }
+        prefixes[PDF_INDEX_DIRNAME] = merge_identifiers
+        prefixes[CONTENT_INDEX_DIRNAME] = merge_content
+        prefixes[PACK_INDEX_DIRNAME] = merge_packs
+
+        segments_in = segments_out = 0
+        for prefix, merge in prefixes.items():
+            n_in, n_out = self._merge_segments(prefix, merge, min_segments)
+            segments_in += n_in
+            segments_out += n_out
+        return segments_in, segments_out
+
+    def _write_index_segment(
+        self, prefix: str, index: IdentifierIndex, entries: dict[str, str]
+    ) -> int:
+        """Grava um novo segmento com as entradas ainda não indexadas."""
+        new_entries = index.new_entries(entries)
+        if not new_entries:
+            return 0
+
+        path = self._segment_path(prefix)
+        self.backend.write_parquet(path, IdentifierIndex.to_table(new_entries))
+        index.update(new_entries)
+        return len(new_entries)
+
+    def _append_index(self, municipality: str, entries: dict[str, str]) -> None:
+        """Grava um novo segmento com as entradas ainda não indexadas."""
+        added = self._write_index_segment(
+            f"{INDEX_DIRNAME}/{municipality}",
+            self.identifier_index(municipality),
+            entries,
+        )
+        if added:
+            logger.debug(f"✓ {added} identificadores indexados")
+
+    def content_index(self) -> ContentHashIndex:
+        """
+        Índice dos ``content_hash`` com blob gravado em ``content/``.
+
+        Os segmentos são lidos na primeira chamada; blobs novos entram no
+        filtro em memória na hora e vão para um segmento ao fim de cada
+        ``save_editions``/``save_pdf_pages``. Sem nenhum segmento (storage
+        novo ou anterior ao índice), o índice é reconstruído uma vez a partir
+        da listagem, para que blobs antigos não sejam reenviados.
+        """
+        if self._content_index is not None:
+            return self._content_index
+
+        with self._load_lock:
+            if self._content_index is None:
+                tables = self._read_segments(CONTENT_INDEX_DIRNAME)
+                if not tables:
+                    self.rebuild_content_index()
+                    return self._content_index
+                self._content_index = ContentHashIndex.from_tables(tables)
+                logger.info(
+                    f"Índice de conteúdo: {len(self._content_index)} blobs em "
+                    f"{len(tables)} segmentos"
+                )
+        return self._content_index
+
+    def _flush_content_index(self) -> None:
+        """Grava um segmento ordenado com os blobs ainda não persistidos."""
+        if self._content_index is None:
+            return
+        hashes = self._content_index.take_pending()
+        if not hashes:
+            return
+        path = self._segment_path(CONTENT_INDEX_DIRNAME)
+        self.backend.write_parquet(path, ContentHashIndex.to_table(hashes))
+        logger.debug(f"✓ {len(hashes)} blobs indexados")
+
+    def rebuild_content_index(self) -> int:
+        """
+        Recria o índice de conteúdo a partir da listagem de ``content/``.
+
+        Grava um único segmento ordenado e só então remove os segmentos
+        anteriores; segmentos gravados por outros processos durante a
+        reconstrução são preservados.
+
+        Returns:
+            Número de blobs indexados
+        """
+        old_segments = self.backend.list_files(CONTENT_INDEX_DIRNAME, ".parquet")
+        hashes = list(self._loose_blobs())
+
+        index = ContentHashIndex(hashes)
+        path = self._segment_path(CONTENT_INDEX_DIRNAME)
+        self.backend.write_parquet(path, ContentHashIndex.to_table(hashes))
+        for old in old_segments:
+            self.backend.delete(old)
+
+        self._content_index = index
+        logger.info(
+            f"Índice de conteúdo reconstruído: {len(hashes)} blobs "
+            f"({len(old_segments)} segmentos substituídos)"
+        )
+        return len(hashes)
+
+    def pdf_index(self) -> IdentifierIndex:
+        """
+        Índice dos PDFs cujo texto já foi extraído.
+
+        As chaves são o ``content_hash`` do PDF e, para PDFs de edição, também
+        a URL baixada; o valor é sempre o ``content_hash``. Compartilhado
+        entre municípios: um mesmo PDF nunca é extraído duas vezes.
+        """
+        if self._pdf_index is not None:
+            return self._pdf_index
+
+        with self._load_lock:
+            if self._pdf_index is None:
+                self._pdf_index, n_segments = self._load_index(PDF_INDEX_DIRNAME)
+                logger.info(
+                    f"Índice de PDFs: {len(self._pdf_index)} entradas em "
+                    f"{n_segments} segmentos"
+                )
+        return self._pdf_index
+
+    def save_pdf_pages(
+        self,
+        rows: list[dict[str, Any]],
+        entries: dict[str, str],
+        municipality: str = "",
+    ) -> int:
+        """
+        Persiste o texto das páginas de PDFs e marca os PDFs como extraídos.
+
+        O índice só é atualizado depois que as páginas foram gravadas.
+
+        Args:
+            rows: Linhas no formato de PDF_PAGES_SCHEMA
+            entries: Entradas do índice de PDFs (chave -> content_hash)
+            municipality: Município (nome do arquivo do lote)
+
+        Returns:
+            Número de páginas gravadas
+        """
+        if rows:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            token = uuid.uuid4().hex[:12]
+            table = pa.Table.from_pylist(rows, schema=PDF_PAGES_SCHEMA)
+            path = self._batch_path(PDF_PAGES_DIRNAME, timestamp, token, municipality)
+            self.backend.write_parquet(path, table)
+            logger.info(f"✓ {len(rows)} páginas de PDF salvas")
+
+        self._flush_content_index()
+        self._write_index_segment(PDF_INDEX_DIRNAME, self.pdf_index(), entries)
+        return len(rows)
+
     def get_content(self, content_path: str) -> bytes:
-        """Recupera conteúdo de blob externo."""
-        return self.backend.read_bytes(content_path)
+        """
+        Recupera conteúdo de blob externo.
+
+        Blobs empacotados são lidos com uma única leitura de intervalo no
+        pack; os demais, direto de ``content_path``.
+        """
+        content_hash = Path(content_path).stem
+        location = self.pack_index().get(content_hash)
+        if location is None:
+            try:
+                return self.backend.read_bytes(content_path)
+            except Exception:
+                # Pode ter sido empacotado por outro processo depois da carga
+                self._pack_index = None
+                location = self.pack_index().get(content_hash)
+                if location is None:
+                    raise
+        try:
+            frame = self.backend.read_range(
+                location.pack, location.offset, location.length
+            )
+        except Exception:
+            # O pack pode ter sido reagrupado pela compactação depois da carga
+            self._pack_index = None
+            current = self.pack_index().get(content_hash)
+            if current is None or current == location:
+                raise
+            location = current
+            frame = self.backend.read_range(
+                location.pack, location.offset, location.length
+            )
+        return decompress_frame(frame, location.size)
+
+    def get_blob(self, content_hash: str) -> bytes:
+        """Recupera um blob (solto ou empacotado) pelo hash do conteúdo."""
+        return self.get_content(self._content_path(content_hash))
+
+    def pack_index(self) -> PackIndex:
+        """
+        Índice ``content_hash -> (pack, offset, length)`` dos blobs empacotados.
+
+        Os segmentos são lidos na primeira chamada; o índice fica em memória e
+        é atualizado a cada pack gravado.
+        """
+        index = self._pack_index
+        if index is not None:
+            return index
+
+        with self._load_lock:
+            if self._pack_index is None:
+                tables = self._read_segments(PACK_INDEX_DIRNAME)
+                self._pack_index = PackIndex.from_tables(tables)
+                if tables:
+                    logger.info(
+                        f"Índice de packs: {len(self._pack_index)} blobs em "
+                        f"{len(self._pack_index.packs())} packs"
+                    )
+            return self._pack_index
+
+    def _write_packs(self, pack: PackWriter) -> int:
+        """
+        Grava os packs de um PackWriter e só então seus segmentos de índice.
+
+        Returns:
+            Número de packs gravados
+        """
+        index = self.pack_index()
+        written = 0
+        for path, data, entries in pack.packs():
+            self.backend.write_bytes(path, data)
+            self.backend.write_parquet(
+                self._segment_path(PACK_INDEX_DIRNAME), PackIndex.to_table(entries)
+            )
+            index.update(entries)
+            logger.debug(f"✓ Pack {path}: {len(entries)} blobs, {len(data)} bytes")
+            written += 1
+        return written
+
+    def compact_packs(self, min_packs: int = 2) -> tuple[int, int]:
+        """
+        Reagrupa packs pequenos (menos da metade de ``pack_size``) em packs
+        do tamanho alvo.
+
+        Cada ``save_editions`` fecha o seu pack, então crawlings com lotes
+        pequenos deixam muitos packs pequenos. Os frames são copiados sem
+        recompressão e só os blobs ainda indexados são copiados. O índice
+        dos packs novos é gravado antes de os antigos serem aposentados no
+        manifesto de compactação; os aposentados são apagados na próxima
+        compactação, como os lotes de dados.
+
+        Returns:
+            Packs antes e depois
+        """
+        # Recarrega o índice: inclui packs gravados por outros processos
+        with self._load_lock:
+            self._pack_index = None
+        by_pack: dict[str, dict[str, PackLocation]] = {}
+        for content_hash, location in self.pack_index().items():
+            by_pack.setdefault(location.pack, {})[content_hash] = location
+
+        small = sorted(
+            path
+            for path, entries in by_pack.items()
+            if sum(loc.length for loc in entries.values()) < self.pack_size // 2
+        )
+        if len(small) < min_packs:
+            return 0, 0
+
+        packs_out = 0
+        pack = PackWriter(self.pack_size)
+        for path in small:
+            data = self.backend.read_bytes(path)
+            for content_hash, loc in by_pack[path].items():
+                frame = data[loc.offset : loc.offset + loc.length]
+                pack.add_frame(content_hash, frame, loc.size)
+            if pack.nbytes >= self.pack_size:
+                packs_out += self._write_packs(pack)
+                pack = PackWriter(self.pack_size)
+        if len(pack):
+            packs_out += self._write_packs(pack)
+
+        self._update_compaction_state(add_retired=small)
+        logger.info(f"✓ Packs: {len(small)} pequenos → {packs_out}")
+        return len(small), packs_out
+
+    def _loose_blobs(self) -> dict[str, str]:
+        """Blobs soltos em ``content/`` (``content_hash -> path``)."""
+        blobs = {}
+        for path in self.backend.list_files(CONTENT_DIRNAME, ".bin"):
+            stem = Path(path).stem
+            # Só blobs endereçados por SHA-256 (ignora arquivos estranhos)
+            if len(stem) == 64 and not stem.strip(string.hexdigits):
+                blobs[stem] = path
+        return blobs
+
+    def migrate_blobs_to_packs(self, delete_loose: bool = False) -> int:
+        """
+        Move blobs soltos de ``content/`` para packfiles.
+
+        Os artigos não mudam: seus ``content_path`` continuam sendo resolvidos
+        por ``get_content`` através do índice de packs. Com ``delete_loose``,
+        cada blob solto só é removido depois que o pack e o segmento de índice
+        que o contêm foram gravados.
+
+        Returns:
+            Número de blobs empacotados
+        """
+        index = self.pack_index()
+        pending = {
+            content_hash: path
+            for content_hash, path in self._loose_blobs().items()
+            if content_hash not in index
+        }
+        logger.info(f"Empacotando {len(pending)} blobs soltos")
+
+        migrated = 0
+        pack = PackWriter(self.pack_size)
+        paths: list[str] = []
+
+        def flush() -> None:
+            nonlocal pack, paths, migrated
+            self._write_packs(pack)
+            migrated += len(pack)
+            if delete_loose:
+                for path in paths:
+                    self.backend.delete(path)
+                    self.backend.delete(f"{path}.meta.json")
+            pack, paths = PackWriter(self.pack_size), []
+
+        for content_hash, path in pending.items():
+            pack.add(content_hash, self.backend.read_bytes(path))
+            paths.append(path)
+            if pack.nbytes >= self.pack_size:
+                flush()
+        if len(pack):
+            flush()
+
+        if delete_loose and migrated:
+            # Os blobs removidos ainda constam do filtro de conteúdo
+            self.rebuild_content_index()
+        logger.info(f"✓ {migrated} blobs empacotados")
+        return migrated
 
     def get_stats(self) -> dict[str, Any]:
         """Retorna estatísticas do storage."""
@@ -356,5 +1365,6 @@ class ParquetStorage:
             "editions_files": len(self.backend.list_files("gazettes", ".parquet")),
             "articles_files": len(self.backend.list_files("articles", ".parquet")),
             "content_files": len(self.backend.list_files(CONTENT_DIRNAME)),
+            "pack_files": len(self.backend.list_files(PACKS_DIRNAME, ".pack")),
         }
         return stats
@@ -0,0 +1,106 @@
+"""Particionamento Hive (``chave=valor``) dos datasets e poda por filtros."""
+
+import calendar
+from datetime import date
+from typing import Iterator
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Colunas de partição por nível de ``partition_by``
+PARTITION_LEVELS: dict[str, tuple[str, ...]] = {
+    "year": ("year",),
+    "month": ("year", "month"),
+    "day": ("year", "month", "day"),
+}
+
+# Valor de partição para município vazio (convenção Hive para nulo)
+DEFAULT_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+def partition_dir(dataset: str, municipality: str, key: dict[str, int]) -> str:
+    """Diretório da partição: ``dataset/municipality=../year=../month=..``."""
+    parts = [f"municipality={municipality or DEFAULT_PARTITION}"]
+    parts.extend(f"{name}={value}" for name, value in key.items())
+    return "/".join([dataset, *parts])
+
+
+def split_by_partition(
+    batch: pa.RecordBatch, levels: tuple[str, ...]
+) -> Iterator[tuple[dict[str, int], pa.RecordBatch]]:
+    """
+    Separa as linhas do lote por partição, na ordem em que aparecem.
+
+    Usa as colunas ``year``/``month``/``day`` do lote ou, se não existirem
+    (relações), as deriva de ``publication_date``.
+    """
+    if "year" in batch.schema.names:
+        columns = [batch.column(name) for name in levels]
+    else:
+        dates = batch.column("publication_date")
+        derive = {"year": pc.year, "month": pc.month, "day": pc.day}
+        columns = [derive[name](dates) for name in levels]
+
+    groups: dict[tuple[int, ...], list[int]] = {}
+    for i, key in enumerate(zip(*(c.to_pylist() for c in columns))):
+        groups.setdefault(key, []).append(i)
+
+    if len(groups) == 1:
+        (key,) = groups
+        yield dict(zip(levels, key)), batch
+        return
+    for key, indices in groups.items():
+        yield dict(zip(levels, key)), batch.take(pa.array(indices, pa.int32()))
+
+
+def parse_partition(path: str) -> dict[str, str]:
+    """Valores de partição (``chave=valor``) presentes no path."""
+    values = {}
+    for segment in path.split("/")[:-1]:
+        name, sep, value = segment.partition("=")
+        if sep:
+            values[name] = value
+    return values
+
+
+def partition_date_range(values: dict[str, str]) -> tuple[date, date] | None:
+    """Primeiro e último dia cobertos pela partição (None sem ``year``)."""
+    try:
+        year = int(values["year"])
+    except (KeyError, ValueError):
+        return None
+    if "month" not in values:
+        return date(year, 1, 1), date(year, 12, 31)
+    month = int(values["month"])
+    if "day" not in values:
+        return date(year, month, 1), date(
+            year, month, calendar.monthrange(year, month)[1]
+        )
+    day = date(year, month, int(values["day"]))
+    return day, day
+
+
+def prune_files(
+    files: list[str],
+    municipality: str | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> list[str]:
+    """
+    Mantém só os arquivos cujas partições podem satisfazer os filtros.
+
+    Decide apenas pelo path, sem abrir nenhum arquivo. Arquivos sem a
+    partição correspondente (layout plano anterior) são sempre mantidos.
+    """
+    kept = []
+    for path in files:
+        values = parse_partition(path)
+        if municipality and values.get("municipality", municipality) != municipality:
+            continue
+        bounds = partition_date_range(values)
+        if bounds is not None:
+            first, last = bounds
+            if (start_date and last < start_date) or (end_date and first > end_date):
+                continue
+        kept.append(path)
+    return kept
@@ -0,0 +1,33 @@
+"""Documentos de estado operacional: base consolidada mais deltas imutáveis."""
+
+import uuid
+from datetime import datetime
+from typing import Any, Iterable
+
+
+def delta_name() -> str:
+    """Nome de um novo delta de estado (ordenado do mais antigo ao mais novo)."""
+    # Microssegundos no nome, como nos segmentos de índice
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    return f"delta_{timestamp}_{uuid.uuid4().hex[:8]}.json"
+
+
+def merge_state(documents: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Mescla documentos de estado na ordem em que foram gravados.
+
+    Listas (conjuntos de datas, edições etc.) são unidas e ordenadas; dicts
+    são atualizados chave a chave e os demais valores são substituídos, de
+    modo que o documento mais recente prevalece.
+    """
+    merged: dict[str, Any] = {}
+    for document in documents:
+        for key, value in document.items():
+            current = merged.get(key)
+            if isinstance(value, list) and isinstance(current, list):
+                merged[key] = sorted(set(current) | set(value))
+            elif isinstance(value, dict) and isinstance(current, dict):
+                merged[key] = {**current, **value}
+            else:
+                merged[key] = value
+    return merged
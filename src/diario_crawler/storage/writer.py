@@ -0,0 +1,151 @@
+"""Escritor assíncrono compartilhado para o storage."""
+
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable
+
+from diario_crawler.utils import get_logger, metrics
+
+logger = get_logger(__name__)
+
+
+class StorageWriter:
+    """
+    Centraliza as escritas de vários crawlers em uma fila limitada.
+
+    Cada ``submit`` enfileira uma chamada bloqueante (ex.: ``save_editions``)
+    e devolve um Future com o resultado. A fila é limitada: quando o storage
+    não acompanha, ``submit`` aguarda, segurando os crawlers e mantendo
+    limitado o número de lotes em memória no processo. Até ``max_concurrent``
+    escritas independentes rodam ao mesmo tempo no executor; cada chamada
+    enfileirada (ex.: ``save_editions`` seguido do commit do checkpoint) roda
+    inteira em uma única thread, preservando a ordem interna do lote.
+
+    Métricas publicadas (rótulo ``writer``):
+        storage_write_seconds: latência de cada escrita
+        storage_write_queue_depth: escritas aguardando na fila
+        storage_write_backpressure_seconds: espera de ``submit`` com a fila
+            cheia
+        storage_writes: escritas concluídas, por ``outcome`` (ok/error)
+
+    Uso:
+        writer = StorageWriter(max_pending=4, max_concurrent=2)
+        future = await writer.submit(storage.save_editions, editions)
+        await future
+        await writer.aclose()
+    """
+
+    def __init__(
+        self,
+        max_pending: int = 4,
+        executor: Executor | None = None,
+        name: str = "shared",
+        max_concurrent: int = 1,
+    ):
+        """
+        Args:
+            max_pending: Escritas aguardando na fila antes de bloquear ``submit``
+            executor: Pool onde as escritas rodam (None = executor padrão do loop)
+            name: Rótulo das métricas do escritor
+            max_concurrent: Escritas executadas ao mesmo tempo (1 = em série)
+        """
+        if max_concurrent <= 0:
+            raise ValueError(f"max_concurrent deve ser positivo: {max_concurrent}")
+        self.max_pending = max_pending
+        self.max_concurrent = max_concurrent
+        self.executor = executor
+        self.name = name
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    def __repr__(self) -> str:
+        pending = self._queue.qsize() if self._queue is not None else 0
+        return (
+            f"<StorageWriter pending={pending}/{self.max_pending} "
+            f"concurrent={self.max_concurrent}>"
+        )
+
+    def _ensure_started(self) -> asyncio.Queue:
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._task = asyncio.create_task(self._run())
+        return self._queue
+
+    async def submit(self, fn: Callable[..., Any], *args: Any) -> asyncio.Future:
+        """
+        Enfileira ``fn(*args)`` para execução no pool de escrita.
+
+        Returns:
+            Future resolvido com o retorno (ou a exceção) da chamada
+        """
+        queue = self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+
+        if queue.full():
+            # Backpressure: o storage não acompanha o crawling
+            started = time.perf_counter()
+            await queue.put((fn, args, future))
+            waited = time.perf_counter() - started
+            metrics.observe(
+                "storage_write_backpressure_seconds", waited, writer=self.name
+            )
+            logger.debug(f"Escrita aguardou {waited:.2f}s por espaço na fila")
+        else:
+            queue.put_nowait((fn, args, future))
+
+        self._report_depth()
+        return future
+
+    def _report_depth(self) -> None:
+        metrics.set_gauge(
+            "storage_write_queue_depth", self._queue.qsize(), writer=self.name
+        )
+
+    async def _run(self) -> None:
+        slots = asyncio.Semaphore(self.max_concurrent)
+        running: set[asyncio.Task] = set()
+        while True:
+            # Só retira o próximo item quando há thread livre, para que a
+            # fila (e o backpressure de submit) continue refletindo o atraso
+            await slots.acquire()
+            if (item := await self._queue.get()) is None:
+                break
+            self._report_depth()
+            task = asyncio.create_task(self._write(*item))
+            running.add(task)
+            task.add_done_callback(running.discard)
+            task.add_done_callback(lambda _: slots.release())
+        await asyncio.gather(*running)
+
+    async def _write(
+        self, fn: Callable[..., Any], args: tuple, future: asyncio.Future
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            result = await loop.run_in_executor(self.executor, fn, *args)
+        except Exception as e:
+            logger.error(f"Erro na escrita do storage: {e}")
+            metrics.inc("storage_writes", outcome="error", writer=self.name)
+            if not future.cancelled():
+                future.set_exception(e)
+        else:
+            metrics.inc("storage_writes", outcome="ok", writer=self.name)
+            if not future.cancelled():
+                future.set_result(result)
+        finally:
+            metrics.observe(
+                "storage_write_seconds",
+                time.perf_counter() - started,
+                writer=self.name,
+            )
+
+    async def aclose(self) -> None:
+        """Conclui as escritas pendentes e encerra o laço de escrita."""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        self._queue = None
@@ -1,6 +1,7 @@
-"""Módulo de utilitários para datas e logging."""
+"""Módulo de utilitários para datas, logging e métricas."""
 
 from .dates import get_workdays
 from .logging import get_logger, setup_logging
+from .metrics import MetricsRegistry, metrics
 
-__all__ = ["get_workdays", "setup_logging", "get_logger"]
+__all__ = ["get_workdays", "setup_logging", "get_logger", "MetricsRegistry", "metrics"]
@@ -0,0 +1,70 @@
+"""Feriados nacionais e estaduais brasileiros."""
+
+from datetime import date, timedelta
+
+from dateutil.easter import easter
+
+# Feriados nacionais de data fixa (mês, dia)
+NATIONAL_FIXED_HOLIDAYS = [
+    (1, 1),  # Confraternização Universal
+    (4, 21),  # Tiradentes
+    (5, 1),  # Dia do Trabalho
+    (9, 7),  # Independência
+    (10, 12),  # Nossa Senhora Aparecida
+    (11, 2),  # Finados
+    (11, 15),  # Proclamação da República
+    (12, 25),  # Natal
+]
+
+# Dia Nacional de Zumbi e da Consciência Negra (Lei 14.759/2023)
+CONSCIOUSNESS_DAY_SINCE = 2024
+
+# Feriados estaduais de data fixa por UF (mês, dia)
+STATE_FIXED_HOLIDAYS: dict[str, list[tuple[int, int]]] = {
+    "SP": [(7, 9)],  # Revolução Constitucionalista
+    "RJ": [(4, 23), (11, 20)],  # São Jorge; Zumbi dos Palmares
+    "MS": [(10, 11)],  # Criação do Estado
+    "RO": [(1, 4), (6, 18)],  # Criação do Estado; Dia do Evangélico
+}
+
+
+def national_holidays(year: int) -> set[date]:
+    """
+    Feriados nacionais do ano (fixos e Sexta-feira Santa).
+
+    Pontos facultativos (Carnaval, Corpus Christi) não entram: vários
+    diários publicam nesses dias.
+    """
+    holidays = {date(year, month, day) for month, day in NATIONAL_FIXED_HOLIDAYS}
+    holidays.add(easter(year) - timedelta(days=2))
+    if year >= CONSCIOUSNESS_DAY_SINCE:
+        holidays.add(date(year, 11, 20))
+    return holidays
+
+
+def state_holidays(state: str | None, year: int) -> set[date]:
+    """Feriados estaduais do ano para a UF (vazio se UF desconhecida)."""
+    if not state:
+        return set()
+    return {
+        date(year, month, day)
+        for month, day in STATE_FIXED_HOLIDAYS.get(state.upper(), [])
+    }
+
+
+def get_holidays(start: date, end: date, state: str | None = None) -> set[date]:
+    """
+    Feriados nacionais e estaduais no intervalo [start, end].
+
+    Args:
+        start: Data inicial
+        end: Data final
+        state: Sigla da UF (ex.: "SP") para incluir feriados estaduais
+
+    Returns:
+        Conjunto de datas de feriado no intervalo
+    """
+    holidays: set[date] = set()
+    for year in range(start.year, end.year + 1):
+        holidays |= national_holidays(year) | state_holidays(state, year)
+    return {d for d in holidays if start <= d <= end}
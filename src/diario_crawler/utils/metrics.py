@@ -0,0 +1,74 @@
+"""Registro simples de métricas em memória (gauges, contadores e tempos)."""
+
+from threading import Lock
+from typing import Any
+
+
+def _metric_key(name: str, labels: dict[str, Any]) -> str:
+    """Monta a chave no formato ``nome{label=valor,...}``."""
+    if not labels:
+        return name
+    rendered = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+    return f"{name}{{{rendered}}}"
+
+
+class MetricsRegistry:
+    """
+    Registro de métricas do processo.
+
+    Mantém apenas o último valor de gauges, o acumulado de contadores e
+    count/sum/max de observações (latências, tamanhos de fila etc.).
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._gauges: dict[str, float] = {}
+        self._counters: dict[str, float] = {}
+        self._observations: dict[str, dict[str, float]] = {}
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Define o valor atual de um gauge."""
+        with self._lock:
+            self._gauges[_metric_key(name, labels)] = value
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Incrementa um contador."""
+        key = _metric_key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Registra uma observação (count, sum e max)."""
+        key = _metric_key(name, labels)
+        with self._lock:
+            obs = self._observations.setdefault(
+                key, {"count": 0, "sum": 0.0, "max": 0.0}
+            )
+            obs["count"] += 1
+            obs["sum"] += value
+            obs["max"] = max(obs["max"], value)
+
+    def get_gauge(self, name: str, **labels: Any) -> float | None:
+        """Retorna o valor atual de um gauge (ou None)."""
+        with self._lock:
+            return self._gauges.get(_metric_key(name, labels))
+
+    def snapshot(self) -> dict[str, Any]:
+        """Retorna uma cópia de todas as métricas registradas."""
+        with self._lock:
+            return {
+                "gauges": dict(self._gauges),
+                "counters": dict(self._counters),
+                "observations": {k: dict(v) for k, v in self._observations.items()},
+            }
+
+    def reset(self) -> None:
+        """Descarta todas as métricas."""
+        with self._lock:
+            self._gauges.clear()
+            self._counters.clear()
+            self._observations.clear()
+
+
+# Registro global do processo
+metrics = MetricsRegistry()
@@ -17,6 +17,7 @@ from diario_crawler.crawler_configs.rj_rio_de_janeiro import RjRioDeJaneiro
 from diario_crawler.crawler_configs.ro_jaru import RoJaru
 from diario_crawler.crawler_configs.sp_sao_jose_dos_campos import SpSaoJoseDosCampos
 from diario_crawler.storage.base import StorageBackend
+from diario_crawler.storage.index import IdentifierIndex
 from diario_crawler.storage.local import LocalBackend
 
 vcr_dir = Path(__file__).parent / "fixtures" / "vcr_cassettes"
@@ -49,6 +50,10 @@ def mock_storage() -> StorageBackend:
     """Mock storage that doesn't write to disk."""
     storage = MagicMock(spec=LocalBackend("data/raw"))
     storage.save_editions = MagicMock()
+    storage.load_state = MagicMock(return_value={})
+    storage.save_state = MagicMock()
+    storage.append_state = MagicMock()
+    storage.identifier_index = MagicMock(return_value=IdentifierIndex())
     return storage
 
 
@@ -0,0 +1,104 @@
+"""Test suite for the command line entry point."""
+
+import sys
+
+import pytest
+
+from diario_crawler.cli import run_crawler
+from diario_crawler.models import (
+    Article,
+    ArticleContent,
+    ArticleMetadata,
+    ContentType,
+    GazetteEdition,
+    GazetteMetadata,
+)
+from diario_crawler.storage import LocalBackend, ParquetStorage
+
+pytestmark = pytest.mark.order(6)
+
+
+def make_edition(edition_id: str, identifier: str) -> GazetteEdition:
+    """Cria uma edição com um artigo grande o bastante para virar blob."""
+    metadata = GazetteMetadata(
+        edition_id=edition_id,
+        publication_date="2024-01-03",
+        edition_number=1,
+        supplement=False,
+        edition_type_id=1,
+        edition_type_name="Normal",
+        pdf_url="",
+    )
+    article = Article(
+        metadata=ArticleMetadata(
+            article_id=identifier,
+            edition_id=edition_id,
+            hierarchy_path=["Root"],
+            title="Artigo",
+            identifier=identifier,
+        ),
+        content=ArticleContent(
+            raw_content=f"<p>{identifier}</p>" * 500, content_type=ContentType.HTML
+        ),
+    )
+    return GazetteEdition(metadata=metadata, articles=[article])
+
+
+@pytest.fixture
+def storage(tmp_path) -> ParquetStorage:
+    storage = ParquetStorage(LocalBackend(tmp_path), enable_duckdb=False)
+    storage.save_editions([make_edition("E1", "A-1")], municipality="sjc")
+    storage.save_editions([make_edition("E2", "A-2")], municipality="sjc")
+    return storage
+
+
+async def run_cli(monkeypatch, tmp_path, *flags: str) -> None:
+    """Executa a CLI sem --municipality sobre o storage local de teste."""
+    argv = [
+        "diario-crawler",
+        "--output-dir",
+        str(tmp_path),
+        "--log-file",
+        str(tmp_path / "cli.log"),
+        *flags,
+    ]
+    monkeypatch.setattr(sys, "argv", argv)
+    await run_crawler.cli()
+
+
+@pytest.mark.asyncio
+async def test_show_stats_without_municipality(storage, tmp_path, monkeypatch):
+    """--show-stats roda sem município nem configuração de crawler."""
+    monkeypatch.setattr(
+        run_crawler,
+        "resolve_municipalities",
+        lambda value: pytest.fail("configuração de município carregada"),
+    )
+    await run_cli(monkeypatch, tmp_path, "--show-stats")
+
+
+@pytest.mark.asyncio
+async def test_rebuild_index_without_municipality(storage, tmp_path, monkeypatch):
+    """--rebuild-index recria o índice de conteúdo em um único segmento."""
+    await run_cli(monkeypatch, tmp_path, "--rebuild-index")
+
+    segments = storage.backend.list_files("_content_index", ".parquet")
+    assert len(segments) == 1
+    assert storage.backend.read_parquet(segments[0]).num_rows == 2
+
+
+@pytest.mark.asyncio
+async def test_migrate_to_packs_without_municipality(storage, tmp_path, monkeypatch):
+    """--migrate-to-packs empacota os blobs soltos e remove os originais."""
+    await run_cli(monkeypatch, tmp_path, "--migrate-to-packs", "--delete-loose")
+
+    assert storage.backend.list_files("packs", ".pack")
+    assert not storage.backend.list_files("content", ".bin")
+
+
+@pytest.mark.asyncio
+async def test_compact_without_municipality(storage, tmp_path, monkeypatch):
+    """--compact une os lotes de cada partição."""
+    await run_cli(monkeypatch, tmp_path, "--compact")
+
+    assert len(storage._live_files("articles")) == 1
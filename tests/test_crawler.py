@@ -1,11 +1,35 @@
 """Test suite for the GazetteCrawler orchestrator."""
 
+import asyncio
+import hashlib
+import threading
+from datetime import date, timedelta
 from unittest.mock import AsyncMock, MagicMock
 
+import httpx
 import pytest
 
+from diario_crawler.core.calendar import SETTLE_DAYS, PublicationCalendar
+from diario_crawler.core.checkpoint import CheckpointManifest
 from diario_crawler.core.crawler import GazetteCrawler
-from diario_crawler.models import ArticleMetadata, GazetteEdition
+from diario_crawler.core.executors import ExecutorPool
+from diario_crawler.core.pdf import PdfStage
+from diario_crawler.core.runner import MultiCrawlerRunner
+from diario_crawler.crawler_configs.rj_rio_de_janeiro import RjRioDeJaneiro
+from diario_crawler.crawler_configs.ro_jaru import RoJaru
+from diario_crawler.models import (
+    Article,
+    ArticleContent,
+    ArticleMetadata,
+    ContentType,
+    GazetteEdition,
+    GazetteMetadata,
+)
+from diario_crawler.parsers import ContentParser, MetadataParser
+from diario_crawler.parsers.json_decoder import DECODERS, get_decoder
+from diario_crawler.storage import LocalBackend, ParquetStorage, StorageWriter
+from diario_crawler.storage.index import IdentifierIndex
+from diario_crawler.storage.state import merge_state
 
 pytestmark = pytest.mark.order(3)
 
@@ -22,7 +46,6 @@ async def test_init_default(test_config, mock_storage):
     assert crawler.metadata_parser is not None
     assert crawler.structure_parser is not None
     assert crawler.content_parser is not None
-    assert crawler.data_processor is not None
 
 
 @pytest.mark.asyncio
@@ -58,22 +81,122 @@ async def test_fetch_metadata_batch(vcr_cassette, test_config, mock_storage):
 @pytest.mark.parametrize(
     "vcr_cassette", ["test_fetch_structure_batch.yaml"], indirect=True
 )
-async def test_fetch_structure_batch(vcr_cassette, test_config, mock_storage):
-    """Testa a fase 2: busca das estruturas HTML."""
+async def test_stream_editions_parses_recorded_structures(
+    vcr_cassette, test_config, mock_storage
+):
+    """Testa as fases 2 e 3 (stream_editions) sobre estruturas HTML gravadas."""
     crawler = GazetteCrawler(config=test_config, storage=mock_storage)
     urls = crawler.create_metadata_urls()
-
     metadata_list = await crawler.fetch_metadata_batch(urls)
-    html_results = await crawler.fetch_structure_batch(metadata_list)
 
-    assert isinstance(html_results, list)
-    assert html_results and "html" in html_results[0]
-    assert all("edition_id" in r for r in html_results)
+    # Conteúdos não estão no cassette: todos os artigos contam como já salvos
+    crawler.split_known_articles = lambda articles: ([], articles)
+    editions = [e async for e in crawler.stream_editions(metadata_list)]
+
+    assert editions
+    assert {e.edition_id for e in editions} <= {m.edition_id for m in metadata_list}
+    assert any(e.articles for e in editions)
+    assert all(a.content.is_stored for e in editions for a in e.articles)
+
+
+@pytest.mark.parametrize("decoder_name", list(DECODERS))
+def test_json_decoders_parse_metadata_and_content(decoder_name):
+    """Todos os decodificadores instalados produzem o mesmo resultado."""
+    decoder = get_decoder(decoder_name)
+    request = httpx.Request("GET", "https://example.org/edicoes/2024-01-03.json")
+    headers = {"content-type": "application/json"}
+    metadata_body = (
+        '{"erro":false,"data":"2024-01-03","itens":[{"id":1905,"suplemento":"",'
+        '"numero":3141,"tipo_edicao_id":1,"tipo_edicao_nome":"Di\\u00e1rio",'
+        '"capa":1,"paginas":10}]}'
+    ).encode()
+
+    metadata = MetadataParser.parse(
+        httpx.Response(200, content=metadata_body, headers=headers, request=request),
+        decoder=decoder,
+    )
+
+    assert len(metadata) == 1
+    assert metadata[0].edition_id == "1905"
+    assert metadata[0].edition_number == 3141
+    assert metadata[0].edition_type_name == "Diário"
+    assert metadata[0].supplement is False
+
+    content = ContentParser.parse(
+        httpx.Response(
+            200,
+            content='{"id":7,"conteudo":"<p>Decreto nº 1</p>"}'.encode(),
+            headers=headers,
+            request=request,
+        ),
+        decoder=decoder,
+    )
+    assert content.raw_content == "<p>Decreto nº 1</p>"
+
+    invalid = httpx.Response(200, content=b"{", headers=headers, request=request)
+    assert MetadataParser.parse(invalid, decoder=decoder) == []
 
 
-def test_parse_articles_from_html(test_config, mock_storage):
+@pytest.mark.parametrize("decoder_name", list(DECODERS))
+def test_json_decoders_skip_malformed_items_one_at_a_time(decoder_name):
+    """Itens malformados são pulados sem descartar a data, em todo decodificador."""
+    request = httpx.Request("GET", "https://example.org/edicoes/2024-01-03.json")
+    body = (
+        '{"erro":false,"data":"2024-01-03","itens":[1,"x",null,'
+        '{"id":2,"numero":"abc"},{"id":3,"numero":4,"tipo_edicao_id":"1",'
+        '"tipo_edicao_nome":5,"suplemento":[1]}]}'
+    ).encode()
+
+    metadata = MetadataParser.parse(
+        httpx.Response(200, content=body, request=request),
+        decoder=get_decoder(decoder_name),
+    )
+
+    assert [m.edition_id for m in metadata] == ["3"]
+    assert metadata[0].edition_type_name == "5"
+    assert metadata[0].supplement is False
+
+
+@pytest.mark.asyncio
+async def test_extract_edition_text_fills_html_articles(test_config, mock_storage):
+    """O texto limpo é extraído em lote só para as matérias HTML."""
+    crawler = GazetteCrawler(config=test_config, storage=mock_storage)
+
+    def article(identifier: str, content: ArticleContent) -> Article:
+        metadata = ArticleMetadata(
+            article_id=identifier,
+            edition_id="E1",
+            hierarchy_path=["Root"],
+            title=identifier,
+            identifier=identifier,
+        )
+        return Article(metadata=metadata, content=content)
+
+    html = (
+        "<style>p { color: red }</style><p>Art. <b>1º</b>  Fica\n  criado</p>"
+        "<table><tr><td>Nome</td><td>Cargo</td></tr></table><p>S&atilde;o Jos&eacute;</p>"
+    )
+    edition = GazetteEdition(
+        metadata=MagicMock(edition_id="E1"),
+        articles=[
+            article("A-1", ArticleContent(html, ContentType.HTML)),
+            article("A-2", ArticleContent(b"%PDF-1.4", ContentType.PDF)),
+        ],
+    )
+
+    result = await crawler.extract_edition_text(edition)
+
+    html_content, pdf_content = (a.content for a in result.articles)
+    assert html_content.text == "Art. 1º Fica criado\nNome Cargo\nSão José"
+    assert html_content.text_length == len(html_content.text)
+    assert html_content.raw_content == html
+    assert pdf_content.text is None
+    assert edition.articles[0].content.text is None
+
+
+def test_parse_edition_structure(test_config, mock_storage):
     """
-    Testa a fase 2.1: parse de HTMLs de estrutura.
+    Testa o parse da estrutura HTML de uma edição.
     Mocka o HtmlStructureParser para garantir integração.
     """
     crawler = GazetteCrawler(config=test_config, storage=mock_storage)
@@ -103,99 +226,209 @@ def test_parse_articles_from_html(test_config, mock_storage):
     mock_parser.deduplicate_keep_deepest.return_value = fake_articles
     crawler.structure_parser = mock_parser
 
-    html_results = [{"edition_id": "E123", "html": "<ul></ul>"}]
-    articles = crawler.parse_articles_from_html(html_results)
+    articles = crawler.parse_edition_structure("E123", "<ul></ul>")
 
     assert len(articles) == 2
     mock_parser.parse.assert_called_once()
     mock_parser.deduplicate_keep_deepest.assert_called_once()
 
+    mock_parser.parse.side_effect = ValueError("HTML inválido")
+    assert crawler.parse_edition_structure("E124", "<ul>") == []
+    assert "E124" in crawler._incomplete_editions
+
 
 @pytest.mark.asyncio
-async def test_fetch_content_batch(test_config, mock_storage):
-    """Testa a fase 3: fetch dos conteúdos das matérias."""
-    crawler = GazetteCrawler(config=test_config, storage=mock_storage)
+async def test_run_batched(test_config, mock_storage):
+    """Testa a execução em lotes (run_batched)."""
+    crawler = GazetteCrawler(test_config, mock_storage)
+    fake_edition = MagicMock(spec=GazetteEdition)
 
-    articles = [
-        ArticleMetadata(
-            article_id="1",
-            edition_id="E123",
-            hierarchy_path=["Root"],
-            title="Matéria de Teste",
-            identifier="A-001",
-            protocol=None,
-        )
-    ]
+    async def fake_stream(metadata_list):
+        for _ in metadata_list:
+            yield fake_edition
 
-    # Mocka o concurrent client e parser de conteúdo
-    crawler.concurrent_client.fetch_all = AsyncMock(
-        return_value=[
-            MagicMock(text="conteúdo da matéria", url="http://fakeurl", status_code=200)
-        ]
-    )
-    crawler.content_parser.parse = MagicMock(return_value="texto processado")
+    crawler.create_metadata_urls = MagicMock(return_value=["url1", "url2", "url3"])
+    crawler.fetch_metadata_batch = AsyncMock(return_value=[MagicMock()])
+    crawler.stream_editions = MagicMock(side_effect=fake_stream)
 
-    results = await crawler.fetch_content_batch(articles)
+    batches = []
+    async for batch in crawler.run_batched():
+        batches.append(batch)
 
-    assert len(results) == 1
-    assert "content" in results[0]
-    crawler.content_parser.parse.assert_called_once()
+    assert len(batches) >= 1
+    assert all(isinstance(b, list) for b in batches)
+    assert batches[0] == [fake_edition]
+    crawler.stream_editions.assert_called()
 
 
 @pytest.mark.asyncio
-async def test_process_batch(test_config, mock_storage):
-    """Testa o pipeline completo de processamento de um lote."""
-    crawler = GazetteCrawler(config=test_config, storage=mock_storage)
+async def test_run_batched_overlaps_batches(test_config, mock_storage):
+    """Garante que metadados do lote N+1 começam antes do conteúdo do lote N terminar."""
+    test_config.batch_size = 1
+    crawler = GazetteCrawler(test_config, mock_storage)
+    events = []
 
-    # Mocka as três fases
-    crawler.fetch_metadata_batch = AsyncMock(
-        return_value=([MagicMock(edition_id="E123", pdf_url="pdf")], {})
-    )
-    crawler.fetch_structure_batch = AsyncMock(
-        return_value=[{"edition_id": "E123", "html": "<ul></ul>", "url": "http"}]
-    )
-    crawler.parse_articles_from_html = MagicMock(
-        return_value=[
-            ArticleMetadata(
-                article_id="1",
-                edition_id="E123",
-                hierarchy_path=["Root"],
-                title="Artigo",
-                identifier="A-001",
-                protocol=None,
-            )
-        ]
-    )
-    crawler.fetch_content_batch = AsyncMock(
-        return_value=[{"article_metadata": MagicMock(), "content": "texto"}]
+    async def fake_metadata(urls):
+        events.append(("metadata", urls[0]))
+        return [MagicMock()]
+
+    async def fake_stream(metadata_list):
+        events.append(("content_start", None))
+        await asyncio.sleep(0.05)
+        events.append(("content_end", None))
+        yield MagicMock(spec=GazetteEdition)
+
+    crawler.create_metadata_urls = MagicMock(return_value=["u1", "u2", "u3"])
+    crawler.fetch_metadata_batch = fake_metadata
+    crawler.stream_editions = fake_stream
+
+    batches = [batch async for batch in crawler.run_batched()]
+
+    assert len(batches) == 3
+    first_content_end = events.index(("content_end", None))
+    assert ("metadata", "u2") in events[:first_content_end]
+
+
+@pytest.mark.asyncio
+async def test_run_batched_adapts_batch_size_to_target_articles(
+    test_config, mock_storage
+):
+    """Garante que o número de datas por lote segue a meta de artigos."""
+    test_config.batch_size = 2
+    test_config.target_batch_articles = 12
+    crawler = GazetteCrawler(test_config, mock_storage)
+    sizes = []
+
+    async def fake_metadata(urls):
+        sizes.append(len(urls))
+        return [MagicMock() for _ in urls]
+
+    async def fake_stream(metadata_list):
+        # 3 artigos por data
+        for _ in metadata_list:
+            yield MagicMock(articles=[MagicMock()] * 3)
+
+    crawler.create_metadata_urls = MagicMock(return_value=[f"u{i}" for i in range(40)])
+    crawler.fetch_metadata_batch = fake_metadata
+    crawler.stream_editions = fake_stream
+    crawler.config.pipeline_depth = 1
+
+    batches = [batch async for batch in crawler.run_batched()]
+
+    assert sum(len(b) for b in batches) == 40
+    # Começa com batch_size; medido o primeiro lote, 12 artigos / 3 por
+    # data = 4 datas (os metadados correm alguns lotes à frente)
+    assert sizes[0] == 2
+    assert sizes[-2] == 4
+
+
+@pytest.mark.asyncio
+async def test_memory_budget_flushes_editions_early(test_config, mock_storage):
+    """Garante que edições prontas são gravadas antes do fim do lote sob pressão."""
+    test_config.batch_size = 3
+    test_config.max_inflight_bytes = 100
+    crawler = GazetteCrawler(test_config, mock_storage)
+    editions = [
+        MagicMock(spec=GazetteEdition, edition_id=f"E{i}", articles=[])
+        for i in range(3)
+    ]
+
+    async def fake_stream(metadata_list):
+        for edition in editions:
+            crawler._hold_bytes(edition.edition_id, 60)
+            yield edition
+
+    crawler.create_metadata_urls = MagicMock(return_value=["u1", "u2", "u3"])
+    crawler.fetch_metadata_batch = AsyncMock(return_value=[MagicMock()])
+    crawler.stream_editions = fake_stream
+
+    saved = []
+    crawler.storage.save_editions = MagicMock(
+        side_effect=lambda batch, municipality: saved.append(len(batch))
     )
+    await crawler.run()
 
-    # Mocka agregador final
-    fake_edition = MagicMock(spec=GazetteEdition)
-    crawler.data_processor.aggregate_editions = MagicMock(return_value=[fake_edition])
+    # Teto excedido: edições gravadas antes do fim do único lote
+    assert len(saved) > 1
+    assert sum(saved) == 3
+    assert crawler.byte_budget.used == 0
 
-    result = await crawler.process_batch(["fake_url"])
-    assert isinstance(result, list)
-    assert len(result) == 1
-    crawler.data_processor.aggregate_editions.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_memory_budget_flushes_once_per_crossing(test_config, mock_storage):
+    """Garante uma entrega antecipada por travessia do teto e nenhum lote vazio."""
+    test_config.batch_size = 5
+    test_config.max_inflight_bytes = 100
+    crawler = GazetteCrawler(test_config, mock_storage)
+    editions = [
+        MagicMock(spec=GazetteEdition, edition_id=f"E{i}", articles=[])
+        for i in range(5)
+    ]
+
+    async def fake_stream(metadata_list):
+        for edition in editions:
+            crawler._hold_bytes(edition.edition_id, 60)
+            yield edition
+
+    crawler.create_metadata_urls = MagicMock(return_value=[f"u{i}" for i in range(5)])
+    crawler.fetch_metadata_batch = AsyncMock(return_value=[MagicMock()])
+    crawler.stream_editions = fake_stream
+
+    # Nada é salvo: o teto continua excedido depois da primeira entrega
+    batches = [[e.edition_id for e in b] async for b in crawler.run_batched()]
+
+    assert len(batches) == 2 and all(batches)
+    assert sum(batches, []) == ["E0", "E1", "E2", "E3", "E4"]
 
 
 @pytest.mark.asyncio
-async def test_run_batched(test_config, mock_storage):
-    """Testa a execução em lotes (run_batched)."""
+async def test_stream_editions_emits_each_edition_when_complete(
+    test_config, mock_storage
+):
+    """Garante que uma edição é emitida sem esperar o conteúdo de outra mais lenta."""
     crawler = GazetteCrawler(test_config, mock_storage)
-    fake_edition = MagicMock(spec=GazetteEdition)
+    fast, slow = MagicMock(edition_id="FAST"), MagicMock(edition_id="SLOW")
+    articles = {
+        edition_id: ArticleMetadata(
+            article_id=edition_id,
+            edition_id=edition_id,
+            hierarchy_path=["Root"],
+            title="Artigo",
+            identifier=f"{edition_id}-1",
+            protocol=None,
+        )
+        for edition_id in ("FAST", "SLOW")
+    }
+    slow_released = asyncio.Event()
 
-    crawler.create_metadata_urls = MagicMock(return_value=["url1", "url2", "url3"])
-    crawler.process_batch = AsyncMock(side_effect=[[fake_edition], [fake_edition]])
+    async def fake_fetch_iter(urls, **kwargs):
+        for url in urls:
+            if url.endswith("SLOW-1"):
+                await slow_released.wait()
+            yield url, MagicMock(text=url.rsplit("/", 1)[-1])
 
-    batches = []
-    async for batch in crawler.run_batched():
-        batches.append(batch)
+    crawler.concurrent_client.fetch_iter = fake_fetch_iter
+    crawler.parse_edition_structure = lambda edition_id, html: [articles[edition_id]]
+    crawler.parse_article_content = MagicMock(return_value=MagicMock())
 
-    assert len(batches) >= 1
-    assert all(isinstance(b, list) for b in batches)
-    crawler.process_batch.assert_called()
+    emitted = []
+    async for edition in crawler.stream_editions([slow, fast]):
+        emitted.append(edition.metadata.edition_id)
+        slow_released.set()
+
+    assert emitted == ["FAST", "SLOW"]
+
+
+@pytest.mark.asyncio
+async def test_run_batched_propagates_stage_errors(test_config, mock_storage):
+    """Garante que erros de um estágio interrompem o pipeline."""
+    crawler = GazetteCrawler(test_config, mock_storage)
+    crawler.create_metadata_urls = MagicMock(return_value=["u1"])
+    crawler.fetch_metadata_batch = AsyncMock(side_effect=RuntimeError("falha"))
+
+    with pytest.raises(RuntimeError, match="falha"):
+        async for _ in crawler.run_batched():
+            pass
 
 
 @pytest.mark.asyncio
@@ -216,3 +449,527 @@ async def test_run(test_config, mock_storage):
     assert n_editions == 2
     assert n_articles == 4
     crawler.storage.save_editions.assert_called()
+
+
+@pytest.mark.asyncio
+async def test_run_closes_shared_session(test_config, mock_storage):
+    """Garante que run() encerra o pool de conexões compartilhado."""
+    crawler = GazetteCrawler(test_config, storage=mock_storage)
+    session = crawler.concurrent_client.session
+
+    async def fake_batches():
+        yield []
+
+    crawler.run_batched = fake_batches
+    await crawler.run()
+
+    assert session.is_closed
+
+
+@pytest.mark.asyncio
+async def test_run_propagates_storage_failures(test_config, mock_storage):
+    """Garante que uma falha de escrita em segundo plano interrompe o run()."""
+    crawler = GazetteCrawler(test_config, storage=mock_storage)
+    fake_edition = MagicMock(spec=GazetteEdition, articles=[MagicMock()])
+
+    async def fake_batches():
+        for _ in range(3):
+            yield [fake_edition]
+
+    crawler.run_batched = fake_batches
+    crawler.storage.save_editions = MagicMock(side_effect=OSError("disco cheio"))
+
+    with pytest.raises(OSError, match="disco cheio"):
+        await crawler.run()
+    assert crawler.writer._task is None, "escritor próprio deve ser encerrado"
+
+
+def test_learned_concurrency_limit_is_restored(test_config, mock_storage):
+    """Garante que o limite aprendido por DOMAIN_URL é reutilizado e salvo."""
+    mock_storage.load_state.return_value = {test_config.DOMAIN_URL: 7}
+    crawler = GazetteCrawler(test_config, storage=mock_storage)
+
+    assert crawler.concurrency_limit == 7
+
+    crawler.save_concurrency_state()
+    name, state = mock_storage.append_state.call_args.args
+    assert state == {test_config.DOMAIN_URL: 7}
+
+
+def test_cache_ttl_policy(test_config, mock_storage):
+    """Garante TTL longo para datas antigas, revalidação para recentes e sem cache para conteúdo."""
+    crawler = GazetteCrawler(config=test_config, storage=mock_storage)
+    base = test_config.DOMAIN_URL
+    old_ttl = test_config.cache_ttl_days * 86400.0
+
+    recent = date.today().isoformat()
+    assert crawler._cache_ttl(f"{base}{test_config.METADATA_URL}{recent}.json") == 0
+    assert (
+        crawler._cache_ttl(f"{base}{test_config.METADATA_URL}2020-01-02.json")
+        == old_ttl
+    )
+
+    crawler._edition_dates["E1"] = "2020-01-02"
+    assert crawler._cache_ttl(f"{base}{test_config.HTML_URL}E1") == old_ttl
+    assert crawler._cache_ttl(f"{base}{test_config.CONTENT_URL}X") is None
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_written_after_save_and_skips_on_resume(
+    test_config, mock_storage
+):
+    """Garante que o checkpoint só marca o que foi salvo e é respeitado no --resume."""
+    state = {}
+    mock_storage.load_state.side_effect = lambda name: dict(state.get(name, {}))
+    mock_storage.append_state.side_effect = lambda name, delta: state.update(
+        {name: merge_state([state.get(name, {}), delta])}
+    )
+
+    crawler = GazetteCrawler(test_config, mock_storage)
+    dates = [
+        url.rsplit("/", 1)[-1].removesuffix(".json")
+        for url in crawler.create_metadata_urls()
+    ]
+    done_date, broken_date = dates[0], dates[-1]
+    crawler._date_editions = {done_date: {"E1"}, broken_date: {"E2"}}
+    crawler._incomplete_editions = {"E2"}
+
+    def fake_save(batch, **kwargs):
+        assert "checkpoint_" + test_config.NAME not in state
+        return {}
+
+    mock_storage.save_editions.side_effect = fake_save
+    batch = [
+        MagicMock(spec=GazetteEdition, edition_id="E1"),
+        MagicMock(spec=GazetteEdition, edition_id="E2"),
+    ]
+    crawler._save_batch(*crawler._checkpoint_args(batch))
+
+    manifest = state["checkpoint_" + test_config.NAME]
+    assert manifest == {"dates": [done_date], "editions": ["E1"]}
+
+    test_config.resume = True
+    resumed = GazetteCrawler(test_config, mock_storage)
+    urls = resumed.create_metadata_urls()
+
+    assert not any(url.endswith(f"{done_date}.json") for url in urls)
+    assert any(url.endswith(f"{broken_date}.json") for url in urls)
+    pending = resumed.checkpoint.pending(
+        [MagicMock(edition_id="E1"), MagicMock(edition_id="E2")]
+    )
+    assert [m.edition_id for m in pending] == ["E2"]
+
+
+def test_checkpoint_waits_to_settle_empty_recent_dates(mock_storage):
+    """Garante que uma data recente sem edições não é concluída para sempre."""
+    recent = date.today().isoformat()
+    old = (date.today() - timedelta(days=SETTLE_DAYS)).isoformat()
+    manifest = CheckpointManifest(mock_storage, "sjc")
+
+    done = manifest.commit([], {recent: frozenset(), old: frozenset()})
+
+    assert done == [old]
+    assert not manifest.is_date_done(recent)
+
+
+@pytest.mark.asyncio
+async def test_known_identifiers_are_not_downloaded(test_config, mock_storage):
+    """Garante que artigos já indexados não são baixados, exceto com refresh."""
+    mock_storage.identifier_index.return_value = IdentifierIndex({"OLD": "hash"})
+    articles = [
+        ArticleMetadata(
+            article_id=identifier,
+            edition_id="E1",
+            hierarchy_path=["Root"],
+            title="Artigo",
+            identifier=identifier,
+        )
+        for identifier in ("OLD", "NEW")
+    ]
+    requested = []
+
+    async def fake_fetch_iter(urls, **kwargs):
+        requested.extend(urls)
+        for url in urls:
+            yield url, MagicMock()
+
+    crawler = GazetteCrawler(test_config, mock_storage)
+    crawler.concurrent_client.fetch_iter = fake_fetch_iter
+    crawler.parse_edition_structure = lambda edition_id, html: articles
+    crawler.parse_article_content = MagicMock(return_value=MagicMock())
+
+    editions = [e async for e in crawler.stream_editions([MagicMock(edition_id="E1")])]
+
+    by_identifier = {a.metadata.identifier: a for a in editions[0].articles}
+    assert sorted(by_identifier) == ["NEW", "OLD"]
+    assert by_identifier["OLD"].content == ArticleContent.stored("hash")
+    assert not any(url.endswith("OLD") for url in requested)
+    assert "E1" not in crawler._incomplete_editions
+
+    test_config.refresh = True
+    crawler = GazetteCrawler(test_config, mock_storage)
+    to_fetch, known = crawler.split_known_articles(articles)
+    assert len(to_fetch) == 2 and not known
+
+
+@pytest.mark.asyncio
+async def test_recrawled_edition_keeps_stored_articles(test_config, tmp_path):
+    """Garante que um recrawl salva a edição inteira sem baixar o já armazenado."""
+    storage = ParquetStorage(LocalBackend(tmp_path), enable_duckdb=False)
+    articles = [
+        ArticleMetadata(
+            article_id=identifier,
+            edition_id="E1",
+            hierarchy_path=["Root"],
+            title="Artigo",
+            identifier=identifier,
+        )
+        for identifier in ("A1", "A2")
+    ]
+    metadata = GazetteMetadata(
+        edition_id="E1",
+        publication_date="2024-01-03",
+        edition_number=1,
+        supplement=False,
+        edition_type_id=1,
+        edition_type_name="Normal",
+        pdf_url="",
+    )
+    contents = {"A1": "<p>curto</p>", "A2": "<p>longo</p>" * 500}
+    requested = []
+
+    async def fake_fetch_iter(urls, **kwargs):
+        requested.extend(urls)
+        for url in urls:
+            yield url, MagicMock()
+
+    async def crawl() -> GazetteEdition:
+        crawler = GazetteCrawler(test_config, storage)
+        crawler.concurrent_client.fetch_iter = fake_fetch_iter
+        crawler.parse_edition_structure = lambda edition_id, html: articles
+        crawler.parse_article_content = lambda article, response: ArticleContent(
+            raw_content=contents[article.identifier], content_type=ContentType.HTML
+        )
+        (edition,) = [e async for e in crawler.stream_editions([metadata])]
+        storage.save_editions([edition], municipality=test_config.NAME)
+        await crawler.aclose()
+        return edition
+
+    await crawl()
+    requested.clear()
+    await crawl()
+
+    assert not any(url.endswith(("A1", "A2")) for url in requested)
+    read = storage.backend.read_parquet
+    gazettes = [read(p) for p in storage.backend.list_files("gazettes", ".parquet")]
+    assert [t.column("total_articles").to_pylist() for t in gazettes] == [[2], [2]]
+    assert len({t.column("edition_hash")[0].as_py() for t in gazettes}) == 1
+
+    storage.compact()
+    (path,) = storage._live_files("articles")
+    rows = read(path).to_pylist()
+    assert sorted(r["identifier"] for r in rows) == ["A1", "A2"]
+    by_identifier = {r["identifier"]: r for r in rows}
+    assert by_identifier["A1"]["inline_text"] == contents["A1"]
+    assert storage.get_content(by_identifier["A2"]["content_path"]) == (
+        contents["A2"].encode()
+    )
+
+
+def test_publication_calendar_skips_known_empty_dates(test_config, mock_storage):
+    """Garante que feriados e datas vazias são pulados e fins de semana aprendidos sondados."""
+    state = {}
+    mock_storage.load_state.side_effect = lambda name: dict(state.get(name, {}))
+    mock_storage.append_state.side_effect = lambda name, delta: state.update(
+        {name: merge_state([state.get(name, {}), delta])}
+    )
+    test_config.STATE = "SP"
+    test_config.start_date = date(2024, 7, 5)  # sexta
+    test_config.end_date = date(2024, 7, 9)  # terça, feriado em SP
+
+    crawler = GazetteCrawler(test_config, mock_storage)
+    dates = [
+        str(d)
+        for d in crawler.calendar.candidate_dates(
+            test_config.start_date, test_config.end_date
+        )
+    ]
+    assert dates == ["2024-07-05", "2024-07-08"]
+
+    crawler.calendar.observe("2024-07-05", published=False)
+    crawler.calendar.observe("2024-06-29", published=True)  # sábado
+    crawler.calendar.observe(str(date.today()), published=False)
+    crawler.save_calendar_state()
+
+    crawler = GazetteCrawler(test_config, mock_storage)
+    urls = crawler.create_metadata_urls()
+    assert [url.rsplit("/", 1)[-1] for url in urls] == [
+        "2024-07-06.json",
+        "2024-07-08.json",
+    ]
+    assert str(date.today()) not in crawler.calendar.empty
+
+
+def test_publication_calendar_probes_hinted_dates_periodically(mock_storage):
+    """Garante que feriados e fins de semana são sondados de tempos em tempos."""
+    calendar = PublicationCalendar(mock_storage, "sjc", "SP", probe_weeks=4)
+
+    # 20-21/07 caem fora da semana de sondagem; 27-28/07, dentro dela
+    dates = calendar.candidate_dates(date(2024, 7, 20), date(2024, 7, 28))
+    assert [str(d) for d in dates] == [
+        "2024-07-22",
+        "2024-07-23",
+        "2024-07-24",
+        "2024-07-25",
+        "2024-07-26",
+        "2024-07-27",
+        "2024-07-28",
+    ]
+
+    # Feriado em que o município já publicou em outro ano é consultado
+    assert calendar.candidate_dates(date(2024, 7, 9), date(2024, 7, 9)) == []
+    calendar.observe("2023-07-09", published=True)
+    assert calendar.candidate_dates(date(2024, 7, 9), date(2024, 7, 9)) == [
+        date(2024, 7, 9)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_metadata_errors_are_not_recorded_as_empty_dates(
+    test_config, mock_storage
+):
+    """Garante que só uma listagem vazia confirmada marca a data como vazia."""
+    crawler = GazetteCrawler(test_config, mock_storage)
+    prefix = f"{test_config.DOMAIN_URL}{test_config.METADATA_URL}"
+    bodies = {
+        f"{prefix}2024-01-02.json": b'{"erro": true, "itens": []}',
+        f"{prefix}2024-01-03.json": b'{"data": "2024-01-03", "itens": []}',
+    }
+
+    async def fake_fetch_iter(urls, **kwargs):
+        for url in urls:
+            yield url, httpx.Response(
+                200, content=bodies[url], request=httpx.Request("GET", url)
+            )
+
+    crawler.concurrent_client.fetch_iter = fake_fetch_iter
+    assert await crawler.fetch_metadata_batch(list(bodies)) == []
+
+    assert crawler.calendar.empty == {"2024-01-03"}
+    assert crawler._date_editions == {"2024-01-03": set()}
+
+
+@pytest.mark.asyncio
+async def test_multi_crawler_runner_shares_writer_and_isolates_failures(
+    test_config, mock_storage
+):
+    """Garante que vários municípios usam o mesmo escritor e uma falha não derruba os demais."""
+    other_config = RjRioDeJaneiro(
+        start_date=date(2012, 5, 29), end_date=date(2012, 5, 30)
+    )
+    broken_config = RoJaru(start_date=date(2022, 1, 3), end_date=date(2022, 1, 3))
+    runner = MultiCrawlerRunner(
+        [test_config, other_config, broken_config], mock_storage, max_in_flight=8
+    )
+    fake_edition = MagicMock(spec=GazetteEdition, articles=[MagicMock()])
+
+    async def fake_batches():
+        yield [fake_edition]
+
+    async def broken_batches():
+        raise RuntimeError("portal fora do ar")
+        yield
+
+    for crawler in runner.crawlers:
+        assert crawler.writer is runner.writer
+        assert crawler.concurrent_client.budget is runner.budget
+        crawler.run_batched = fake_batches
+    runner.crawlers[-1].run_batched = broken_batches
+
+    results = await runner.run()
+
+    assert [r.ok for r in results] == [True, True, False]
+    assert results[0].editions == 1 and results[1].articles == 1
+    assert "portal fora do ar" in results[2].error
+    assert mock_storage.save_editions.call_count == 2
+
+
+def make_pdf(pages: list[str]) -> bytes:
+    """PDF mínimo com uma linha de texto (ASCII) por página."""
+    objects = {
+        1: "<< /Type /Catalog /Pages 2 0 R >>",
+        3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    kids = []
+    for i, text in enumerate(pages):
+        page_id, content_id = 4 + 2 * i, 5 + 2 * i
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects[page_id] = (
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        objects[content_id] = (
+            f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream"
+        )
+        kids.append(f"{page_id} 0 R")
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>"
+
+    out = b"%PDF-1.4\n"
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = len(out)
+        out += f"{number} 0 obj\n{objects[number]}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for number in sorted(objects):
+        out += f"{offsets[number]:010d} 00000 n \n".encode()
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+    return out
+
+
+@pytest.mark.asyncio
+async def test_pdf_stage_extracts_each_pdf_once(tmp_path):
+    """PDFs de edição e de matéria viram páginas de texto uma única vez."""
+    pytest.importorskip("pypdf")
+    edition_pdf = make_pdf(["Decreto 1", "Portaria 2"])
+    edition_hash = hashlib.sha256(edition_pdf).hexdigest()
+    pdf_url = "https://example.org/pdf_diario/E1/"
+    article_text = "Edital " + "3" * 2100
+    article_hash = hashlib.sha256(make_pdf([article_text])).hexdigest()
+    downloads = []
+
+    class FakeClient:
+        async def download(self, url, dest):
+            downloads.append(url)
+            dest.write_bytes(edition_pdf)
+            return edition_hash, len(edition_pdf)
+
+    metadata = GazetteMetadata(
+        edition_id="E1",
+        publication_date="2024-01-03",
+        edition_number=1,
+        supplement=False,
+        edition_type_id=1,
+        edition_type_name="Normal",
+        pdf_url=pdf_url,
+    )
+    article = Article(
+        metadata=ArticleMetadata(
+            article_id="A1",
+            edition_id="E1",
+            hierarchy_path=["Editais"],
+            title="Edital",
+            identifier="A-1",
+        ),
+        content=ArticleContent(make_pdf([article_text]), ContentType.PDF),
+    )
+    edition = GazetteEdition(metadata=metadata, articles=[article])
+
+    root = tmp_path / "storage"
+    storage = ParquetStorage(LocalBackend(root), enable_duckdb=False)
+    reader_threads = []
+    get_blob = storage.get_blob
+
+    def tracked_get_blob(content_hash):
+        reader_threads.append(threading.current_thread().name)
+        return get_blob(content_hash)
+
+    storage.get_blob = MagicMock(side_effect=tracked_get_blob)
+    executors = ExecutorPool(parse_workers=0, write_workers=1)
+    writer = StorageWriter(executor=executors.write_executor())
+    try:
+        # PDF da matéria gravado como blob pelo save: relido do storage
+        saved = await writer.submit(storage.save_editions, [edition])
+        stage = PdfStage(
+            storage, executors, FakeClient(), "sjc", writer=writer, tmp_dir=tmp_path
+        )
+        stage.submit([edition], saved)
+        stage.submit([edition], saved)
+        await stage.drain()
+        await stage.aclose()
+
+        # Nova execução: o índice persistido evita baixar e extrair de novo
+        reloaded = ParquetStorage(LocalBackend(root), enable_duckdb=False)
+        again = PdfStage(reloaded, executors, FakeClient(), "sjc", tmp_dir=tmp_path)
+        again.submit([edition])
+        await again.drain()
+        await again.aclose()
+    finally:
+        await writer.aclose()
+        executors.shutdown()
+
+    rows = [
+        (row["source"], row["page"], row["text"], row["content_hash"])
+        for path in storage.backend.list_files("pdf_pages", ".parquet")
+        for row in storage.backend.read_parquet(path).to_pylist()
+    ]
+    assert sorted(row[:3] for row in rows) == [
+        ("article", 1, article_text),
+        ("edition", 1, "Decreto 1"),
+        ("edition", 2, "Portaria 2"),
+    ]
+    assert {row[3] for row in rows if row[0] == "edition"} == {edition_hash}
+    assert downloads == [pdf_url]
+    storage.get_blob.assert_called_once_with(article_hash)
+    # Releitura no pool de leitura, não na fila do StorageWriter
+    assert reader_threads[0].startswith("storage-reader")
+    assert storage.backend.exists(storage._content_path(edition_hash))
+    assert not list(tmp_path.glob("*.pdf"))
+
+
+@pytest.mark.asyncio
+async def test_pdf_stage_records_urls_of_pdfs_already_claimed(tmp_path):
+    """A URL de um PDF já em extração por outra edição também vai ao índice."""
+    pytest.importorskip("pypdf")
+    pdf = make_pdf(["Decreto 1"])
+    content_hash = hashlib.sha256(pdf).hexdigest()
+    downloads = []
+
+    class FakeClient:
+        async def download(self, url, dest):
+            downloads.append(url)
+            dest.write_bytes(pdf)
+            return content_hash, len(pdf)
+
+    editions = [
+        GazetteEdition(
+            metadata=GazetteMetadata(
+                edition_id=edition_id,
+                publication_date="2024-01-03",
+                edition_number=1,
+                supplement=False,
+                edition_type_id=1,
+                edition_type_name="Normal",
+                pdf_url=f"https://example.org/pdf_diario/{edition_id}/",
+            ),
+            articles=[],
+        )
+        for edition_id in ("E1", "E2")
+    ]
+    urls = [edition.metadata.pdf_url for edition in editions]
+
+    root = tmp_path / "storage"
+    executors = ExecutorPool(parse_workers=0, write_workers=1)
+    try:
+        storage = ParquetStorage(LocalBackend(root), enable_duckdb=False)
+        stage = PdfStage(storage, executors, FakeClient(), "sjc", tmp_dir=tmp_path)
+        stage.submit(editions)
+        await stage.drain()
+        await stage.aclose()
+        assert sorted(downloads) == urls
+
+        # Nova execução: nenhuma das duas URLs é baixada de novo
+        reloaded = ParquetStorage(LocalBackend(root), enable_duckdb=False)
+        again = PdfStage(reloaded, executors, FakeClient(), "sjc", tmp_dir=tmp_path)
+        again.submit(editions)
+        await again.drain()
+        await again.aclose()
+    finally:
+        executors.shutdown()
+
+    assert sorted(downloads) == urls
+    index = reloaded.pdf_index()
+    assert all(url in index for url in urls)
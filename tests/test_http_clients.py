@@ -1,12 +1,22 @@
 """Tests for HttpClient and ConcurrentHttpClient behavior."""
 
 import asyncio
+import hashlib
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
 
+from diario_crawler.core.cache import HttpCache
 from diario_crawler.core.clients import ConcurrentHttpClient, HttpClient
+from diario_crawler.core.limiter import (
+    AdaptiveConcurrencyLimiter,
+    ByteBudget,
+    RequestBudget,
+)
+from diario_crawler.core.ratelimit import TokenBucket, parse_retry_after
+from diario_crawler.crawler_configs.base import BaseCrawlerConfig
+from diario_crawler.utils import metrics
 
 pytestmark = pytest.mark.order(1)
 
@@ -178,3 +188,400 @@ async def test_concurrent_client_with_vcr(vcr_cassette):
 
     assert all(r.status_code == 200 for r in results if r)
     assert len(results) == len(urls)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_client_reuses_shared_session():
+    """Testa se fetch_all usa a mesma sessão httpx entre chamadas."""
+    concurrent_client = ConcurrentHttpClient(max_concurrent=4)
+    seen_clients = []
+
+    async def fake_fetch(url, client, max_retries):
+        seen_clients.append(client)
+        return MagicMock(status_code=200)
+
+    concurrent_client.client.fetch = fake_fetch
+
+    await concurrent_client.fetch_all(["http://a.com"])
+    await concurrent_client.fetch_all(["http://b.com"])
+
+    assert seen_clients[0] is seen_clients[1]
+    assert seen_clients[0] is concurrent_client.session
+    assert not concurrent_client.session.is_closed
+
+    session = concurrent_client.session
+    await concurrent_client.aclose()
+    assert session.is_closed
+
+
+@pytest.mark.asyncio
+async def test_fetch_iter_yields_in_completion_order():
+    """Testa se fetch_iter entrega respostas na ordem em que terminam."""
+    concurrent_client = ConcurrentHttpClient(max_concurrent=3)
+    delays = {"http://slow.com": 0.05, "http://fast.com": 0.0, "http://bad.com": 0.0}
+
+    async def fake_fetch(url, client, max_retries):
+        await asyncio.sleep(delays[url])
+        if "bad" in url:
+            raise httpx.RequestError("Erro simulado")
+        return MagicMock(status_code=200, url=url)
+
+    concurrent_client.client.fetch = fake_fetch
+
+    results = [
+        (url, response)
+        async for url, response in concurrent_client.fetch_iter(list(delays))
+    ]
+
+    assert [url for url, _ in results][-1] == "http://slow.com"
+    assert dict(results)["http://bad.com"] is None
+    assert len(results) == 3
+
+
+@pytest.mark.asyncio
+async def test_fetch_iter_bounds_buffered_responses():
+    """Testa se workers param quando o buffer de respostas está cheio."""
+    concurrent_client = ConcurrentHttpClient(max_concurrent=2, max_limit=2)
+    started = []
+
+    async def fake_fetch(url, client, max_retries):
+        started.append(url)
+        return MagicMock(status_code=200)
+
+    concurrent_client.client.fetch = fake_fetch
+    urls = [f"http://fake{i}.com" for i in range(10)]
+
+    iterator = concurrent_client.fetch_iter(urls, max_buffered=1)
+    await iterator.__anext__()
+    await asyncio.sleep(0.01)
+
+    # 1 consumida + 1 no buffer + 1 por worker bloqueado no put
+    assert len(started) <= 4
+    await iterator.aclose()
+
+
+def test_concurrent_client_grows_and_observes_hostless_urls():
+    """Testa o teto adaptativo padrão e o retorno de latência para URLs sem host."""
+    concurrent_client = ConcurrentHttpClient(max_concurrent=4)
+    assert concurrent_client.max_limit == BaseCrawlerConfig.MAX_ADAPTIVE_CONCURRENCY
+
+    limiter = concurrent_client.limiter_for("/relativa")
+    limiter.observe = MagicMock()
+    concurrent_client._observe("/relativa", 503, 0.1, None)
+    limiter.observe.assert_called_once_with("/relativa", 503, 0.1, None)
+
+
+@pytest.mark.asyncio
+async def test_fetch_iter_raises_when_worker_dies_outside_fetch():
+    """Testa se a falha de um worker fora da requisição não trava o consumidor."""
+    concurrent_client = ConcurrentHttpClient(max_concurrent=2)
+    concurrent_client.client.fetch = AsyncMock(return_value=MagicMock(status_code=200))
+    concurrent_client.wait_for_memory = AsyncMock(side_effect=RuntimeError("falhou"))
+
+    async def consume():
+        return [r async for r in concurrent_client.fetch_iter(["http://a.com"] * 3)]
+
+    with pytest.raises(RuntimeError, match="falhou"):
+        await asyncio.wait_for(consume(), timeout=1)
+
+
+# ==========================================================
+# AdaptiveConcurrencyLimiter
+# ==========================================================
+
+
+@pytest.mark.asyncio
+async def test_limiter_additive_increase_and_multiplicative_decrease():
+    """Testa crescimento aditivo em sucesso e redução multiplicativa em sobrecarga."""
+    limiter = AdaptiveConcurrencyLimiter(
+        initial_limit=4, max_limit=8, cooldown=0.0, name="aimd.test"
+    )
+
+    for _ in range(20):
+        limiter.on_success(0.1)
+    assert limiter.limit > 4
+    assert limiter.limit <= 8
+
+    grown = limiter.limit
+    limiter.on_overload()
+    assert limiter.limit == max(1, int(grown * 0.5))
+    assert metrics.get_gauge("http_concurrency_limit", host="aimd.test") == (
+        limiter.limit
+    )
+
+
+@pytest.mark.asyncio
+async def test_limiter_caps_in_flight_requests():
+    """Testa se o limitador nunca excede o limite de requisições simultâneas."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+    peak = 0
+
+    async def worker():
+        nonlocal peak
+        async with limiter:
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(worker() for _ in range(10)))
+
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_client_backs_off_on_429():
+    """Testa se respostas 429 observadas reduzem o limite do host."""
+    concurrent_client = ConcurrentHttpClient(max_concurrent=8, max_limit=16)
+    limiter = concurrent_client.limiter_for("http://portal.test/x")
+
+    request = httpx.Request("GET", "http://portal.test/x")
+    error = httpx.HTTPStatusError(
+        "429", request=request, response=httpx.Response(429, request=request)
+    )
+    concurrent_client.client._notify("http://portal.test/x", 429, 0.1, error)
+
+    assert limiter.limit == 4
+    assert concurrent_client.learned_limits() == {"portal.test": 4}
+
+
+@pytest.mark.asyncio
+async def test_request_budget_shares_slots_fairly_between_domains():
+    """Garante que um domínio lento não monopoliza o orçamento global."""
+    budget = RequestBudget(max_in_flight=4)
+
+    async def request(domain, duration):
+        async with budget.slot(domain):
+            await asyncio.sleep(duration)
+
+    # Domínio lento enfileira bem mais requisições que as vagas disponíveis
+    slow = [asyncio.create_task(request("slow.test", 0.02)) for _ in range(12)]
+    await asyncio.sleep(0)
+    assert budget.held_by("slow.test") == 4
+
+    fast = [asyncio.create_task(request("fast.test", 0)) for _ in range(4)]
+    await asyncio.gather(*fast)
+
+    # Em FIFO o rápido só terminaria depois de toda a fila do lento
+    assert sum(task.done() for task in slow) <= 8
+    await asyncio.gather(*slow)
+    assert budget.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_client_respects_global_budget():
+    """Garante que o orçamento global limita requisições somando os hosts."""
+    budget = RequestBudget(max_in_flight=3)
+    concurrent_client = ConcurrentHttpClient(max_concurrent=5, budget=budget)
+    peak = 0
+
+    async def fake_fetch(url, client, max_retries=3):
+        nonlocal peak
+        peak = max(peak, budget.in_flight)
+        await asyncio.sleep(0.01)
+        return MagicMock()
+
+    concurrent_client.client.fetch = fake_fetch
+    urls = [f"http://host{i % 2}.test/{i}" for i in range(12)]
+    results = [r async for r in concurrent_client.fetch_iter(urls, client=MagicMock())]
+
+    assert len(results) == 12
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_byte_budget_pauses_new_requests_until_released():
+    """Garante que requisições novas aguardam enquanto o teto de memória excede."""
+    byte_budget = ByteBudget(max_bytes=100)
+    concurrent_client = ConcurrentHttpClient(max_concurrent=2, byte_budget=byte_budget)
+    started = []
+
+    async def fake_fetch(url, client, max_retries=3):
+        started.append(url)
+        return MagicMock()
+
+    concurrent_client.client.fetch = fake_fetch
+    byte_budget.charge(150)
+    assert byte_budget.exceeded
+
+    fetch = asyncio.ensure_future(
+        concurrent_client.fetch_all(["http://a.test/1"], client=MagicMock())
+    )
+    await asyncio.sleep(0.02)
+    assert started == [], "requisição iniciou com o teto excedido"
+
+    # Requisições que liberam memória não esperam o teto
+    free = [
+        r
+        async for r in concurrent_client.fetch_iter(
+            ["http://a.test/2"], client=MagicMock(), wait_for_memory=False
+        )
+    ]
+    assert len(free) == 1
+
+    byte_budget.release(100)
+    await fetch
+    assert started == ["http://a.test/2", "http://a.test/1"]
+    assert metrics.get_gauge("memory_inflight_bytes") == 50
+
+
+# ==========================================================
+# TokenBucket / Retry-After
+# ==========================================================
+
+
+def test_parse_retry_after():
+    """Testa parse de Retry-After em segundos e em data HTTP."""
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("invalido") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_requests():
+    """Testa se o bucket limita a taxa após consumir a rajada inicial."""
+    bucket = TokenBucket(rate=50, capacity=1)
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    for _ in range(6):
+        await bucket.acquire()
+    elapsed = loop.time() - start
+
+    # 1 token imediato + 5 repostos a 50/s
+    assert elapsed >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_is_shared_per_host():
+    """Testa se o mesmo bucket é compartilhado por host no processo."""
+    TokenBucket.reset_registry()
+    first = HttpClient(rate_limit=5).bucket_for("https://portal.test/a")
+    second = HttpClient(rate_limit=5).bucket_for("https://portal.test/b")
+
+    assert first is second
+    TokenBucket.reset_registry()
+
+
+@pytest.mark.asyncio
+async def test_retry_after_pauses_whole_domain():
+    """Testa se um 429 com Retry-After pausa o bucket do domínio inteiro."""
+    TokenBucket.reset_registry()
+    client = HttpClient()
+    url = "https://paused.test/x"
+    request = httpx.Request("GET", url)
+
+    mock_client = AsyncMock()
+    mock_client.get.return_value = httpx.Response(
+        429, headers={"Retry-After": "30"}, request=request
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client._fetch_internal(url, mock_client)
+
+    bucket = client.bucket_for("https://paused.test/other")
+    assert 25 < bucket.paused_for <= 30
+    TokenBucket.reset_registry()
+
+
+@pytest.mark.asyncio
+async def test_download_streams_body_to_disk_with_hash(tmp_path):
+    """Testa se o download grava o corpo em disco e devolve hash e tamanho."""
+    body = b"%PDF-1.4 " + bytes(range(256)) * 4096
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if len(calls) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, content=body)
+
+    client = HttpClient()
+    dest = tmp_path / "edicao.pdf"
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as session:
+        # Sem a espera do backoff entre tentativas
+        with patch("asyncio.sleep", AsyncMock()):
+            result = await client.download(
+                "https://download.test/pdf_diario/1/", session, dest
+            )
+
+    not_found = httpx.MockTransport(lambda request: httpx.Response(404))
+    async with httpx.AsyncClient(transport=not_found) as session:
+        missing = await client.download(
+            "https://download.test/pdf_diario/2/", session, tmp_path / "ausente.pdf"
+        )
+
+    assert result == (hashlib.sha256(body).hexdigest(), len(body))
+    assert dest.read_bytes() == body
+    assert len(calls) == 2
+    assert missing is None
+
+
+# ==========================================================
+# HttpCache
+# ==========================================================
+
+
+@pytest.mark.asyncio
+async def test_cache_revalidates_with_etag_and_serves_304(tmp_path):
+    """Testa revalidação condicional: 304 devolve o corpo salvo em disco."""
+    url = "https://cache.test/edicoes/2024-01-03.json"
+    request = httpx.Request("GET", url)
+    client = HttpClient(cache=HttpCache(tmp_path, default_ttl=0))
+
+    mock_client = AsyncMock()
+    mock_client.get.return_value = httpx.Response(
+        200,
+        content=b'{"itens": []}',
+        headers={"ETag": '"v1"', "Content-Type": "application/json"},
+        request=request,
+    )
+    first = await client._fetch_internal(url, mock_client)
+    assert first.content == b'{"itens": []}'
+
+    mock_client.get.return_value = httpx.Response(304, request=request)
+    second = await client._fetch_internal(url, mock_client)
+
+    sent_headers = mock_client.get.call_args.kwargs["headers"]
+    assert sent_headers["If-None-Match"] == '"v1"'
+    assert second.status_code == 200
+    assert second.content == b'{"itens": []}'
+    assert second.headers["content-type"] == "application/json"
+
+
+@pytest.mark.asyncio
+async def test_cache_fresh_entry_skips_network(tmp_path):
+    """Testa se entradas dentro do TTL não geram requisição."""
+    url = "https://cache.test/view_html_diario/123"
+    client = HttpClient(cache=HttpCache(tmp_path, ttl_for=lambda u: 3600.0))
+
+    mock_client = AsyncMock()
+    mock_client.get.return_value = httpx.Response(
+        200, content=b"<ul id='tree'></ul>", request=httpx.Request("GET", url)
+    )
+    await client._fetch_internal(url, mock_client)
+    cached = await client._fetch_internal(url, mock_client)
+
+    assert mock_client.get.call_count == 1
+    assert cached.text == "<ul id='tree'></ul>"
+    assert cached.headers["x-cache"] == "HIT"
+
+
+@pytest.mark.asyncio
+async def test_cache_concurrent_stores_use_unique_temp_files(tmp_path):
+    """Testa gravações simultâneas da mesma URL sem colisão de arquivos temporários."""
+    url = "https://cache.test/edicoes/2024-01-03.json"
+    cache = HttpCache(tmp_path, default_ttl=3600)
+    responses = [
+        httpx.Response(200, content=f"v{i}".encode(), request=httpx.Request("GET", url))
+        for i in range(20)
+    ]
+
+    await asyncio.gather(
+        *(asyncio.to_thread(cache.store, url, response) for response in responses)
+    )
+
+    entry = cache.get(url)
+    assert entry is not None
+    assert cache.to_response(entry).content in {r.content for r in responses}
+    assert not list(tmp_path.rglob("*.tmp"))
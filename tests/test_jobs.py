@@ -0,0 +1,110 @@
+"""Test suite for the distributed backfill job queue."""
+
+import time
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+
+from diario_crawler.core import backfill
+from diario_crawler.core.backfill import BackfillWorker
+from diario_crawler.core.jobs import JobQueue
+
+pytestmark = pytest.mark.order(5)
+
+
+@pytest.fixture
+def queue(tmp_path) -> JobQueue:
+    return JobQueue(tmp_path / "jobs.sqlite", max_attempts=2)
+
+
+def test_enqueue_is_idempotent_and_claims_are_exclusive(queue):
+    """Garante shards sem sobreposição, enfileiramento idempotente e claims distintos."""
+    assert queue.enqueue_range("sjc", date(2024, 1, 1), date(2024, 1, 25), 10) == 3
+    assert queue.enqueue_range("sjc", date(2024, 1, 1), date(2024, 1, 25), 10) == 0
+
+    first = queue.claim("w1")
+    second = queue.claim("w2")
+    assert first.id != second.id
+    assert (first.start_date, first.end_date) == (date(2024, 1, 1), date(2024, 1, 10))
+
+    assert queue.complete(first.id, "w1")
+    assert not queue.complete(second.id, "w1")
+    assert queue.stats() == {"pending": 1, "leased": 1, "done": 1, "failed": 0}
+
+
+def test_expired_lease_is_retried_until_max_attempts(queue):
+    """Garante que shards de workers mortos voltam à fila e falham após max_attempts."""
+    queue.enqueue_range("sjc", date(2024, 1, 1), date(2024, 1, 1))
+
+    dead = queue.claim("dead", lease_seconds=0.01)
+    time.sleep(0.02)
+    retried = queue.claim("alive", lease_seconds=0.01)
+
+    assert retried.id == dead.id and retried.attempts == 2
+    assert not queue.heartbeat(dead.id, "dead")
+
+    time.sleep(0.02)
+    assert queue.claim("other") is None
+    assert queue.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_backfill_worker_commits_and_fails_shards(queue, monkeypatch):
+    """Garante que o worker conclui shards e devolve à fila os que falharem."""
+    queue.enqueue_range("sjc", date(2024, 1, 1), date(2024, 1, 4), 2)
+
+    class FakeCrawler:
+        def __init__(self, config, storage, **kwargs):
+            self.config = config
+
+        async def run(self):
+            if self.config.start_date == date(2024, 1, 3):
+                raise RuntimeError("portal fora do ar")
+            return 2, 5
+
+    monkeypatch.setattr(backfill, "GazetteCrawler", FakeCrawler)
+    worker = BackfillWorker(
+        queue,
+        MagicMock(),
+        lambda name, start, end: MagicMock(start_date=start),
+        worker_id="w1",
+        poll_interval=0.01,
+    )
+
+    stats = await worker.run()
+
+    assert (stats.shards, stats.editions, stats.articles) == (1, 2, 5)
+    assert stats.failed == 2  # max_attempts=2
+    assert queue.stats() == {"pending": 0, "leased": 0, "done": 1, "failed": 1}
+
+
+@pytest.mark.asyncio
+async def test_backfill_worker_reuses_pools_across_shards(queue, monkeypatch):
+    """Garante um único pool e escritor por worker, encerrados ao fim da fila."""
+    queue.enqueue_range("sjc", date(2024, 1, 1), date(2024, 1, 6), 2)
+    shared = []
+
+    class FakeCrawler:
+        def __init__(self, config, storage, **kwargs):
+            shared.append((kwargs["executors"], kwargs["writer"]))
+
+        async def run(self):
+            return 1, 1
+
+    monkeypatch.setattr(backfill, "GazetteCrawler", FakeCrawler)
+    worker = BackfillWorker(
+        queue,
+        MagicMock(),
+        lambda name, start, end: MagicMock(start_date=start),
+        worker_id="w1",
+        poll_interval=0.01,
+    )
+    shutdown = MagicMock(wraps=worker.executors.shutdown)
+    monkeypatch.setattr(worker.executors, "shutdown", shutdown)
+
+    stats = await worker.run()
+
+    assert stats.shards == 3
+    assert set(shared) == {(worker.executors, worker.writer)}
+    shutdown.assert_called_once()
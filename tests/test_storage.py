@@ -0,0 +1,446 @@
+"""Test suite for ParquetStorage and its auxiliary indexes."""
+
+import asyncio
+import threading
+from datetime import date
+
+import pyarrow as pa
+import pytest
+
+from diario_crawler.core.checkpoint import CheckpointManifest
+from diario_crawler.models import (
+    Article,
+    ArticleContent,
+    ArticleMetadata,
+    ContentType,
+    GazetteEdition,
+    GazetteMetadata,
+)
+from diario_crawler.storage import LocalBackend, ParquetStorage, StorageWriter
+from diario_crawler.storage.base import (
+    ARTICLES_SCHEMA,
+    RELATIONSHIPS_SCHEMA,
+    StorageBackend,
+)
+from diario_crawler.storage.partitioning import prune_files
+from diario_crawler.utils import metrics
+
+pytestmark = pytest.mark.order(4)
+
+
+def make_edition(edition_id: str, identifiers: list[str]) -> GazetteEdition:
+    """Cria uma edição com um artigo por identificador."""
+    metadata = GazetteMetadata(
+        edition_id=edition_id,
+        publication_date="2024-01-03",
+        edition_number=1,
+        supplement=False,
+        edition_type_id=1,
+        edition_type_name="Normal",
+        pdf_url="https://example.org/edicao.pdf",
+    )
+    articles = [
+        Article(
+            metadata=ArticleMetadata(
+                article_id=identifier,
+                edition_id=edition_id,
+                hierarchy_path=["Root"],
+                title=f"Artigo {identifier}",
+                identifier=identifier,
+            ),
+            content=ArticleContent(
+                raw_content=f"<p>{identifier}</p>", content_type=ContentType.HTML
+            ),
+        )
+        for identifier in identifiers
+    ]
+    return GazetteEdition(metadata=metadata, articles=articles)
+
+
+@pytest.fixture
+def storage(tmp_path) -> ParquetStorage:
+    return ParquetStorage(LocalBackend(tmp_path), enable_duckdb=False)
+
+
+def test_identifier_index_is_persisted_by_save_editions(storage, tmp_path):
+    """Garante que save_editions mantém o índice e que ele sobrevive a um novo processo."""
+    storage.save_editions([make_edition("E1", ["A-1", "A-2"])], municipality="sjc")
+
+    assert "A-1" in storage.identifier_index("sjc")
+    assert "A-1" not in storage.identifier_index("outro")
+
+    # Segundo lote só grava identificadores novos
+    storage.save_editions([make_edition("E2", ["A-2", "A-3"])], municipality="sjc")
+    segments = storage.backend.list_files("_index/sjc", ".parquet")
+    assert len(segments) == 2
+    assert storage.backend.read_parquet(segments[-1]).num_rows == 1
+
+    reloaded = ParquetStorage(LocalBackend(tmp_path), enable_duckdb=False)
+    index = reloaded.identifier_index("sjc")
+    assert len(index) == 3
+    assert index.get("A-3") is not None
+
+
+def test_extracted_text_is_stored_alongside_raw_content(storage):
+    """O texto limpo e sua contagem de caracteres viram colunas dos artigos."""
+    edition = make_edition("E1", ["A-1", "A-2"])
+    first = edition.articles[0]
+    edition.articles[0] = Article(
+        metadata=first.metadata,
+        content=ArticleContent(
+            raw_content=first.raw_content,
+            content_type=ContentType.HTML,
+            text="A-1",
+        ),
+    )
+    storage.save_editions([edition], municipality="sjc")
+
+    (path,) = storage.backend.list_files("articles", ".parquet")
+    rows = storage.backend.read_parquet(path, columns=["text", "text_length"])
+    assert rows.to_pylist() == [
+        {"text": "A-1", "text_length": 3},
+        {"text": None, "text_length": None},
+    ]
+
+
+def test_batches_are_built_column_wise_with_fixed_schemas(storage):
+    """Artigos de várias edições repetem os dados da edição e um só horário."""
+    storage.save_editions(
+        [make_edition("E1", ["A-1", "A-2"]), make_edition("E2", [])],
+        municipality="sjc",
+    )
+    storage.save_editions([make_edition("E3", ["A-3"])], municipality="sjc")
+
+    read = storage.backend.read_parquet
+    _, articles = sorted(
+        (read(p) for p in storage.backend.list_files("articles", ".parquet")),
+        key=len,
+    )
+    assert articles.schema == ARTICLES_SCHEMA
+    assert articles.column("edition_id").to_pylist() == ["E1", "E1"]
+    assert articles.column("hierarchy_path").to_pylist() == ['["Root"]'] * 2
+    assert articles.column("processed_at").unique().to_pylist() == [
+        articles.column("processed_at")[0].as_py()
+    ]
+
+    gazettes = storage.backend.list_files("gazettes", ".parquet")
+    assert sorted(len(read(p)) for p in gazettes) == [1, 2]
+
+    # Relações têm schema fixo em todos os lotes
+    for path in storage.backend.list_files("relationships", ".parquet"):
+        assert read(path).schema == RELATIONSHIPS_SCHEMA
+
+
+def test_content_index_skips_backend_exists_for_new_blobs(storage, tmp_path):
+    """Blobs novos e repetidos não consultam o backend; o índice é recriável."""
+    checks = []
+    exists = storage.backend.exists
+    storage.backend.exists = lambda path: checks.append(path) or exists(path)
+
+    def large(edition_id: str, body: str) -> GazetteEdition:
+        edition = make_edition(edition_id, ["A-1"])
+        article = edition.articles[0]
+        edition.articles[0] = Article(
+            metadata=article.metadata,
+            content=ArticleContent(raw_content=body * 3000, content_type="html"),
+        )
+        return edition
+
+    storage.save_editions([large("E1", "a"), large("E2", "b")], municipality="sjc")
+    assert not any(path.startswith("content/") for path in checks)
+    assert len(storage.backend.list_files("content", ".bin")) == 2
+
+    # Conteúdo repetido: o "talvez" do filtro é confirmado no próprio índice
+    storage.save_editions([large("E3", "a")], municipality="sjc")
+    assert not any(path.startswith("content/") for path in checks)
+
+    reloaded = ParquetStorage(LocalBackend(tmp_path), enable_duckdb=False)
+    assert len(reloaded.content_index()) == 2
+    reloaded.save_editions([large("E4", "b")], municipality="sjc")
+    assert not any(path.startswith("content/") for path in checks)
+    assert "cd" * 32 not in reloaded.content_index()
+    for path in reloaded.backend.list_files("_content_index", ".parquet"):
+        reloaded.backend.delete(path)
+    blob_hash = "ab" * 32
+    reloaded.backend.write_bytes(reloaded._content_path(blob_hash), b"x")
+    assert reloaded.rebuild_content_index() == 3
+    assert len(reloaded.backend.list_files("_content_index", ".parquet")) == 1
+    assert blob_hash in reloaded.content_index()
+
+
+def test_backends_without_delete_can_still_be_instantiated(tmp_path):
+    """Backends de terceiros sem ``delete`` continuam instanciáveis."""
+
+    class ReadOnlyBackend(LocalBackend):
+        delete = StorageBackend.delete
+
+    backend = ReadOnlyBackend(str(tmp_path))
+    backend.write_bytes("blob.bin", b"abc")
+    with pytest.raises(NotImplementedError):
+        backend.delete("blob.bin")
+    assert backend.exists("blob.bin")
+    assert "delete" not in StorageBackend.__abstractmethods__
+
+
+def test_packed_blobs_are_served_by_ranged_reads_and_migratable(tmp_path):
+    """Blobs empacotados e soltos convivem e são lidos pelo mesmo content_path."""
+    loose = ParquetStorage(LocalBackend(tmp_path), enable_duckdb=False)
+    packed = ParquetStorage(
+        LocalBackend(tmp_path), enable_duckdb=False, pack_blobs=True
+    )
+
+    def large(edition_id: str, body: str) -> GazetteEdition:
+        edition = make_edition(edition_id, [f"{edition_id}-1"])
+        article = edition.articles[0]
+        edition.articles[0] = Article(
+            metadata=article.metadata,
+            content=ArticleContent(raw_content=body * 3000, content_type="html"),
+        )
+        return edition
+
+    loose.save_editions([large("E1", "a")], municipality="sjc")
+    packed.save_editions([large("E2", "b"), large("E3", "a")], municipality="sjc")
+
+    # "a" já existia solto: só "b" vai para o pack
+    assert len(packed.backend.list_files("content", ".bin")) == 1
+    (pack,) = packed.backend.list_files("packs", ".pack")
+    assert len(packed.pack_index()) == 1
+
+    ranges = []
+    read_range = packed.backend.read_range
+    packed.backend.read_range = lambda *a: ranges.append(a) or read_range(*a)
+    paths = {}
+    for path in packed.backend.list_files("articles", ".parquet"):
+        table = packed.backend.read_parquet(
+            path, columns=["article_id", "content_path"]
+        )
+        paths.update(zip(*(c.to_pylist() for c in table.columns)))
+    assert packed.get_content(paths["E2-1"]) == b"b" * 3000
+    assert ranges[0][0] == pack
+
+    assert packed.migrate_blobs_to_packs(delete_loose=True) == 1
+    assert packed.backend.list_files("content", ".bin") == []
+    assert len(packed.backend.list_files("packs", ".pack")) == 2
+    assert loose.get_content(paths["E1-1"]) == b"a" * 3000
+
+
+def test_compaction_merges_small_packs_and_index_segments(tmp_path):
+    """Garante packs e segmentos de índice unidos sem perder nenhum blob."""
+    storage = ParquetStorage(
+        LocalBackend(tmp_path), enable_duckdb=False, pack_blobs=True
+    )
+    bodies = {}
+    for i in range(3):
+        identifier = f"A-{i}"
+        bodies[identifier] = f"<p>{identifier}</p>" * 500
+        edition = make_edition(f"E{i}", [identifier])
+        edition.articles[0] = Article(
+            metadata=edition.articles[0].metadata,
+            content=ArticleContent(
+                raw_content=bodies[identifier], content_type=ContentType.HTML
+            ),
+        )
+        storage.save_editions([edition], municipality="sjc")
+    assert len(storage.backend.list_files("packs", ".pack")) == 3
+
+    # Leitor com o índice de packs carregado antes da compactação
+    stale = ParquetStorage(LocalBackend(tmp_path), enable_duckdb=False)
+    stale.pack_index()
+
+    stats = storage.compact()
+    assert (stats["packs_in"], stats["packs_out"]) == (3, 1)
+    assert stats["segments_out"] == 2  # _index/sjc e _pack_index
+    for prefix in ("_index/sjc", "_pack_index"):
+        assert len(storage.backend.list_files(prefix, ".parquet")) == 1
+
+    # Packs aposentados só somem na compactação seguinte
+    storage.compact()
+    assert len(storage.backend.list_files("packs", ".pack")) == 1
+
+    reloaded = ParquetStorage(LocalBackend(tmp_path), enable_duckdb=False)
+    index = reloaded.identifier_index("sjc")
+    for identifier, body in bodies.items():
+        assert reloaded.get_blob(index.get(identifier)) == body.encode()
+        assert stale.get_blob(index.get(identifier)) == body.encode()
+
+
+def test_partitioned_writes_are_pruned_by_date_and_municipality(tmp_path):
+    """Dez anos de edições mensais: consultar um mês abre um único arquivo."""
+    storage = ParquetStorage(LocalBackend(tmp_path), partition_by="month")
+    editions = []
+    for i in range(120):
+        edition = make_edition(f"E{i}", [f"A-{i}"])
+        metadata = edition.metadata
+        editions.append(
+            GazetteEdition(
+                metadata=GazetteMetadata(
+                    edition_id=metadata.edition_id,
+                    publication_date=f"{2015 + i // 12}-{i % 12 + 1:02d}-15",
+                    edition_number=metadata.edition_number,
+                    supplement=metadata.supplement,
+                    edition_type_id=metadata.edition_type_id,
+                    edition_type_name=metadata.edition_type_name,
+                    pdf_url=metadata.pdf_url,
+                ),
+                articles=edition.articles,
+            )
+        )
+    storage.save_editions(editions, municipality="sjc")
+
+    files = storage.backend.list_files("articles", ".parquet")
+    assert len(files) == 120
+    assert files[0].startswith("articles/municipality=sjc/year=2015/month=1/")
+    assert len(storage.backend.list_files("relationships", ".parquet")) == 120
+
+    pruned = prune_files(files, "sjc", date(2020, 3, 1), date(2020, 3, 31))
+    assert len(pruned) == 1
+    assert prune_files(files, "outro") == []
+
+    result = storage.query_articles(
+        municipality="sjc", start_date="2020-03-01", end_date="2020-03-31"
+    )
+    assert result.column("article_id").to_pylist() == ["A-62"]
+
+
+def test_compaction_merges_deduplicates_and_swaps_atomically(storage):
+    """Lotes sobrepostos viram um arquivo por partição, com a linha mais nova."""
+    storage.save_editions([make_edition("E2", ["A-2", "A-3"])], municipality="sjc")
+    storage.save_editions([make_edition("E1", ["A-1", "A-2"])], municipality="sjc")
+    # Lote anterior ao schema fixo de relações (datas como string)
+    rel_dir = "relationships/municipality=sjc/year=2024/month=1"
+    storage.backend.write_parquet(
+        f"{rel_dir}/batch_legacy.parquet",
+        pa.table(
+            {
+                "municipality": ["sjc"],
+                "edition_id": ["E0"],
+                "article_id": ["A-0"],
+                "edition_hash": ["h"],
+                "publication_date": ["2024-01-03"],
+                "batch_id": ["b"],
+                "processed_at": ["2024-01-03T10:00:00"],
+            }
+        ),
+    )
+
+    stats = storage.compact()
+    assert stats["partitions"] == 3
+    assert (stats["rows_in"], stats["rows_out"]) == (4 + 2 + 5, 3 + 2 + 5)
+
+    (articles,) = storage._live_files("articles")
+    table = storage.backend.read_parquet(articles)
+    assert table.column("article_id").to_pylist() == ["A-1", "A-2", "A-3"]
+    # A-2 ficou com a versão do lote mais recente (edição E1)
+    assert table.column("edition_id").to_pylist() == ["E1", "E1", "E2"]
+    (relationships,) = storage._live_files("relationships")
+    assert storage.backend.read_parquet(relationships).schema == RELATIONSHIPS_SCHEMA
+
+    # Lotes aposentados continuam no disco até a próxima compactação
+    assert len(storage.backend.list_files("articles", ".parquet")) == 3
+    assert storage.compact()["partitions"] == 0
+    assert storage.backend.list_files("articles", ".parquet") == [articles]
+    state = storage.load_state("compaction")
+    assert (state["staged"], state["retired"]) == ([], [])
+
+
+def test_live_files_relists_when_compaction_stages_files_meanwhile(storage):
+    """Garante que um arquivo registrado como staged durante a listagem fica oculto."""
+    storage.save_editions([make_edition("E1", ["A-1"])], municipality="sjc")
+    (batch,) = storage._live_files("articles")
+    staged = batch.rsplit("/", 1)[0] + "/compact_staged_0.parquet"
+    list_files = storage.backend.list_files
+
+    def list_during_compaction(prefix, suffix=None):
+        # Compactador registra e grava o arquivo entre a leitura do
+        # manifesto e a listagem
+        if prefix == "articles" and not storage.backend.exists(staged):
+            storage._update_compaction_state(add_staged=[staged])
+            storage.backend.write_parquet(staged, storage.backend.read_parquet(batch))
+        return list_files(prefix, suffix)
+
+    storage.backend.list_files = list_during_compaction
+    assert storage._live_files("articles") == [batch]
+
+
+def test_concurrent_state_writers_do_not_lose_updates(storage):
+    """Garante que deltas de workers concorrentes são mesclados e consolidados."""
+    first = CheckpointManifest(storage, "sjc")
+    second = CheckpointManifest(storage, "sjc")
+    first.commit(["E1"], {"2024-01-02": {"E1"}})
+    second.commit(["E2"], {"2024-01-03": {"E2"}})
+    storage.append_state("concurrency", {"https://a": 4})
+    storage.append_state("concurrency", {"https://a": 6, "https://b": 2})
+
+    expected = {"dates": ["2024-01-02", "2024-01-03"], "editions": ["E1", "E2"]}
+    assert storage.load_state("checkpoint_sjc") == expected
+    assert storage.load_state("concurrency") == {"https://a": 6, "https://b": 2}
+
+    assert storage.compact_state() == 4
+    assert not storage.backend.list_files("_state/checkpoint_sjc/")
+    assert storage.load_state("checkpoint_sjc") == expected
+    assert CheckpointManifest(storage, "sjc").is_date_done("2024-01-03")
+
+
+def test_concurrent_batches_never_share_file_names(storage):
+    """Garante nomes de arquivo únicos mesmo para lotes gravados no mesmo segundo."""
+    for edition_id in ("E1", "E2", "E3"):
+        storage.save_editions([make_edition(edition_id, ["A-1"])], municipality="sjc")
+
+    files = storage.backend.list_files("gazettes", ".parquet")
+    assert len(files) == 3
+    batch_ids = {
+        storage.backend.read_parquet(f).column("batch_id")[0].as_py() for f in files
+    }
+    assert len(batch_ids) == 3
+
+
+async def test_storage_writer_applies_backpressure_and_flushes(storage):
+    """Garante fila limitada, ordem das escritas, flush no aclose e métricas."""
+    writer = StorageWriter(max_pending=1, name="teste")
+    release = threading.Event()
+    written = []
+
+    def slow_save(edition_id):
+        release.wait(timeout=5)
+        storage.save_editions([make_edition(edition_id, ["A-1"])], municipality="sjc")
+        written.append(edition_id)
+
+    first = await writer.submit(slow_save, "E1")  # em escrita
+    await asyncio.sleep(0.01)
+    await writer.submit(slow_save, "E2")  # ocupa a única vaga da fila
+    blocked = asyncio.ensure_future(writer.submit(slow_save, "E3"))
+    await asyncio.sleep(0.05)
+    assert not blocked.done(), "submit deveria esperar com a fila cheia"
+    assert metrics.get_gauge("storage_write_queue_depth", writer="teste") == 1
+
+    release.set()
+    await first
+    await blocked
+    await writer.aclose()
+
+    assert written == ["E1", "E2", "E3"]
+    observations = metrics.snapshot()["observations"]
+    assert observations["storage_write_seconds{writer=teste}"]["count"] == 3
+    assert "storage_write_backpressure_seconds{writer=teste}" in observations
+
+
+async def test_storage_writer_runs_independent_writes_concurrently():
+    """Com max_concurrent=2, duas escritas rodam ao mesmo tempo no executor."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    executor = ThreadPoolExecutor(max_workers=2)
+    writer = StorageWriter(max_pending=2, executor=executor, max_concurrent=2)
+    # Cada escrita só termina quando a outra também começou
+    barrier = threading.Barrier(2, timeout=5)
+
+    def save(batch):
+        barrier.wait()
+        return batch
+
+    futures = [await writer.submit(save, batch) for batch in ("A", "B")]
+    assert await asyncio.gather(*futures) == ["A", "B"]
+    await writer.aclose()
+    executor.shutdown()
+
+    with pytest.raises(ValueError):
+        StorageWriter(max_concurrent=0)
@@ -1,14 +1,38 @@
 """Tests for HtmlStructureParser using recorded HTML via VCR."""
 
+import dataclasses
+
 import pytest
 
 from diario_crawler.core.crawler import GazetteCrawler
+from diario_crawler.core.executors import ExecutorPool
 from diario_crawler.models import ArticleMetadata
-from diario_crawler.parsers.structure import HtmlStructureParser
+from diario_crawler.parsers.structure import (
+    HtmlStructureParser,
+    articles_from_record_batch,
+    articles_to_record_batch,
+    parse_structure_to_record_batch,
+)
 
 pytestmark = pytest.mark.order(2)
 
 
+async def fetch_structures(crawler: GazetteCrawler, metadata_list: list) -> list[dict]:
+    """Baixa as estruturas HTML das edições, pelas mesmas URLs do stream_editions."""
+    config = crawler.config
+    edition_by_url = {
+        f"{config.DOMAIN_URL}{config.HTML_URL}{m.edition_id}": m.edition_id
+        for m in metadata_list
+    }
+    return [
+        {"edition_id": edition_by_url[url], "html": response.text}
+        async for url, response in crawler.concurrent_client.fetch_iter(
+            list(edition_by_url)
+        )
+        if response
+    ]
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "vcr_cassette",
@@ -31,7 +55,7 @@ async def test_structure_parser_basic(vcr_cassette, test_config, mock_storage):
     assert metadata_list, "Nenhum metadado retornado — verifique o cassette"
 
     # === Fase 2: Busca das estruturas HTML ===
-    html_results = await crawler.fetch_structure_batch(metadata_list)
+    html_results = await fetch_structures(crawler, metadata_list)
     assert html_results, "Nenhum HTML retornado — verifique o cassette"
 
     # === Fase 3: Parse das estruturas HTML ===
@@ -71,7 +95,7 @@ async def test_structure_parser_edge_cases(vcr_cassette, test_config, mock_stora
 
     urls = crawler.create_metadata_urls()
     metadata_list = await crawler.fetch_metadata_batch(urls)
-    html_results = await crawler.fetch_structure_batch(metadata_list)
+    html_results = await fetch_structures(crawler, metadata_list)
     assert html_results, "Nenhum HTML carregado do cassette"
 
     for html_data in html_results:
@@ -158,7 +182,7 @@ async def test_structure_parser_regression(vcr_cassette, test_config, mock_stora
 
     urls = crawler.create_metadata_urls()
     metadata_list = await crawler.fetch_metadata_batch(urls)
-    html_results = await crawler.fetch_structure_batch(metadata_list)
+    html_results = await fetch_structures(crawler, metadata_list)
     assert html_results, "Nenhum HTML disponível — verifique o cassette"
 
     total_articles = 0
@@ -171,3 +195,92 @@ async def test_structure_parser_regression(vcr_cassette, test_config, mock_stora
         f"Número de artigos inesperado ({total_articles}) — "
         "possível quebra nos seletores CSS"
     )
+
+
+TREE_HTML = """
+<ul id="tree">
+  <li><span class="folder">Atos do Executivo</span>
+    <ul>
+      <li><span class="folder">Decretos</span>
+        <ul>
+          <li><a class="linkMateria" data-materia-id="10" identificador="D-10"
+                 data-protocolo="P-1">Decreto 10</a></li>
+        </ul>
+      </li>
+      <li><a class="linkMateria" data-materia-id="11" identificador="P-11">
+          Portaria 11</a></li>
+    </ul>
+  </li>
+</ul>
+"""
+
+
+def test_record_batch_round_trip():
+    """Artigos sobrevivem à conversão para Arrow e de volta."""
+    articles = HtmlStructureParser.parse(TREE_HTML, "E-1")
+    assert articles
+
+    batch = articles_to_record_batch(articles)
+    assert batch.num_rows == len(articles)
+    assert articles_from_record_batch(batch) == articles
+
+    empty = articles_to_record_batch([])
+    assert empty.num_rows == 0
+    assert articles_from_record_batch(empty) == []
+
+
+async def test_parse_in_process_pool_matches_inline():
+    """O parsing em processo separado devolve o mesmo que o parsing inline."""
+    expected = HtmlStructureParser.deduplicate_keep_deepest(
+        HtmlStructureParser.parse(TREE_HTML, "E-1")
+    )
+
+    executors = ExecutorPool(parse_workers=1)
+    try:
+        batch = await executors.parse(parse_structure_to_record_batch, TREE_HTML, "E-1")
+    finally:
+        executors.shutdown()
+
+    assert articles_from_record_batch(batch) == expected
+    assert {a.identifier for a in expected} == {"D-10", "P-11"}
+
+
+def test_parse_visits_each_article_once_with_full_path():
+    """A passagem única emite cada link uma vez, já com o caminho completo."""
+    articles = HtmlStructureParser.parse(TREE_HTML, "E-1")
+
+    assert [(a.identifier, a.hierarchy_path) for a in articles] == [
+        ("D-10", ("Atos do Executivo", "Decretos")),
+        ("P-11", ("Atos do Executivo",)),
+    ]
+    assert articles[0].protocol == "P-1"
+
+
+def test_parse_accepts_utf8_bytes():
+    """Bytes UTF-8 (response.content) produzem o mesmo resultado que str."""
+    html = TREE_HTML.replace("Atos do Executivo", "Atos da Administração")
+
+    from_bytes = HtmlStructureParser.parse(html.encode("utf-8"), "E-1")
+
+    assert from_bytes == HtmlStructureParser.parse(html, "E-1")
+    assert from_bytes[0].hierarchy_path[0] == "Atos da Administração"
+
+
+def test_articles_share_interned_paths_and_are_frozen():
+    """Artigos compartilham caminho e edition_id internados e são imutáveis."""
+    parsed = HtmlStructureParser.parse(TREE_HTML, "E-1")
+    rebuilt = articles_from_record_batch(articles_to_record_batch(parsed))
+    from_list = ArticleMetadata(
+        article_id="X",
+        edition_id="".join(["E-", "1"]),
+        hierarchy_path=["Atos do Executivo"],
+        title="X",
+        identifier="X",
+    )
+
+    assert from_list.hierarchy_path is parsed[1].hierarchy_path
+    assert rebuilt[1].hierarchy_path is parsed[1].hierarchy_path
+    assert from_list.edition_id is rebuilt[0].edition_id is parsed[0].edition_id
+    assert not hasattr(from_list, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        from_list.title = "Y"